@@ -0,0 +1,54 @@
+##################################################################
+##
+##	ElectronNest_CP
+##	Copyright (C) 2024  Shigeyuki TAKANO
+##
+##  GNU AFFERO GENERAL PUBLIC LICENSE
+##	version 3.0
+##
+##################################################################
+import utils.AffineUtils as affineutils
+import utils.DependenceUtils as deputils
+import argparse
+import json
+import sys
+
+
+parser = argparse.ArgumentParser(description="args")
+
+parser.add_argument('--src_path',   help='corpus file path',    default='test_dep')
+parser.add_argument('--src_name',   help='corpus file name',    default='dep_corpus')
+
+args = parser.parse_args()
+
+r_file_path = args.src_path
+r_file_name = args.src_name
+
+with open(r_file_path +'/'+ r_file_name +".json", "r") as corpus_file:
+    corpus = json.load(corpus_file)
+
+num_cases = 0
+num_fails = 0
+for kernel, info in corpus.items():
+    print("Kernel: {}".format(kernel))
+    for case in info["cases"]:
+        src = [ affineutils.ParseAffine(subscript) for subscript in case["src"] ]
+        dst = [ affineutils.ParseAffine(subscript) for subscript in case["dst"] ]
+        dependence = deputils.TestDependence(src, dst, info["loops"], info["bounds"])
+
+        result = None
+        if dependence is not None:
+            result = { "direction": dependence["direction"], "distance": dependence["distance"] }
+
+        num_cases += 1
+        if result == case["expect"]:
+            status = "pass"
+        else:
+            status = "FAIL"
+            num_fails += 1
+
+        print("  {}: {} {}".format(status, case["name"], "independent" if result is None else result))
+
+print("{} cases, {} failed".format(num_cases, num_fails))
+if num_fails:
+    sys.exit(1)
@@ -8,32 +8,42 @@
 ##
 ##################################################################
 from typing import TypedDict, List, Dict, Tuple, Optional, Set, Union, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 import utils.AMUtils as AMUtils
+import utils.FileUtils as FileUtils
+import utils.AnalysisCache as AnalysisCache
+import utils.AffineUtils as AffineUtils
+import utils.DependenceUtils as DependenceUtils
 import re
 from typing import List, Optional
-import functools
+import concurrent.futures
+import multiprocessing
+import copy
+import sys
+import glob
+import collections
+import types
 
 
-@dataclass
+@dataclass(slots=True)
 class RegisterInfo:
 	regs: List[str]			# Register's name
 	array_dim: int			# Array Dimension
 
-@dataclass
+@dataclass(slots=True)
 class PointerInfo:
 	block_id: str			# Basic Block ID
 	gep_node_id: List[str]	# getelementptr Node-ID
 	array_name: str			# Array Name
 	index_regs: RegisterInfo
 
-@dataclass
+@dataclass(slots=True)
 class MemoryOp:
 	reg_addr: str			# Register index used for Address
 	reg_val: str			# REgister index used for Value
 
-@dataclass
+@dataclass(slots=True)
 class LoopInfo:
 	nodes: List[str]		# Loop CFG Nodes
 	header: str				# Loop Header
@@ -41,22 +51,375 @@ class LoopInfo:
 	parent: str				# Parent Node-ID
 	children: List[str]		# Child Node-ID
 	array_dims: Dict[str, int]	# {Array Name: Access Dim}
-
-@dataclass
+	induction_var: Optional[str] = None				# Induction Variable (stack slot or register)
+	start: Union[int, str, None] = None				# Initial Value (str: symbolic)
+	step: Optional[int] = None						# Increment per Iteration
+	bound: Union[int, str, None] = None				# Bound compared at Header (str: symbolic)
+	predicate: Optional[str] = None					# icmp Predicate of "iv <predicate> bound"
+	trip_count: Union[int, str, None] = None		# Number of Iterations (str: symbolic, None: unknown)
+
+	def is_counted(self) -> bool:
+		"""反復回数が定数で求まるループか"""
+		return isinstance(self.trip_count, int)
+
+@dataclass(slots=True)
 class DimensionAccess:
 	dimension: int			# Access Dim
 	loop_level: str			# Loop Level
 	array_size: int			# Dim Size
 
-@dataclass
+@dataclass(slots=True)
 class ArrayDimInfo:
 	array_name: str						# Array Name
 	dim_accesses: List[DimensionAccess]	# Dim Info
 
+@dataclass(slots=True)
 class IndexExpression:
 	base: str					# Base address of the array
-	path: List[int]				# List of *node IDs* that compute the index
-	source_variables: List[str]	# Source variable for this index expression.
+	path: List[int] = field(default_factory=list)				# List of *node IDs* that compute the index
+	source_variables: List[str] = field(default_factory=list)	# Source variable for this index expression.
+	loop_level: Optional[int] = None	# Loop Level of the access
+	is_loop_carried: bool = False
+	subscripts: List[Optional[AffineUtils.AffineExpr]] = field(default_factory=list)	# Affine subscript per dim (None: not affine)
+	dims: List[int] = field(default_factory=list)				# Array Dim Sizes
+	affine: Optional[AffineUtils.AffineExpr] = None			# Element offset, const + sum(coeff * iv) (None: not affine)
+
+	def is_affine(self) -> bool:
+		return self.affine is not None
+
+	def stride(self, var: str) -> int:
+		"""誘導変数varが1増えた時のアドレス増分 (要素数)"""
+		return self.affine.Coeff(var) if self.affine is not None else 0
+
+# icmpのオペランドを入れ替えた場合の条件
+_SWAPPED_PREDICATES = {
+	'slt': 'sgt', 'sgt': 'slt', 'sle': 'sge', 'sge': 'sle',
+	'ult': 'ugt', 'ugt': 'ult', 'ule': 'uge', 'uge': 'ule'
+}
+
+def _affine_value(expr: Optional[AffineUtils.AffineExpr]) -> Union[int, str, None]:
+	"""アフィン式を定数 (int) または記号表現 (str) に変換"""
+	if expr is None:
+		return None
+	return expr.const if expr.IsConst() else str(expr)
+
+class NodeRecord(list):
+	"""
+	ノードリストの1行 (事前トークン化済み)
+	従来の [line] 形式と互換のまま, 読み込み時に一度だけ分割したトークン列を保持
+		"22 getelementptr_%40_47 %43 %42 %40"
+			tokens:		["22", "getelementptr_%40_47", "%43", "%42", "%40"]
+	"""
+	__slots__ = ('tokens',)
+
+	def __init__(self, fields: List[str]):
+		super().__init__(fields)
+		self.tokens = fields[0].split() if fields else []
+
+def _tokens(node: List[str]) -> List[str]:
+	"""ノード行のトークン列 (NodeRecordは分割済みの列を返す)"""
+	if isinstance(node, NodeRecord):
+		return node.tokens
+	return node[0].split()
+
+
+class DictAdapter:
+	"""
+	分析結果モデル (slots付きdataclass) の辞書互換アダプタ
+	従来の result['array_patterns'][name]['array_info'] 形式のアクセスをそのまま受け付ける
+		_optional: Noneの場合にキーとして見せないフィールド
+	"""
+	__slots__ = ()
+	_optional = ()
+
+	def keys(self) -> List[str]:
+		return [name for name in type(self).__slots__
+			if not (name in self._optional and getattr(self, name) is None)]
+
+	def __getitem__(self, key: str) -> Any:
+		if key not in self.keys():
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __setitem__(self, key: str, value: Any):
+		if key not in type(self).__slots__:
+			raise KeyError(key)
+		setattr(self, key, value)
+
+	def __contains__(self, key: str) -> bool:
+		return key in self.keys()
+
+	def __iter__(self):
+		return iter(self.keys())
+
+	def __len__(self) -> int:
+		return len(self.keys())
+
+	def get(self, key: str, default: Any = None) -> Any:
+		return getattr(self, key) if key in self.keys() else default
+
+	def values(self) -> List[Any]:
+		return [getattr(self, key) for key in self.keys()]
+
+	def items(self) -> List[Tuple[str, Any]]:
+		return [(key, getattr(self, key)) for key in self.keys()]
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""入れ子の辞書に変換"""
+		return {key: _to_plain(value) for key, value in self.items()}
+
+	def __repr__(self) -> str:
+		return repr(self.to_dict())
+
+def _to_plain(value: Any) -> Any:
+	"""モデルを含む値を辞書/リストに変換"""
+	if isinstance(value, DictAdapter):
+		return value.to_dict()
+	if isinstance(value, dict):
+		return {key: _to_plain(item) for key, item in value.items()}
+	if isinstance(value, list):
+		return [_to_plain(item) for item in value]
+	return value
+
+@dataclass(slots=True, repr=False)
+class ArrayOperations(DictAdapter):
+	has_load: bool = False		# load access
+	has_store: bool = False		# store access
+
+@dataclass(slots=True, repr=False)
+class LoopAccess(DictAdapter):
+	dimension: int				# Access Dim
+	array_size: int				# Dim Size
+
+@dataclass(slots=True, repr=False)
+class ArrayInfo(DictAdapter):
+	dimensions: int							# Number of Dims
+	block_id: str							# Basic Block ID
+	index_regs: List[str]					# Index Registers
+	operations: ArrayOperations
+	loop_access: Dict[str, LoopAccess]		# {Loop Level: Access}
+	index_expr: Optional[IndexExpression] = None	# Affine Index of the access
+	_optional = ('index_expr',)
+
+@dataclass(slots=True, repr=False)
+class ArrayDependencies(DictAdapter):
+	read_from: List[Any] = field(default_factory=list)
+	write_to: List[Any] = field(default_factory=list)
+
+@dataclass(slots=True, repr=False)
+class ArrayPattern(DictAdapter):
+	array_info: ArrayInfo
+	dependencies: ArrayDependencies
+
+@dataclass(slots=True, repr=False)
+class LoadInput(DictAdapter):
+	array: str					# Array Name
+	index_regs: List[str]		# Index Registers
+	node_id: Any				# load Node-ID
+	index_expr: Optional[IndexExpression] = None	# Affine Index
+	_optional = ('index_expr',)
+
+@dataclass(slots=True, repr=False)
+class LeafInput(DictAdapter):
+	reg: str					# Register
+	node_id: Any				# Using Node-ID
+	use_type: str				# Use Type
+
+@dataclass(slots=True, repr=False)
+class PathInputs(DictAdapter):
+	loads: List[LoadInput] = field(default_factory=list)
+	leafs: List[LeafInput] = field(default_factory=list)
+
+@dataclass(slots=True, repr=False)
+class Computation(DictAdapter):
+	node_id: Any				# Node-ID
+	opcode: str					# Opcode with Suffix
+	input_regs: List[str]		# Source Registers
+	output_reg: str				# Destination Register
+
+@dataclass(slots=True, repr=False)
+class PathComputation(DictAdapter):
+	sequence: List[Computation] = field(default_factory=list)
+
+@dataclass(slots=True, repr=False)
+class PathOutput(DictAdapter):
+	type: str								# register/memory
+	target_reg: Optional[str] = None
+	store_node: Any = None					# memory output only
+	array: Optional[str] = None				# memory output only
+	index_regs: Optional[List[str]] = None	# memory output only
+	value_reg: Optional[str] = None
+	index_expr: Optional[IndexExpression] = None	# memory output only
+	_optional = ('store_node', 'array', 'index_regs', 'value_reg', 'index_expr')
+
+@dataclass(slots=True, repr=False)
+class LoopContext(DictAdapter):
+	level: Optional[str] = None			# Loop Level
+	is_reduction: bool = False
+	is_loop_carried: bool = False
+
+@dataclass(slots=True, repr=False)
+class ComputePath(DictAdapter):
+	path_id: str
+	type: str
+	inputs: PathInputs
+	computation: PathComputation
+	output: Optional[PathOutput]
+	loop_context: LoopContext
+
+@dataclass(slots=True, repr=False)
+class PathDependency(DictAdapter):
+	source_path: str
+	target_path: str
+	type: str							# register/memory/loop_carried
+	through: str						# Register or Array Name
+	direction: Optional[List[str]] = None	# memory only, direction per loop
+	distance: Optional[List[Optional[int]]] = None	# memory only, distance per loop
+	loop_level: Optional[str] = None	# loop_carried only
+	_optional = ('direction', 'distance', 'loop_level')
+
+@dataclass(slots=True, repr=False)
+class ComputePathsInfo(DictAdapter):
+	compute_paths: List[ComputePath] = field(default_factory=list)
+	path_dependencies: List[PathDependency] = field(default_factory=list)
+
+@dataclass(slots=True, repr=False)
+class AnalysisResult(DictAdapter):
+	array_patterns: Dict[str, ArrayPattern]
+	loop_levels: Dict[str, LoopInfo]
+	loops: List[List[str]]
+	compute_paths: ComputePathsInfo = field(default_factory=ComputePathsInfo)
+
+def _build_compute_path(path: Dict) -> ComputePath:
+	"""計算パスの辞書をモデルに変換"""
+	inputs = path.get('inputs', {})
+	output = path.get('output')
+	return ComputePath(
+		path_id=path['path_id'],
+		type=path.get('type', 'unknown'),
+		inputs=PathInputs(
+			loads=[LoadInput(load['array'], load.get('index_regs', []), load.get('node_id'), load.get('index_expr'))
+				for load in inputs.get('loads', [])],
+			leafs=[LeafInput(leaf['reg'], leaf.get('node_id'), leaf.get('use_type'))
+				for leaf in inputs.get('leafs', [])]
+		),
+		computation=PathComputation([
+			Computation(comp['node_id'], comp['opcode'], comp['input_regs'], comp['output_reg'])
+			for comp in path.get('computation', {}).get('sequence', [])
+		]),
+		output=PathOutput(**output) if output else None,
+		loop_context=LoopContext(**path.get('loop_context', {}))
+	)
+
+def _build_result_model(result: Dict) -> AnalysisResult:
+	"""analyze() の辞書形式の結果を型付きモデルに変換"""
+	array_patterns = {}
+	for array_name, pattern in result.get('array_patterns', {}).items():
+		array_info = pattern['array_info']
+		dependencies = pattern.get('dependencies', {})
+		array_patterns[array_name] = ArrayPattern(
+			array_info=ArrayInfo(
+				dimensions=array_info['dimensions'],
+				block_id=array_info['block_id'],
+				index_regs=array_info['index_regs'],
+				operations=ArrayOperations(**array_info['operations']),
+				loop_access={level: LoopAccess(access['dimension'], access['array_size'])
+					for level, access in array_info['loop_access'].items()},
+				index_expr=array_info.get('index_expr')
+			),
+			dependencies=ArrayDependencies(
+				dependencies.get('read_from', []),
+				dependencies.get('write_to', [])
+			)
+		)
+
+	compute_paths = result.get('compute_paths', {})
+	return AnalysisResult(
+		array_patterns=array_patterns,
+		loop_levels=result.get('loop_levels', {}),
+		loops=result.get('loops', []),
+		compute_paths=ComputePathsInfo(
+			compute_paths=[_build_compute_path(path) for path in compute_paths.get('compute_paths', [])],
+			path_dependencies=[PathDependency(**dep) for dep in compute_paths.get('path_dependencies', [])]
+		)
+	)
+
+
+# 並列解析のワーカープロセスが参照するAnalyzer (fork時は親のノード/AMをコピーオンライトで共有)
+_block_worker_analyzer = None
+
+def _init_block_worker(analyzer):
+	global _block_worker_analyzer
+	_block_worker_analyzer = analyzer
+
+def _analyze_block_worker(block_id: str):
+	block_result = _block_worker_analyzer._analyze_block(block_id)
+	# ワーカーの出力をログに残す
+	sys.stdout.flush()
+	return block_id, block_result
+
+
+def _analysis_modules() -> Set[str]:
+	"""分析結果を左右するモジュールのファイル (このファイルと, 取り込むutilsモジュールを推移的に)"""
+	files = set()
+	modules = [sys.modules[__name__]]
+	while modules:
+		module = modules.pop()
+		module_file = getattr(module, '__file__', None)
+		if module_file is None or module_file in files:
+			continue
+		files.add(module_file)
+		modules.extend(value for value in vars(module).values()
+			if isinstance(value, types.ModuleType) and value.__name__.startswith('utils.'))
+	return files
+
+def input_files(r_file_path: str, r_file_name: str, ir_file: Optional[str]) -> List[str]:
+	"""
+	分析結果を決める全ファイル
+	(_cfg_loop.txt, _node_list.txt, _am_inv.txt, パスDB/_bpath_*ファイル, LLVM IRファイル, 分析コード)
+	"""
+	prefix = os.path.join(r_file_path, FileUtils.GraphFileName(r_file_name))
+	files = set()
+	for pattern in (
+		"_cfg_loop.txt",
+		"_bblock_*_node_list.txt",
+		"_bblock_*_am_inv.txt",
+		"_bblock_bpath.jsonl",
+		"_bblock_*_bpath_*.txt"
+	):
+		files.update(glob.glob(prefix + pattern))
+
+	if ir_file is not None:
+		files.add(ir_file)
+
+	# 分析コード自体の変更でも無効化する
+	files.update(_analysis_modules())
+	return sorted(files)
+
+def analyze_cached(w_file_path: str, r_file_path: str, r_file_name: str, ir_file: Optional[str] = None, **kwargs) -> Tuple[AnalysisResult, Any, Optional['Analyzer']]:
+	"""
+	永続キャッシュ付きの分析
+	Analyzerを構築する前にキャッシュを確認し, 入力ファイルのハッシュが一致すれば読み込む
+	不一致なら分析して保存する (キャッシュはpickleのため, 信頼できる出力先でのみ使用)
+	Returns: (result, IndexExpression, analyzer), キャッシュを読み込んだ場合 analyzer は None
+	"""
+	if ir_file is None:
+		ir_file = FileUtils.IRFileName(r_file_path, r_file_name)
+
+	result_cache = AnalysisCache.ResultCache(w_file_path, AnalysisCache.FileDigest(input_files(r_file_path, r_file_name, ir_file)))
+	hit, value = result_cache.Load()
+	if hit:
+		print(f"Load analysis result from {w_file_path}")
+		return value[0], value[1], None
+
+	analyzer = Analyzer(r_file_path, r_file_name, ir_file=ir_file, **kwargs)
+	result, IndexExpression = analyzer.analyze()
+	try:
+		result_cache.Store((result, IndexExpression))
+	except Exception as e:
+		print(f"Error storing analysis result cache: {e}")
+
+	return result, IndexExpression, analyzer
 
 
 class ComputeDataPath:
@@ -85,7 +448,7 @@ class ComputeDataPath:
 				#print(f"Debug: Found {len(paths)} paths in block {block_id}")
 				if paths:
 					#print(f"Debug: Paths from block {block_id}:")
-					for path in paths:
+					#for path in paths:
 						#print(f"Debug: - Path ID: {path.get('path_id')}")
 						#print(f"Debug:   Type: {path.get('type')}")
 						#print(f"Debug:   Computation sequence: {path.get('computation', {}).get('sequence', [])}")
@@ -96,6 +459,7 @@ class ComputeDataPath:
 			# 2. パス間の依存関係分析
 			if result['compute_paths']:
 				#print(f"Debug: Analyzing path dependencies")
+				self.compute_paths = result['compute_paths']
 				result['path_dependencies'] = self._analyze_path_dependencies()
 				#print(f"Debug: Found {len(result['path_dependencies'])} dependencies")
 
@@ -190,32 +554,124 @@ class ComputeDataPath:
 			return False
 
 	def _merge_related_paths(self, paths: List[Dict]) -> List[Dict]:
-		"""関連するパスを結合"""
+		"""
+		関連するパスを結合
+		出力レジスタ→生成パスのインデックスから同じループレベルで依存するパスを
+		Union-Findでグループ化し, 各グループを1回で結合する
+		(グループ内・グループ間とも元のパス順)
+		"""
 		try:
+			parent = list(range(len(paths)))
+
+			def find(index: int) -> int:
+				root = index
+				while parent[root] != root:
+					root = parent[root]
+				while parent[index] != root:
+					parent[index], index = root, parent[index]
+				return root
+
+			def union(index1: int, index2: int):
+				root1, root2 = find(index1), find(index2)
+				if root1 != root2:
+					# 小さいインデックスを代表にする
+					parent[max(root1, root2)] = min(root1, root2)
+
+			# (ループレベル, 出力レジスタ) → 生成パス
+			producers = {}
+			levels = []
+			for index, path in enumerate(paths):
+				level = path['loop_context']['level']
+				levels.append(level)
+				for comp in path['computation']['sequence']:
+					producers.setdefault((level, comp['output_reg']), []).append(index)
+
+			# 入力レジスタを生成するパスと結合
+			for index, path in enumerate(paths):
+				for comp in path['computation']['sequence']:
+					for reg in comp['input_regs']:
+						for producer in producers.get((levels[index], reg), ()):
+							if producer != index:
+								union(producer, index)
+
+			groups = {}
+			for index in range(len(paths)):
+				groups.setdefault(find(index), []).append(index)
+
 			merged = []
-			used_paths = set()
+			for root in sorted(groups):
+				group = groups[root]
+				if len(group) == 1:
+					merged.append(paths[group[0]])
+				else:
+					merged.append(self._merge_path_group([paths[index] for index in group]))
 
-			for i, path1 in enumerate(paths):
-				if i in used_paths:
-					continue
+			return merged
 
-				current_merge = path1
-				for j, path2 in enumerate(paths[i+1:], i+1):
-					if j in used_paths:
-						continue
+		except Exception as e:
+			print(f"Error merging paths: {e}")
+			return paths
+
+	def _merge_path_group(self, paths: List[Dict]) -> Dict:
+		"""
+		複数のパスを一度に結合 (_merge_two_paths を順に適用した場合と同じ形式)
+		Args:
+			paths: 結合するパス (先頭が基準)
+		Returns:
+			結合されたパス
+		"""
+		try:
+			path_type = paths[0]['type']
+			for path in paths[1:]:
+				path_type = self._determine_merged_type(path_type, path['type'])
+
+			merged = {
+				'path_id': "_".join(str(path['path_id']) for path in paths),
+				'type': path_type,
+				'inputs': {
+					'loads': [],
+					'leafs': []
+				},
+				'computation': {'sequence': []},
+				'output': None,
+				'loop_context': paths[0]['loop_context']  # ループコンテキストは一致していることが前提
+			}
+
+			# 入力の結合（重複を排除）
+			seen_loads = set()
+			seen_leafs = set()
+			sequence = []
+			for path in paths:
+				for load in path['inputs']['loads']:
+					load_key = (load['array'], tuple(load['index_regs']))
+					if load_key not in seen_loads:
+						merged['inputs']['loads'].append(load)
+						seen_loads.add(load_key)
+
+				for leaf in path['inputs']['leafs']:
+					leaf_key = (leaf['reg'], leaf['node_id'])
+					if leaf_key not in seen_leafs:
+						merged['inputs']['leafs'].append(leaf)
+						seen_leafs.add(leaf_key)
 
-					if self._can_merge_paths(current_merge, path2):
-						current_merge = self._merge_two_paths(current_merge, path2)
-						used_paths.add(j)
+				sequence.extend(path['computation']['sequence'])
 
-				merged.append(current_merge)
-				used_paths.add(i)
+			# 計算シーケンスの順序付け
+			ordered_sequence = self._order_computation_sequence(sequence)
+			merged['computation']['sequence'] = ordered_sequence
+
+			# 出力の設定（最後の計算の出力を使用）
+			if ordered_sequence:
+				merged['output'] = {
+					'type': 'register',
+					'target_reg': ordered_sequence[-1]['output_reg']
+				}
 
 			return merged
 
 		except Exception as e:
-			print(f"Error merging paths: {e}")
-			return paths
+			print(f"Error merging path group: {e}")
+			return paths[0]
 
 	def _can_merge_paths(self, path1: Dict, path2: Dict) -> bool:
 		"""2つのパスが結合可能か判定"""
@@ -251,7 +707,7 @@ class ComputeDataPath:
 
 			current_path = None
 			for node_id, node in enumerate(nodes):
-				node_info = node[0].split()
+				node_info = _tokens(node)
 				#print(f"Debug: Processing node {node_id}: {node_info}")
 
 				if len(node_info) < 2:
@@ -286,7 +742,7 @@ class ComputeDataPath:
 			# 最後のパスの処理
 			if current_path:
 				#print(f"Debug: Finalizing last path in block")
-				finalized_path = self._finalize_compute_path(current_path, len(nodes)-1, nodes[-1][0].split())
+				finalized_path = self._finalize_compute_path(current_path, len(nodes)-1, _tokens(nodes[-1]))
 				if finalized_path:
 					#print(f"Debug: Adding last finalized path to results")
 					paths.append(finalized_path)
@@ -409,10 +865,10 @@ class ComputeDataPath:
 
 			# トポロジカルソート
 			ordered_nodes = []
-			queue = [node_id for node_id in graph if in_degree[node_id] == 0]
+			queue = collections.deque(node_id for node_id in graph if in_degree[node_id] == 0)
 
 			while queue:
-				current = queue.pop(0)
+				current = queue.popleft()
 				ordered_nodes.append(current)
 
 				for neighbor in graph[current]:
@@ -454,14 +910,8 @@ class ComputeDataPath:
 			if not loop_info:
 				return False
 
-			# レジスタの定義がループをまたぐか確認
-			for loop_block in loop_info.get('loop_info', {}).get('nodes', []):
-				nodes = self.analyzer._read_node_list(loop_block)
-				for node in nodes:
-					if len(node[0].split()) > 2 and reg in node[0]:
-						return True
-
-			return False
+			# レジスタの定義/使用がループをまたぐか確認
+			return self.analyzer._is_live_across_back_edge(reg, loop_info.get('loop_info', {}).get('nodes', []))
 
 		except Exception as e:
 			print(f"Error checking loop carried use: {e}")
@@ -529,16 +979,15 @@ class ComputeDataPath:
 				array_name = gep_match.group(1).split('_')[0]
 				return array_name
 
-			# 3. レジスタを使用している配列を探索
-			for block_id, nodes in self.all_nodes.items():
-				for node in nodes:
-					node_info = node[0].split()
-					if 'getelementptr' in str(node_info[1]):
-						if reg in node_info[2:]:
-							# まず現在のノードで@シンボルをチェック
-							array_match = re.search(r'@([a-zA-Z0-9_]+)', str(node_info[1]))
-							if array_match:
-								return array_match.group(1).split('_')[0]
+			# 3. レジスタを使用している配列を索引から取得
+			for block_id, node_id in self.analyzer.reg_gep_index.get(reg, {}).get('geps', []):
+				for node in self.analyzer.all_nodes[block_id]:
+					node_info = _tokens(node)
+					if node_info[0] == node_id:
+						# まず現在のノードで@シンボルをチェック
+						array_match = re.search(r'@([a-zA-Z0-9_]+)', str(node_info[1]))
+						if array_match:
+							return array_match.group(1).split('_')[0]
 
 			return None
 
@@ -607,7 +1056,8 @@ class ComputeDataPath:
 						'store_node': node_id,
 						'array': array_name,
 						'index_regs': self.analyzer._get_index_regs(node_info[3]),
-						'value_reg': node_info[2]
+						'value_reg': node_info[2],
+						'index_expr': self.analyzer._get_index_expression(path['path_id'].split('_')[1], node_info[3])
 					})
 			else:
 				# レジスタ出力の場合
@@ -781,7 +1231,8 @@ class ComputeDataPath:
 					load_info = {
 						'array': array_name,
 						'index_regs': self.analyzer._get_index_regs(node_info[3]),
-						'node_id': node_id
+						'node_id': node_id,
+						'index_expr': self.analyzer._get_index_expression(block_id, node_info[3])
 					}
 					path['inputs']['loads'].append(load_info)
 					#print(f"Debug: Added load info: {load_info}")
@@ -804,16 +1255,7 @@ class ComputeDataPath:
 			定義元のノード情報 または None
 		"""
 		try:
-			nodes = self.analyzer._read_node_list(block_id)
-			if not nodes:
-				return None
-
-			for node in nodes:
-				node_info = node[0].split()
-				if len(node_info) > 2 and node_info[2] == register:
-					return node_info
-
-			return None
+			return self.analyzer._get_block_def_use(block_id)['defs'].get(register)
 
 		except Exception as e:
 			print(f"Error finding register definition: {e}")
@@ -939,24 +1381,67 @@ class ComputeDataPath:
 		}
 		return any(node_info[1].startswith(op) for op in computation_opcodes)
 
+	def _path_access_sets(self, path: Dict) -> Dict:
+		"""パスの入出力レジスタ集合と配列アクセス (依存解析用に1回だけ作る)"""
+		output_regs = set()
+		input_regs = set()
+		for comp in path.get('computation', {}).get('sequence', []):
+			output_regs.add(comp['output_reg'])
+			input_regs.update(comp['input_regs'])
+
+		stores = []
+		if path.get('output', {}).get('type') == 'memory':
+			stores.append(path['output'])
+
+		return {
+			'output_regs': output_regs,
+			'input_regs': input_regs,
+			'stores': stores,
+			'loads': path.get('inputs', {}).get('loads', [])
+		}
+
 	def _analyze_path_dependencies(self) -> List[Dict]:
-		"""パス間の依存関係を分析"""
+		"""
+		パス間の依存関係を分析
+		入力レジスタ→パス, 配列→loadパスの転置インデックスで候補ペアだけを調べる
+		"""
 		try:
 			dependencies = []
 
-			# パスのペアごとに依存関係を確認
+			access = [self._path_access_sets(path) for path in self.compute_paths]
+
+			# 転置インデックス (パス番号は昇順)
+			reg_consumers = {}
+			array_loaders = {}
+			for idx, path_access in enumerate(access):
+				for reg in path_access['input_regs']:
+					reg_consumers.setdefault(reg, []).append(idx)
+				for inp in path_access['loads']:
+					loaders = array_loaders.setdefault(inp['array'], [])
+					if not loaders or loaders[-1] != idx:
+						loaders.append(idx)
+
+			# パスのペア (i < j) のうち依存の候補だけを確認
 			for i, path1 in enumerate(self.compute_paths):
-				for path2 in self.compute_paths[i+1:]:
+				candidates = set()
+				for reg in access[i]['output_regs']:
+					candidates.update(reg_consumers.get(reg, ()))
+				for out in access[i]['stores']:
+					candidates.update(array_loaders.get(out['array'], ()))
+
+				for j in sorted(idx for idx in candidates if idx > i):
+					path2 = self.compute_paths[j]
+
 					# レジスタ依存の確認
-					reg_deps = self._find_register_dependency(path1, path2)
+					reg_deps = self._find_register_dependency(path1, path2, access[i], access[j])
 					dependencies.extend(reg_deps)
 
 					# メモリ依存の確認
-					mem_deps = self._find_memory_dependency(path1, path2)
+					mem_deps = self._find_memory_dependency(path1, path2, access[i], access[j])
 					dependencies.extend(mem_deps)
 
 					# ループ伝搬依存の確認
-					loop_deps = self._find_loop_carried_dependency(path1, path2)
+					loop_deps = self._find_loop_carried_dependency(path1, path2, reg_deps, mem_deps)
 					dependencies.extend(loop_deps)
 
 			return dependencies
@@ -965,20 +1450,17 @@ class ComputeDataPath:
 			print(f"Error analyzing path dependencies: {e}")
 			return []
 
-	def _find_register_dependency(self, path1: Dict, path2: Dict) -> List[Dict]:
+	def _find_register_dependency(self, path1: Dict, path2: Dict,
+			access1: Optional[Dict] = None, access2: Optional[Dict] = None) -> List[Dict]:
 		"""レジスタ依存の検出"""
 		try:
 			deps = []
 
 			# path1の出力レジスタ
-			output_regs = set()
-			for comp in path1.get('computation', {}).get('sequence', []):
-				output_regs.add(comp['output_reg'])
+			output_regs = (access1 or self._path_access_sets(path1))['output_regs']
 
 			# path2の入力レジスタ
-			input_regs = set()
-			for comp in path2.get('computation', {}).get('sequence', []):
-				input_regs.update(comp['input_regs'])
+			input_regs = (access2 or self._path_access_sets(path2))['input_regs']
 
 			# 依存関係の検出
 			for reg in output_regs & input_regs:  # 共通するレジスタを検出
@@ -995,33 +1477,32 @@ class ComputeDataPath:
 			print(f"Error finding register dependency: {e}")
 			return []
 
-	def _find_memory_dependency(self, path1: Dict, path2: Dict) -> List[Dict]:
+	def _find_memory_dependency(self, path1: Dict, path2: Dict,
+			access1: Optional[Dict] = None, access2: Optional[Dict] = None) -> List[Dict]:
 		"""メモリ依存の検出"""
 		try:
 			deps = []
 
 			# path1の出力配列アクセス
-			outputs1 = []
-			if path1.get('output', {}).get('type') == 'memory':
-				outputs1.append(path1['output'])
+			outputs1 = (access1 or self._path_access_sets(path1))['stores']
 
 			# path2の入力配列アクセス
-			inputs2 = path2.get('inputs', {}).get('loads', [])
+			inputs2 = (access2 or self._path_access_sets(path2))['loads']
 
 			# 依存関係の検出
 			for out in outputs1:
 				for inp in inputs2:
 					if out['array'] == inp['array']:
-						# 同じ配列へのアクセスを検出
-						if self._check_array_indices_overlap(
-							out.get('index_regs', []),
-							inp.get('index_regs', [])
-						):
+						# 同じ配列へのアクセスの依存テスト
+						dependence = self._check_array_indices_overlap(out, inp)
+						if dependence is not None:
 							deps.append({
 								'source_path': path1['path_id'],
 								'target_path': path2['path_id'],
 								'type': 'memory',
-								'through': out['array']
+								'through': out['array'],
+								'direction': dependence['direction'],
+								'distance': dependence['distance']
 							})
 
 			return deps
@@ -1030,8 +1511,12 @@ class ComputeDataPath:
 			print(f"Error finding memory dependency: {e}")
 			return []
 
-	def _find_loop_carried_dependency(self, path1: Dict, path2: Dict) -> List[Dict]:
-		"""ループ伝搬依存の検出"""
+	def _find_loop_carried_dependency(self, path1: Dict, path2: Dict,
+			reg_deps: Optional[List[Dict]] = None, mem_deps: Optional[List[Dict]] = None) -> List[Dict]:
+		"""
+		ループ伝搬依存の検出
+		reg_deps/mem_deps: 同じペアで検出済みの依存 (省略時は再検出)
+		"""
 		try:
 			deps = []
 
@@ -1045,7 +1530,8 @@ class ComputeDataPath:
 				loop_ctx2.get('is_loop_carried')):
 
 				# レジスタ依存のチェック
-				reg_deps = self._find_register_dependency(path1, path2)
+				if reg_deps is None:
+					reg_deps = self._find_register_dependency(path1, path2)
 				for dep in reg_deps:
 					deps.append({
 						**dep,
@@ -1053,9 +1539,12 @@ class ComputeDataPath:
 						'loop_level': loop_ctx1['level']
 					})
 
-				# メモリ依存のチェック
-				mem_deps = self._find_memory_dependency(path1, path2)
+				# メモリ依存のチェック (ループで運ばれる依存のみ)
+				if mem_deps is None:
+					mem_deps = self._find_memory_dependency(path1, path2)
 				for dep in mem_deps:
+					if not DependenceUtils.IsLoopCarried(dep):
+						continue
 					deps.append({
 						**dep,
 						'type': 'loop_carried',
@@ -1068,38 +1557,51 @@ class ComputeDataPath:
 			print(f"Error finding loop-carried dependency: {e}")
 			return []
 
-	def _check_array_indices_overlap(self, indices1: List[str], indices2: List[str]) -> bool:
-		"""配列インデックスの重なりをチェック"""
+	def _check_array_indices_overlap(self, access1: Dict, access2: Dict) -> Optional[Dict]:
+		"""
+		同じ配列への2つのアクセス (store→load) の依存テスト
+		アフィン形式のインデックスでZIV/SIV/GCD/Banerjeeテストを行う
+		Returns:
+			None: 依存なし
+			{'loops', 'direction', 'distance', 'vectors'}: 依存あり (ループ毎の方向/距離)
+			インデックスがアフィンでない場合は全方向の依存とみなす
+		"""
 		try:
-			# インデックスレジスタが完全に一致する場合
-			if set(indices1) == set(indices2):
-				return True
+			expr1 = access1.get('index_expr')
+			expr2 = access2.get('index_expr')
+			if expr1 is None or expr2 is None or not expr1.subscripts or not expr2.subscripts:
+				loop_vars = sorted(set(access1.get('index_regs', [])) | set(access2.get('index_regs', [])))
+				return DependenceUtils.AnyDependence(loop_vars)
 
-			# インデックス計算式の解析が必要な場合
-			# （現時点では簡易的な実装）
-			common_indices = set(indices1) & set(indices2)
-			return len(common_indices) > 0
+			return DependenceUtils.TestDependence(expr1.subscripts, expr2.subscripts,
+				bounds=self.analyzer._loop_iteration_bounds())
 
 		except Exception as e:
 			print(f"Error checking array indices overlap: {e}")
-			return False
+			return DependenceUtils.AnyDependence([])
 
 class Analyzer:
-	def __init__(self, r_file_path: str, r_file_name: str):
+	def __init__(self, r_file_path: str, r_file_name: str, cache_limits: Optional[Dict[str, int]] = None, num_workers: int = 1, ir_file: Optional[str] = None):
 		self.r_path = r_file_path
 		self.r_name = r_file_name
+		# グラフファイル (_cfg_loop, ノードリスト, AM, パス) の名前 (キャッシュのキーと共通)
+		self.g_name = FileUtils.GraphFileName(r_file_name)
+		# LLVM IRファイル (ループの境界, 配列のサイズ), 指定がなければ "r_name".ll
+		self.ir_file = ir_file if ir_file is not None else FileUtils.IRFileName(r_file_path, r_file_name)
+		# 基本ブロック解析の並列数 (1: 逐次)
+		self.num_workers = num_workers
+		# 解析キャッシュ (領域: node_list, am, block_preds, gep_chain, def_use, loop_def_use, array_dims, index_expr, ir_defs)
+		self.cache = AnalysisCache.AnalysisCache(cache_limits)
 		self.loops = self._read_loop_structure()
 		self.array_patterns: Dict = {}
 		self.pointer_regs_info: Dict = {}
 		self.store_load_deps: Dict = {}
 		self.cfg_connectivity: Dict = {}
-		self._node_list_cache = {}
-		self._am_cache = {}
-		self._gep_chain_cache = {}
-		self.nodes_cache = {}
+		self._path_db = None
 		all_nodes, node_to_block = self._collect_all_nodes()
 		self.all_nodes = all_nodes
 		self.node_to_block = node_to_block
+		self.reg_gep_index = self._build_reg_gep_index()
 		self.loop_levels = self._analyze_loop_levels()
 		self.compute_path_analyzer = ComputeDataPath(self)
 
@@ -1116,7 +1618,7 @@ class Analyzer:
 						continue
 					all_nodes[block_id] = nodes
 					for node in nodes:
-						node = node[0].split()
+						node = _tokens(node)
 						if node and node[0].isdigit():
 							node_to_block[node[0]] = block_id
 
@@ -1125,12 +1627,117 @@ class Analyzer:
 				print(f"Error collecting all nodes: {e}")
 				return {}
 
+	def _build_reg_gep_index(self) -> Dict[str, Dict[str, Any]]:
+		"""
+		レジスタ→getelementptrノード→配列名/インデックスレジスタの逆引き索引を作成
+		Returns:
+			{
+				reg: {
+					'geps': [(block_id, node_id), ...],	# regを定義/使用するGEPノード
+					'array_name': Optional[str],		# 解決された配列名
+					'index_regs': List[str]				# GEPのレジスタオペランド
+				}
+			}
+		"""
+		index = {}
+		try:
+			for block_id, nodes in self.all_nodes.items():
+				preds = None
+				for node in nodes:
+					node_info = _tokens(node)
+					if len(node_info) < 2 or 'getelementptr' not in str(node_info[1]):
+						continue
+
+					operands = node_info[2:]
+					array_name = None
+					resolved = False
+
+					for reg in operands:
+						entry = index.get(reg)
+						if entry is None:
+							entry = {'geps': [], 'array_name': None, 'index_regs': [], 'resolved': False}
+							index[reg] = entry
+						if (block_id, node_info[0]) not in entry['geps']:
+							entry['geps'].append((block_id, node_info[0]))
+						for operand in operands:
+							if operand.startswith('%') and operand not in entry['index_regs']:
+								entry['index_regs'].append(operand)
+
+						if entry['resolved']:
+							continue
+
+						# 配列名の解決 (最初に解決できたGEPを採用)
+						if not resolved:
+							resolved = True
+							array_match = re.search(r'@([a-zA-Z0-9_]+)', str(node_info[1]))
+							if array_match:
+								array_name = (True, array_match.group(1))
+							else:
+								# 先行するgetelementptrを逆辺で探索
+								if preds is None:
+									preds = self._get_block_preds(block_id)
+								array_name = self._resolve_array_from_preds(
+									preds.get(int(node_info[0]), []), nodes)
+
+						if array_name is not None:
+							entry['resolved'] = True
+							entry['array_name'] = array_name[1]
+
+			for entry in index.values():
+				del entry['resolved']
+
+			return index
+
+		except Exception as e:
+			print(f"Error building register index: {e}")
+			return index
+
+	def _resolve_array_from_preds(self, src_ids: List[int], nodes: List[List[str]]) -> Optional[Tuple[bool, Optional[str]]]:
+		"""
+		先行ノードのgetelementptrから配列名を解決
+		Returns:
+			(True, 配列名) 解決時, (True, None) 解析エラー時, None 未解決時
+		"""
+		try:
+			for src_idx in src_ids:
+				if src_idx >= len(nodes):
+					continue
+
+				src_node = _tokens(nodes[src_idx])
+				if 'getelementptr' in src_node[1]:
+					array_match = src_node[1].split('_')[1][1:]
+					if array_match:
+						return (True, array_match)
+			return None
+
+		except Exception as e:
+			print(f"Error in _get_array_from_reg: {e}")
+			return (True, None)
+
+	def _read_am(self, block_id: str) -> Tuple[int, List[List[int]]]:
+		"""基本ブロックのAMを読み込み (キャッシュ付き)"""
+		am_file = f"{self.g_name}_bblock_{block_id}"
+		return self.cache.GetOrCompute('am', block_id,
+			lambda: AMUtils.Preprocess(self.r_path, am_file))
+
+	def _get_block_preds(self, block_id: str) -> Dict[int, List[int]]:
+		"""AMの逆辺 (ノード→先行ノードのリスト, 昇順)"""
+		hit, preds = self.cache.Get('block_preds', block_id)
+		if hit:
+			return preds
+
+		am_size, am = self._read_am(block_id)
+		preds = {}
+		for src_idx in range(am_size):
+			for dst_idx, elm in enumerate(am[src_idx]):
+				if elm:
+					preds.setdefault(dst_idx, []).append(src_idx)
+		return self.cache.Put('block_preds', block_id, preds)
+
 	def _get_all_block_ids(self):
 		"""全ての基本ブロックIDを取得する"""
 		try:
-			#REMOVE
-			#cfg_loop_file = os.path.join(self.r_path, f"{self.r_name}_cfg_loop.txt")
-			cfg_loop_file = os.path.join(self.r_path, f"noundef_cfg_loop.txt")
+			cfg_loop_file = os.path.join(self.r_path, f"{self.g_name}_cfg_loop.txt")
 			if not os.path.exists(cfg_loop_file):
 				print(f"Warning: CFG loop file not found: {cfg_loop_file}")
 				return []
@@ -1152,7 +1759,6 @@ class Analyzer:
 			print(f"An unexpected error occurred: {e}")
 			return []
 
-	@functools.lru_cache(maxsize=128)
 	def _read_node_list(self, block_id: str) -> List[List[str]]:
 		"""
 		基本ブロックのノードリストを読み込み
@@ -1170,25 +1776,22 @@ class Analyzer:
 			- LEAFノードは最後の要素が"LEAF"
 			- 通常ノードはオペコードとオペランドのリスト
 		"""
-		if block_id in self.nodes_cache:
-			return self.nodes_cache[block_id]
+		hit, nodes = self.cache.Get('node_list', block_id)
+		if hit:
+			return nodes
 
 		try:
-			#REMOVE
-			#file_path = os.path.join(self.r_path, f"{self.r_name}_bblock_{block_id}_node_list.txt")
-			file_path = os.path.join(self.r_path, f"noundef_bblock_{block_id}_node_list.txt")
+			file_path = os.path.join(self.r_path, f"{self.g_name}_bblock_{block_id}_node_list.txt")
 			if not os.path.exists(file_path):
 				print(f"Warning: Node file not found: {file_path}")
-				return []
+				return self.cache.Put('node_list', block_id, [])
 
 			nodes: List[List[str]] = []
 			with open(file_path, 'r') as f:
 				for line in f:
-					node = line.strip().split(',')
-					nodes.append(node)
+					nodes.append(NodeRecord(line.strip().split(',')))
 
-			self.nodes_cache[block_id] = nodes
-			return nodes
+			return self.cache.Put('node_list', block_id, nodes)
 
 		except Exception as e:
 			print(f"Error reading node list from {file_path}: {e}")
@@ -1198,9 +1801,7 @@ class Analyzer:
 		"""パスファイルの読み込み"""
 		try:
 			path_file = os.path.join(self.r_path,
-				#REMOVE
-				#f"{self.r_name}_bblock_{block_id}_bpath_{path_type}.txt")
-				f"noundef_bblock_{block_id}_bpath_{path_type}.txt")
+				f"{self.g_name}_bblock_{block_id}_bpath_{path_type}.txt")
 			if not os.path.exists(path_file):
 				return []
 			with open(path_file, 'r') as f:
@@ -1208,6 +1809,27 @@ class Analyzer:
 		except Exception:
 			return []
 
+	def _read_paths(self, block_id: str, path_type: str) -> List[List[str]]:
+		"""
+		パスの読み込み (パスデータベース優先, 無い場合は従来のパスファイル)
+		Args:
+			block_id: 基本ブロックID
+			path_type: 'st_root', 'st_leaf', 'st_ld', 'ld_ld', 'ld_leaf'
+		Returns:
+			[["1","2","3"], ["4","5","6"]]
+		"""
+		if self._path_db is None:
+			self._path_db = FileUtils.ReadPathDB(self.r_path, f"{self.g_name}_bblock")
+			if self._path_db is None:
+				self._path_db = False
+
+		if self._path_db:
+			return [[str(node_id) for node_id in path]
+				for path in self._path_db.Read(block_id, path_type)]
+
+		formatted_paths = self._path_formatter(self._read_path_file(block_id, path_type))
+		return formatted_paths[0] if formatted_paths else []
+
 	def _path_formatter(self, paths: List[str]) -> List[List[List[str]]]:
 		"""
 		パス情報のフォーマット処理
@@ -1250,76 +1872,6 @@ class Analyzer:
 			print(f"Error in path formatter: {e}")
 			return []
 
-	def _path_formatter2(self, path: str) -> List[List[str]]:
-			"""
-			パス情報のフォーマット処理 (文字列またはリストに対応)
-			"""
-			try:
-				formatted_path = []
-				if not path:
-					return formatted_path
-
-				if isinstance(path, str):
-					segments = path.split('[')[1:]
-
-					for segment in segments:
-						node_ids = segment.replace(']', '').replace(' ', '')
-						if node_ids:
-							nodes = node_ids.split(',')
-							nodes = [n for n in nodes if n]
-							if nodes:
-								formatted_path.append(nodes)
-				elif isinstance(path, list):
-					formatted_path.append([str(n) for n in path])
-				else:
-					print(f"Warning: Invalid path type: {type(path)}")
-					return []
-
-				return formatted_path
-
-			except Exception as e:
-				print(f"Error in path formatter2: {e}")
-				return []
-
-	def _format_path(path_str: Optional[str]) -> List[List[str]]:
-		"""
-		Formats a path string into a list of node ID lists.
-
-		Handles both single and multiple path strings.
-
-		Args:
-			path_str: The path string to format (e.g., "[1,2,3][4,5,6]" or "[[1,2,3][4,5,6]][[7,8][9]]").
-				Can be None or empty.
-
-		Returns:
-			A list of lists of node IDs, or an empty list if the input is invalid.
-			For example:
-				_format_path("[1,2,3][4,5,6]") == [["1", "2", "3"], ["4", "5", "6"]]
-				_format_path("[[1,2][3]][[4,5]]") == [["1","2"], ["3"]], [["4","5"]]
-				_format_path("") == []
-				_format_path(None) == []
-		"""
-		if not path_str or not path_str.strip():
-			return []
-
-		paths = path_str.split('][')
-		formatted_paths: List[List[List[str]]] = []
-		for path in paths:
-			path = path.strip('[]')
-
-			formatted_path: List[List[str]] = []
-			segments = re.findall(r"\[([^\]]+)\]", path)
-			for segment in segments:
-				nodes = [node.strip() for node in segment.split(',') if node.strip()]
-				if nodes:
-					formatted_path.append(nodes)
-			if formatted_path:
-				formatted_paths.append(formatted_path)
-
-		if len(formatted_paths) == 1:
-			return formatted_paths[0]
-		return formatted_paths
-
 	def _find_begin_geps(self, block_id: str) -> List[Dict[str, Any]]:
 		"""
 		始端getelementptrノードの特定
@@ -1350,23 +1902,10 @@ class Analyzer:
 			if not nodes:
 				return [default_gep]
 
-			# 2. ld-to-ldパスファイルの読み込みと解析
-			ld_ld_path = os.path.join(self.r_path,
-				#REMOVE
-				#f"{self.r_name}_bblock_{block_id}_bpath_ld_ld.txt")
-				f"noundef_bblock_{block_id}_bpath_ld_ld.txt")
-
-			if not os.path.exists(ld_ld_path):
-				return [default_gep]
-
-			with open(ld_ld_path, 'r') as f:
-				ld_ld_paths = f.readlines()
-
-			if not ld_ld_paths:
-				return [default_gep]
+			# 2. ld-to-ldパスの読み込み
+			paths = self._read_paths(block_id, 'ld_ld')
 
-			# 3. パス情報の解析
-			paths = self._path_formatter(ld_ld_paths)[0]
+			# 3. パス情報の確認
 			if not paths or not paths[0]:
 				return [default_gep]
 
@@ -1445,10 +1984,7 @@ class Analyzer:
 				return terminal_geps
 
 			# 2. AMファイルの読み込みと処理
-			#REMOVE
-			#am_file = f"{self.r_name}_bblock_{block_id}"
-			am_file = f"noundef_bblock_{block_id}"
-			am_size, am = AMUtils.Preprocess(self.r_path, am_file)
+			am_size, am = self._read_am(block_id)
 
 			# 3. 各getelementptrノードの解析
 			for gep in gep_nodes:
@@ -1460,7 +1996,7 @@ class Analyzer:
 						if dst_idx >= len(nodes):
 							continue
 
-						dst_node = nodes[dst_idx][0].split()
+						dst_node = _tokens(nodes[dst_idx])
 						if len(dst_node) > 1:
 							# load/store命令に接続している場合は終端GEPと判定
 							if 'load' in dst_node[1] or 'store' in dst_node[1]:
@@ -1523,7 +2059,7 @@ class Analyzer:
 
 			# 3. load命令の検索
 			for line_num, node in enumerate(node_info):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) < 2:
 					continue
 				if 'load' in node[1] and store_reg in node[3]:
@@ -1568,7 +2104,7 @@ class Analyzer:
 
 			# 各ノードの解析
 			for line_num, node in enumerate(node_info):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) < 2:
 					continue
 
@@ -1613,9 +2149,7 @@ class Analyzer:
 		"""
 		try:
 			# 1. ループ構造ファイルの読み込み
-			#REMOVE
-			#loop_file_path = os.path.join(self.r_path, f"{self.r_name}_cfg_loop.txt")
-			loop_file_path = os.path.join(self.r_path, f"noundef_cfg_loop.txt")
+			loop_file_path = os.path.join(self.r_path, f"{self.g_name}_cfg_loop.txt")
 			if not os.path.exists(loop_file_path):
 				return []
 
@@ -1686,7 +2220,8 @@ class Analyzer:
 					exit=loop_nodes[-1],
 					parent=parent_level,
 					children=children_levels,
-					array_dims=array_dims
+					array_dims=array_dims,
+					**self._analyze_loop_bounds(loop_nodes)
 				)
 
 			return result
@@ -1695,6 +2230,119 @@ class Analyzer:
 			print(f"Error analyzing loop levels: {e}")
 			return result
 
+	def _analyze_loop_bounds(self, loop_nodes: List[str]) -> Dict[str, Any]:
+		"""
+		ループの誘導変数, 初期値, 増分, 境界値, 反復回数をIRから抽出
+			増分:	ループ内で "store (iv + step), iv" となるスロット (ラッチのadd)
+			境界:	ヘッダのicmpで誘導変数と比較される値
+			初期値:	ループ外 (プリヘッダ) で誘導変数に格納される値
+		Returns:
+			LoopInfoのフィールド {induction_var, start, step, bound, predicate, trip_count}
+			抽出できない項目はNone
+		"""
+		bounds = {}
+		try:
+			ir_defs = self._get_ir_defs()
+
+			# 誘導変数の候補と増分 (ループ内のstore)
+			steps = {}
+			for block_id in loop_nodes:
+				node_tokens = [_tokens(node) for node in self._read_node_list(block_id)]
+				defs = AffineUtils.NodeDefs(node_tokens)
+				for value, slot in self._slot_stores(node_tokens):
+					expr = self._fold_ir_value(defs, value, ir_defs)
+					if expr is None:
+						continue
+					step = expr.Sub(AffineUtils.AffineExpr.Var(slot))
+					if step.IsConst() and step.const != 0:
+						steps[slot] = step.const
+
+			# ヘッダの比較 "iv <predicate> bound"
+			node_tokens = [_tokens(node) for node in self._read_node_list(loop_nodes[0])]
+			defs = AffineUtils.NodeDefs(node_tokens)
+			for dst, (opcode, _, operands) in defs.items():
+				if opcode != 'icmp' or len(operands) != 2:
+					continue
+
+				# operands are in reverse order of LLVM IR
+				lhs, rhs = [self._fold_ir_value(defs, operand, ir_defs) for operand in operands[::-1]]
+				predicate = ir_defs['predicates'].get(dst, 'slt')
+				iv = self._induction_slot(lhs, steps)
+				bound = rhs
+				if iv is None:
+					iv = self._induction_slot(rhs, steps)
+					bound = lhs
+					predicate = _SWAPPED_PREDICATES.get(predicate, predicate)
+				if iv is None or bound is None:
+					continue
+
+				start = self._find_loop_start(iv, loop_nodes, ir_defs)
+				bounds = {
+					'induction_var': iv,
+					'start': _affine_value(start),
+					'step': steps[iv],
+					'bound': _affine_value(bound),
+					'predicate': predicate,
+					'trip_count': AffineUtils.TripCount(start, bound, steps[iv], predicate)
+				}
+				break
+
+			return bounds
+
+		except Exception as e:
+			print(f"Error analyzing loop bounds: {e}")
+			return bounds
+
+	def _slot_stores(self, node_tokens: List[List[str]]) -> List[Tuple[str, str]]:
+		"""ノードリスト中のstore (値, 格納先) の一覧"""
+		stores = []
+		for tokens in node_tokens:
+			if len(tokens) == 5 and tokens[1].startswith('store_'):
+				# operands are in reverse order of LLVM IR
+				stores.append((tokens[4], tokens[3]))
+		return stores
+
+	def _fold_ir_value(self, defs: Dict, value: str, ir_defs: Dict) -> Optional[AffineUtils.AffineExpr]:
+		"""
+		値をアフィン形式に畳み込む
+		ブロック外で定義されたレジスタがIRでスロットからのloadであればスロットに置き換える
+		"""
+		expr = AffineUtils.FoldRegister(defs, value)
+		if expr is None:
+			return None
+		return expr.Rename(ir_defs['loads'])
+
+	def _induction_slot(self, expr: Optional[AffineUtils.AffineExpr], steps: Dict[str, int]) -> Optional[str]:
+		"""式がループ内で増分される誘導変数そのものであればその変数"""
+		if expr is None or expr.const != 0 or len(expr.coeffs) != 1:
+			return None
+		var = expr.Vars()[0]
+		return var if expr.Coeff(var) == 1 and var in steps else None
+
+	def _find_loop_start(self, iv: str, loop_nodes: List[str], ir_defs: Dict) -> Optional[AffineUtils.AffineExpr]:
+		"""
+		誘導変数の初期値
+		外側ループのブロック (プリヘッダ) のstoreを探し, ない場合 (エントリブロック) はIRのstoreを参照
+		"""
+		for outer_nodes in self.loops:
+			for block_id in outer_nodes:
+				if block_id in loop_nodes:
+					continue
+				node_tokens = [_tokens(node) for node in self._read_node_list(block_id)]
+				defs = AffineUtils.NodeDefs(node_tokens)
+				for value, slot in self._slot_stores(node_tokens):
+					if slot != iv:
+						continue
+					# 増分のstore (内側ループのラッチ) は除く
+					start = self._fold_ir_value(defs, value, ir_defs)
+					if start is not None and iv not in start.coeffs:
+						return start
+
+		values = ir_defs['const_stores'].get(iv, [])
+		if len(set(values)) == 1:
+			return AffineUtils.AffineExpr(values[0])
+		return None
+
 	def _collect_array_dimensions_for_loop(self, loop_nodes: List[str]) -> Dict[str, Dict[str, int]]:
 		"""ループ内の配列アクセス次元を収集"""
 		array_dims = {}
@@ -1705,7 +2353,7 @@ class Analyzer:
 					continue
 
 				for node in nodes:
-					node = node[0].split()
+					node = _tokens(node)
 					if 'getelementptr' in str(node[1]):
 						array_match = re.search(r'@([a-zA-Z0-9_]+)', str(node[1]))
 						if array_match:
@@ -1816,7 +2464,7 @@ class Analyzer:
 			store_deps = {}
 
 			for line_num, node in enumerate(nodes):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) > 1:
 					if 'load' in node[1]:
 						for pointer_reg in pointer_regs:
@@ -2014,7 +2662,7 @@ class Analyzer:
 
 				found_definition = False
 				for node_id, node in enumerate(nodes_in_block):
-					node = node[0].split()
+					node = _tokens(node)
 					if (current_block, node_id) in visited_nodes:
 						print(f"Warning: Already visited node: {(current_block, node_id)}, possible loop in data flow")
 						return None
@@ -2318,10 +2966,7 @@ class Analyzer:
 		gep_chain = []
 		try:
 			# AMファイルを使用してノード間の接続を取得
-			#REMOVE
-			#am_file = f"{self.r_name}_bblock_{block_id}"
-			am_file = f"noundef_bblock_{block_id}"
-			am_size, am = AMUtils.Preprocess(self.r_path, am_file)
+			am_size, am = self._read_am(block_id)
 
 			# ノード情報を取得
 			nodes = self._read_node_list(block_id)
@@ -2334,7 +2979,7 @@ class Analyzer:
 
 			while current_id and current_id not in visited:
 				visited.add(current_id)
-				current_node = nodes[int(current_id)][0].split()
+				current_node = _tokens(nodes[int(current_id)])
 
 				if 'getelementptr' not in current_node[1]:
 					break
@@ -2366,7 +3011,7 @@ class Analyzer:
 				current_idx = int(current_id)
 				for dst_idx in range(am_size):
 					if am[current_idx][dst_idx]:
-						dst_node = nodes[dst_idx][0].split()
+						dst_node = _tokens(nodes[dst_idx])
 						if 'getelementptr' in dst_node[1]:
 							next_id = str(dst_idx)
 							break
@@ -2389,7 +3034,7 @@ class Analyzer:
 
 		try:
 			for i, node in enumerate(node_info):
-				node = node[0].split()
+				node = _tokens(node)
 
 				# getelementptrチェーンの開始点を探す
 				if 'getelementptr' in str(node[1]):
@@ -2474,7 +3119,7 @@ class Analyzer:
 					if nodes:
 						#print(f"    Checking nodes for register usage...")
 						for node in nodes:
-							node_parts = node[0].split()
+							node_parts = _tokens(node)
 							if reg in node_parts:
 								#print(f"    Found register {reg} in node: {' '.join(node_parts)}")
 								if any(op in node_parts[1] for op in ['add', 'mul', 'phi', 'icmp', 'shl', 'or']):
@@ -2486,7 +3131,7 @@ class Analyzer:
 					if header_nodes:
 						#print(f"    Checking header block {info.header}...")
 						for node in header_nodes:
-							node_parts = node[0].split()
+							node_parts = _tokens(node)
 							if reg in node_parts and any(op in node_parts[1] for op in ['add', 'mul', 'phi', 'icmp', 'shl', 'or']):
 								#print(f"    Register is used in loop header")
 								return level
@@ -2505,13 +3150,7 @@ class Analyzer:
 	def _is_register_defined_in_loop(self, reg: str, loop_nodes: List[str]) -> bool:
 		"""レジスタがループ内で定義されているか確認"""
 		try:
-			for node_id in loop_nodes:
-				nodes = self._read_node_list(node_id)
-				for node in nodes:
-					node = node[0].split()
-					if len(node) > 2 and node[2] == reg:  # レジスタが定義される位置
-						return True
-			return False
+			return reg in self._get_loop_def_use(loop_nodes)['defs']
 		except Exception as e:
 			print(f"Error checking register definition: {e}")
 			return False
@@ -2520,12 +3159,10 @@ class Analyzer:
 		"""配列の各次元のサイズを取得"""
 		try:
 			#print(f"\n  Looking for size of array {array_name}, dimension {dimension}")
-			llvm_file = os.path.join(self.r_path, f"{self.r_name}.ll")
-			if not os.path.exists(llvm_file):
-				print(f"    LLVM file not found: {llvm_file}")
+			if self.ir_file is None:
 				return 0
 
-			with open(llvm_file, 'r') as f:
+			with open(self.ir_file, 'r') as f:
 				for line in f:
 					if f'@{array_name} =' in line:
 						#print(f"    Found array definition: {line.strip()}")
@@ -2544,18 +3181,19 @@ class Analyzer:
 	def _analyze_array_access_patterns(self, block_id: str, pointer_regs_info: List[Dict]) -> Dict:
 		"""ブロック内の配列アクセスパターンを分析"""
 		array_accesses = {}
-		#REMOVE
-		#node_list_path = os.path.join(self.r_path, f"{self.r_name}_bblock_{block_id}_node_list.txt")
-		node_list_path = os.path.join(self.r_path, f"noundef_{block_id}_node_list.txt")
-		#bpath_st_ld_path = os.path.join(self.r_path, f"{self.r_name}_bblock_{block_id}_bpath_st_ld.txt")
-		bpath_st_ld_path = os.path.join(self.r_path, f"noundef_bblock_{block_id}_bpath_st_ld.txt")
+		node_list_path = os.path.join(self.r_path, f"{self.g_name}_{block_id}_node_list.txt")
 
 		print(f"  Analyzing Array Access Pattern")
 
-		if not os.path.exists(node_list_path) or not os.path.exists(bpath_st_ld_path):
+		if not os.path.exists(node_list_path):
 			print("    File not found")
 			return array_accesses
 
+		st_ld_paths = self._read_paths(block_id, 'st_ld')
+		if not st_ld_paths:
+			print("    Path not found")
+			return array_accesses
+
 		array_accesses = {}
 		for pointer_regs in pointer_regs_info:
 			array_name = pointer_regs["array_name"]
@@ -2563,25 +3201,18 @@ class Analyzer:
 				print("Could not find array name in pointer_regs_info")
 				continue
 
-			with open(bpath_st_ld_path, 'r') as f:
-				for line in f:
-					st_ld_paths = self._path_formatter(line)
-					if not st_ld_paths:
-						continue
-					store_id = st_ld_paths[0][0]
-					load_ids = []
-					for st_ld_path in st_ld_paths:
-						load_ids.append(st_ld_path[-1])
+			store_id = st_ld_paths[0][0]
+			load_ids = []
+			for st_ld_path in st_ld_paths:
+				load_ids.append(st_ld_path[-1])
 
-					if not load_ids:
-						continue
-					if array_name not in array_accesses:
-						array_accesses[array_name] = {"access_paths": []}
-					array_accesses[array_name]["access_paths"].append({
-						"store_id": store_id,
-						"load_ids": load_ids,
-						"defined_reg":pointer_regs['index_regs']['regs']
-					})
+			if array_name not in array_accesses:
+				array_accesses[array_name] = {"access_paths": []}
+			array_accesses[array_name]["access_paths"].append({
+				"store_id": store_id,
+				"load_ids": load_ids,
+				"defined_reg":pointer_regs['index_regs']['regs']
+			})
 
 		return array_accesses
 
@@ -2688,22 +3319,8 @@ class Analyzer:
 			List[str]: インデックスレジスタのリスト
 		"""
 		try:
-			index_regs = []
-
-			# 全基本ブロックのノードを探索
-			for block_id, nodes in self.all_nodes.items():
-				for node in nodes:
-					node_info = node[0].split()
-					if 'getelementptr' in str(node_info[1]):
-						# このregを使用するgetelementptrを探す
-						if reg in node_info[2:]:
-							# レジスタ形式のオペランドを収集
-							for operand in node_info[2:]:
-								if operand.startswith('%'):
-									if operand not in index_regs:
-										index_regs.append(operand)
-
-			return index_regs
+			# このregを使用するgetelementptrのレジスタ形式オペランド (索引参照)
+			return list(self.reg_gep_index.get(reg, {}).get('index_regs', []))
 
 		except Exception as e:
 			print(f"Error getting index registers from {reg}: {e}")
@@ -2726,10 +3343,10 @@ class Analyzer:
 		}
 		array_name = 'None'
 		try:
-			# 1. パスファイルの読み込み
+			# 1. パスの読み込み
 			paths = {
-				'ld_leaf': self._read_path_file(block_id, 'ld_leaf'),
-				'ld_ld': self._read_path_file(block_id, 'ld_ld')
+				'ld_leaf': self._read_paths(block_id, 'ld_leaf'),
+				'ld_ld': self._read_paths(block_id, 'ld_ld')
 			}
 
 			if not any(paths.values()) or not paths['ld_ld']:
@@ -2741,23 +3358,12 @@ class Analyzer:
 				return array_name, reg_info
 
 			# 3. AMの読み込み
-			#REMOVE
-			#am_file = f"{self.r_name}_bblock_{block_id}"
-			am_file = f"noundef_bblock_{block_id}"
-			if am_file not in self._am_cache:
-				am_size, am = AMUtils.Preprocess(self.r_path, am_file)
-				self._am_cache[am_file] = (am_size, am)
-			else:
-				am_size, am = self._am_cache[am_file]
+			am_size, am = self._read_am(block_id)
 
 			# 4. 終端ノードからのレジスタ収集
-			formatted_paths = self._path_formatter(paths['ld_ld'])
-			if not formatted_paths:
-				return array_name, reg_info
-
 			array_name, term_registers, ld_node_ids = self._collect_from_terminal(
 				term_gep[0],
-				formatted_paths[0],
+				paths['ld_ld'],
 				nodes
 			)
 			if term_registers:
@@ -2786,6 +3392,9 @@ class Analyzer:
 			# 7. 次元数の設定
 			reg_info['array_dim'] = len(reg_info['regs'])
 
+			# 8. アフィン形式のインデックス
+			reg_info['index_expr'] = self._get_index_expression(block_id, term_gep[1][2])
+
 			return array_name, reg_info
 
 		except Exception as e:
@@ -2808,7 +3417,7 @@ class Analyzer:
 					start_node_ids.append(start_node_id)
 					path_no.append(no)
 					for node in nodes:
-						node = node[0].split()
+						node = _tokens(node)
 
 						if len(node) > 2 and str(term_node_id) in node[0] and 'load' in node[1]:
 							reg = node[-1]
@@ -2818,7 +3427,7 @@ class Analyzer:
 					ld_path = ld_paths[no]
 					for id in ld_path:
 						node = nodes[int(id)]
-						node = node[0].split()
+						node = _tokens(node)
 						if '@' in node[1]:
 							array_name = node[1].split('_')[1][1:]
 
@@ -2833,15 +3442,13 @@ class Analyzer:
 		registers = []
 		try:
 			for ld_node_id in ld_node_ids:
-				for leaf_path_str in leaf_paths:
-					leaf_paths = self._path_formatter2(leaf_path_str)
-					for leaf_path in leaf_paths:
-						if str(ld_node_id) in str(leaf_path[0]):
-							leaf_node = nodes[int(leaf_path[-1])][0].split()
-							if leaf_node[-1] == 'LEAF' and leaf_node[1].startswith('%'):
-								reg = leaf_node[1]
-								if reg not in registers:
-									registers.append(reg)
+				for leaf_path in leaf_paths:
+					if str(ld_node_id) in str(leaf_path[0]):
+						leaf_node = _tokens(nodes[int(leaf_path[-1])])
+						if leaf_node[-1] == 'LEAF' and leaf_node[1].startswith('%'):
+							reg = leaf_node[1]
+							if reg not in registers:
+								registers.append(reg)
 			return registers
 
 		except Exception:
@@ -2852,7 +3459,7 @@ class Analyzer:
 		"""レジスタの依存関係分析"""
 		try:
 			for line_num, node in enumerate(nodes):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) > 2 and reg in node[1]:
 					for src_idx in range(am_size):
 						if am[src_idx][line_num]:
@@ -3108,7 +3715,7 @@ class Analyzer:
 
 			# 3. load命令の探索と依存関係の解析
 			for line_num, node in enumerate(nodes):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) < 2:
 					continue
 
@@ -3300,7 +3907,7 @@ class Analyzer:
 			# 2. getelementptrノードの収集
 			gep_nodes = []
 			for line_num, node in enumerate(nodes):
-				node = node[0].split()
+				node = _tokens(node)
 				if len(node) > 1 and 'getelementptr' in node[1]:
 					gep_nodes.append((line_num, node))
 
@@ -3471,7 +4078,7 @@ class Analyzer:
 
 			# レジスタの定義位置を確認
 			for line_num, node in enumerate(nodes):
-				node - node[0].split()
+				node - _tokens(node)
 				if len(node) > 2 and reg in node[1]:
 					# レジスタがループヘッダで定義され、ループ内で使用される場合
 					if (loop_info['loop_info']['current']['is_header'] and
@@ -3490,8 +4097,7 @@ class Analyzer:
 		指定したブロック内でレジスタが使用されているか確認
 		"""
 		try:
-			nodes = self._read_node_list(block_id)
-			return any(reg in node[0].split() for node in nodes if len(node) > 1)
+			return reg in self._get_block_def_use(block_id)['uses']
 		except Exception:
 			return False
 
@@ -3540,7 +4146,7 @@ class Analyzer:
 
 				# レジスタを使用するGEPノードを検索
 				for line_num, node in enumerate(nodes):
-					node = node[0].split()
+					node = _tokens(node)
 					if len(node) > 1 and 'getelementptr' in node[1] and reg in node[1]:
 						gep_nodes.append(str(line_num))
 						# 配列名の抽出（形式: getelementptr_@array_name）
@@ -3603,23 +4209,17 @@ class Analyzer:
 			if not nodes:
 				return None
 
-			# 3. AMファイルの読み込み
-			#REMOVE
-			#am_file = f"{self.r_name}_bblock_{block_id}"
-			am_file = f"noundef_bblock_{block_id}"
-			am_size, am = AMUtils.Preprocess(self.r_path, am_file)
-
-			# 4. 各終端GEPに対してチェーンの確認
+			# 3. 各終端GEPに対してチェーンの確認
 			for term_gep in terminal_geps:
-				# GEPチェーンの取得
-				gep_chain = self._get_gep_chain(term_gep[0], am, nodes)
+				# GEPチェーンの取得 (ブロック単位で構築済み)
+				gep_chain = self._get_gep_chain(block_id, term_gep[0])
 
 				# 指定されたGEPノードがチェーンに含まれるか確認
 				for chain_node in gep_chain:
 					if int(gep_node_id) == int(chain_node):
 						return term_gep
 
-			# 5. 該当するGEPが見つからない場合、最初の終端GEPを返す
+			# 4. 該当するGEPが見つからない場合、最初の終端GEPを返す
 			return terminal_geps[0] if terminal_geps else None
 
 		except Exception as e:
@@ -3627,63 +4227,216 @@ class Analyzer:
 			print(f"Context - Terminal GEPs: {len(terminal_geps)}, GEP node ID: {gep_node_id}")
 			return None
 
-	def _get_gep_chain(self,
-			term_gep_line: int,
-			am: List[List[int]],
-			nodes: List[List[str]]) -> List[int]:
+	def _get_gep_chain(self, block_id: str, term_gep_line: int) -> List[int]:
 		"""
 		終端GEPからGEPチェーンを取得
 		Args:
+			block_id: 基本ブロックID
 			term_gep_line: 終端GEPの行番号
-			am: 隣接行列
-			nodes: ノード情報のリスト
 		Returns:
 			GEPチェーンを構成するノードの行番号リスト
 		"""
-		if (term_gep_line, tuple(map(tuple, am))) in self._gep_chain_cache:
-			return self._gep_chain_cache[(term_gep_line, tuple(map(tuple, am)))]
 		try:
-			if term_gep_line >= len(nodes):
-				return []
+			return list(self._get_gep_chains(block_id).get(int(term_gep_line), []))
 
-			if 'getelementptr' not in nodes[term_gep_line][0].split()[1]:
-				return []
+		except Exception as e:
+			print(f"Error in _get_gep_chain: {e}")
+			print(f"Context - Terminal GEP line: {term_gep_line}")
+			return []
 
-			# GEPチェーンの構築
-			gep_chain = [term_gep_line]
-			visited = {term_gep_line}
-			current_line = term_gep_line
+	def _get_gep_chains(self, block_id: str) -> Dict[int, List[int]]:
+		"""
+		ブロック内の全GEPノードについてGEPチェーンを一括構築 (ブロック単位でキャッシュ)
+		AMの逆辺を一度だけ作成し, 各GEPから先行するGEPを辿る
+		Returns:
+			{GEP行番号: [GEP行番号, 先行GEP行番号, ...]}
+		"""
+		hit, chains = self.cache.Get('gep_chain', block_id)
+		if hit:
+			return chains
 
-			while True:
-				found_prev = False
-				# 前方のGEPノードを探索
-				for src_idx in range(len(am)):
-					if am[src_idx][current_line] and src_idx not in visited:
-						if src_idx >= len(nodes):
-							continue
+		nodes = self._read_node_list(block_id)
+		preds = self._get_block_preds(block_id)
+		is_gep = [len(_tokens(node)) > 1 and 'getelementptr' in _tokens(node)[1] for node in nodes]
 
-						src_node = nodes[src_idx]
-						if len(src_node) <= 1:
-							continue
+		chains = {}
+		for line, gep in enumerate(is_gep):
+			if not gep:
+				continue
 
-						# GEPノードの場合はチェーンに追加
-						if 'getelementptr' in src_node[1]:
-							gep_chain.append(src_idx)
-							visited.add(src_idx)
-							current_line = src_idx
-							found_prev = True
-							break
+			gep_chain = [line]
+			visited = {line}
+			current_line = line
+			while True:
+				# 前方のGEPノード (最小の行番号を優先)
+				prev_line = None
+				for src_idx in preds.get(current_line, []):
+					if src_idx not in visited and src_idx < len(nodes) and is_gep[src_idx]:
+						prev_line = src_idx
+						break
 
-				if not found_prev:
+				if prev_line is None:
 					break
 
-			self._gep_chain_cache[(term_gep_line, tuple(map(tuple, am)))] = gep_chain
-			return gep_chain
+				gep_chain.append(prev_line)
+				visited.add(prev_line)
+				current_line = prev_line
+
+			chains[line] = gep_chain
+
+		return self.cache.Put('gep_chain', block_id, chains)
+
+	def _get_block_def_use(self, block_id: str) -> Dict[str, Any]:
+		"""
+		ブロック内のレジスタ定義/使用の表 (キャッシュ付き)
+		Returns:
+			{
+				'defs': {reg: node_info},	# 最初に定義するノード (結果レジスタ)
+				'uses': Set[str],			# オペランドに現れるレジスタ/値
+				'exposed': Set[str]			# ブロック内で定義される前に使用されるレジスタ/値
+			}
+		"""
+		hit, def_use = self.cache.Get('def_use', block_id)
+		if hit:
+			return def_use
+
+		defs = {}
+		uses = set()
+		exposed = set()
+		# ノードリストは命令の逆順 (先頭が最後の命令)
+		for node in reversed(self._read_node_list(block_id)):
+			node_info = _tokens(node)
+			# 葉ノード (関数外の値) のオペランド欄は LEAF
+			operands = [operand for operand in node_info[3:] if operand != 'LEAF']
+			exposed.update(operand for operand in operands if operand not in defs)
+			uses.update(operands)
+			if len(node_info) > 2:
+				defs.setdefault(node_info[2], node_info)
+
+		return self.cache.Put('def_use', block_id, {'defs': defs, 'uses': uses, 'exposed': exposed})
+
+	def _get_loop_def_use(self, loop_nodes: List[str]) -> Dict[str, Set[str]]:
+		"""
+		ループ (基本ブロック集合) 内で定義/使用されるレジスタ (キャッシュ付き)
+		'exposed' は各ブロックで定義より前に使用されるレジスタ
+		"""
+		key = tuple(sorted(loop_nodes))
+		hit, def_use = self.cache.Get('loop_def_use', key)
+		if hit:
+			return def_use
+
+		defs = set()
+		uses = set()
+		exposed = set()
+		for block_id in key:
+			block_def_use = self._get_block_def_use(block_id)
+			defs.update(block_def_use['defs'])
+			uses.update(block_def_use['uses'])
+			exposed.update(block_def_use['exposed'])
+
+		return self.cache.Put('loop_def_use', key, {'defs': defs, 'uses': uses, 'exposed': exposed})
+
+	def _is_live_across_back_edge(self, reg: str, loop_nodes: List[str]) -> bool:
+		"""
+		レジスタがバックエッジを越えて生存するか
+		(ループ内で定義され, かつループのヘッダ/本体のブロックで定義より前に使用される)
+		"""
+		loop_def_use = self._get_loop_def_use(loop_nodes)
+		return reg in loop_def_use['exposed'] and reg in loop_def_use['defs']
+
+	def _get_array_dimensions(self, array_name: str) -> List[int]:
+		"""配列の全次元のサイズ (外側の次元から, キャッシュ付き)"""
+		hit, dims = self.cache.Get('array_dims', array_name)
+		if hit:
+			return dims
+
+		dims = []
+		if self.ir_file is not None:
+			with open(self.ir_file, 'r') as f:
+				for line in f:
+					if f'@{array_name} =' in line:
+						dims = [int(size) for size in re.findall(r'\[(\d+) x', line)]
+						break
+
+		return self.cache.Put('array_dims', array_name, dims)
+
+	def _get_ir_defs(self) -> Dict[str, Dict]:
+		"""
+		LLVM IRファイルから読む補助情報 (キャッシュ付き)
+		ノードリストに現れない情報 (icmpの条件, ブロック先頭のload, エントリブロックのstore) を補う
+		Returns:
+			{
+				'predicates':	{icmp結果レジスタ: 条件 (slt, ...)},
+				'loads':		{loadの結果レジスタ: スロット},
+				'const_stores':	{スロット: [定数, ...]}
+			}
+		"""
+		hit, ir_defs = self.cache.Get('ir_defs', self.r_name)
+		if hit:
+			return ir_defs
+
+		ir_defs = {'predicates': {}, 'loads': {}, 'const_stores': {}}
+		if self.ir_file is not None:
+			with open(self.ir_file, 'r') as f:
+				text = f.read()
+			for dst, predicate in re.findall(r'(%[-\w.]+) = icmp (\w+) ', text):
+				ir_defs['predicates'][dst] = predicate
+			for dst, slot in re.findall(r'(%[-\w.]+) = load [^,]+, [^,]*\* (%[-\w.]+)', text):
+				ir_defs['loads'][dst] = slot
+			for value, slot in re.findall(r'store \w+ (-?\d+), \w+\* (%[-\w.]+)', text):
+				ir_defs['const_stores'].setdefault(slot, []).append(int(value))
+
+		return self.cache.Put('ir_defs', self.r_name, ir_defs)
+
+	def _loop_iteration_bounds(self) -> Dict[str, int]:
+		"""依存テスト用の誘導変数の上限 {誘導変数: 反復回数 - 1} (反復回数が定数のループのみ)"""
+		return {
+			info.induction_var: info.trip_count - 1
+			for info in self.loop_levels.values()
+			if info.induction_var is not None and info.is_counted() and info.trip_count > 0
+		}
+
+	def _get_index_expression(self, block_id: str, addr_reg: str) -> Optional[IndexExpression]:
+		"""
+		アドレスレジスタ (終端GEP) のインデックスをアフィン形式に畳み込む
+		getelementptr/sext/add/mul/shl のチェーンを 定数 + Σ 係数・誘導変数 とし,
+		配列次元で要素オフセットに線形化する
+		Returns:
+			IndexExpression (非アフィンの場合 subscripts/affine に None), GEPでない場合 None
+		"""
+		key = (block_id, addr_reg)
+		hit, index_expr = self.cache.Get('index_expr', key)
+		if hit:
+			return index_expr
+
+		index_expr = None
+		try:
+			defs = AffineUtils.NodeDefs(_tokens(node) for node in self._read_node_list(block_id))
+			array_name, subscripts = AffineUtils.GEPSubscripts(defs, addr_reg)
+			if subscripts:
+				dims = self._get_array_dimensions(array_name)
+				source_variables = []
+				for subscript in subscripts:
+					for var in (subscript.Vars() if subscript is not None else []):
+						if var not in source_variables:
+							source_variables.append(var)
+
+				index_expr = IndexExpression(
+					base=array_name,
+					source_variables=source_variables,
+					subscripts=subscripts,
+					dims=dims,
+					affine=AffineUtils.Linearize(subscripts, dims)
+				)
 
 		except Exception as e:
-			print(f"Error in _get_gep_chain: {e}")
-			print(f"Context - Terminal GEP line: {term_gep_line}")
-			return []
+			print(f"Error folding index expression of {addr_reg} in block {block_id}: {e}")
+
+		return self.cache.Put('index_expr', key, index_expr)
+
+	def dump_cache_stats(self, w_file_path: str):
+		"""キャッシュ統計 (領域毎のhit/miss/evict) をJSONで出力"""
+		self.cache.DumpStats(w_file_path)
 
 	def _update_array_operations(self, array_patterns: Dict, store_load_deps: Dict):
 		"""
@@ -3711,44 +4464,11 @@ class Analyzer:
 			return array_patterns
 
 	def _get_array_from_reg(self, reg: str) -> Optional[str]:
-		"""レジスタから対応する配列名を取得"""
-		try:
-			# ノードからレジスタを利用している配列を探索
-			for block_id, nodes in self.all_nodes.items():
-				for node in nodes:
-					node_info = node[0].split()
-					if 'getelementptr' in str(node_info[1]):
-						if reg in node_info[2:]:
-							# まず現在のノードで@シンボルをチェック
-							array_match = re.search(r'@([a-zA-Z0-9_]+)', str(node_info[1]))
-							if array_match:
-								return array_match.group(1)
-
-							# @シンボルがない場合、AMファイルを使って先行するgetelementptrを探索
-							#REMOVE
-							#am_file = f"{self.r_name}_bblock_{block_id}"
-							am_file = f"noundef_bblock_{block_id}"
-							am_size, am = AMUtils.Preprocess(self.r_path, am_file)
-
-							# 現在の行番号を取得
-							current_line = int(node_info[0])
-
-							# 先行するノードを探索
-							for src_idx in range(am_size):
-								if am[src_idx][current_line]:
-									if src_idx >= len(nodes):
-										continue
-
-									src_node = nodes[src_idx][0].split()
-									if 'getelementptr' in src_node[1]:
-										array_match = src_node[1].split('_')[1][1:]
-										if array_match:
-											return array_match
-			return None
-
-		except Exception as e:
-			print(f"Error in _get_array_from_reg: {e}")
+		"""レジスタから対応する配列名を取得 (索引参照)"""
+		entry = self.reg_gep_index.get(reg)
+		if entry is None:
 			return None
+		return entry['array_name']
 
 	def _analyze_memory_operations(self, node_info: List[str], reg: str) -> Dict[str, bool]:
 		"""ノード情報からメモリ操作を分析"""
@@ -3797,8 +4517,75 @@ class Analyzer:
 			print(f"Error updating dependencies: {e}")
 			return array_patterns
 
-	def analyze(self) -> Dict:
-		"""プログラム構造の分析"""
+	def _analyze_block(self, block_id: str) -> Tuple[List[Dict], Dict, Dict]:
+		"""
+		基本ブロック単位の解析 (ブロック間で独立, 並列実行可能)
+		Returns:
+			(pointer_regs_info, array_accesses, store_load_deps)
+			pointer_regs_infoが空の場合は (pointer_regs_info, None, None)
+		"""
+		# 1. ポインタレジスタの分析
+		pointer_regs_info = self._analyze_pointer_registers(block_id)
+		if not pointer_regs_info:
+			return pointer_regs_info, None, None
+
+		# 2. 配列アクセスパターンの分析
+		nodes = self._read_node_list(block_id)
+		array_accesses = self._analyze_array_access(block_id, nodes)
+
+		# 4. store-load依存関係の分析
+		store_load_deps = self._analyze_store_load_dependency(
+			block_id,
+			pointer_regs_info,
+			self.loops
+		)
+
+		return pointer_regs_info, array_accesses, store_load_deps
+
+	def _analyze_blocks_parallel(self, loop_levels: Dict) -> Dict[str, Tuple[List[Dict], Dict, Dict]]:
+		"""
+		全基本ブロックをプロセスプールで解析
+		forkが使える場合, ワーカーは親プロセスのノード/AM (読み出し専用) を共有する
+		Returns:
+			{block_id: (pointer_regs_info, array_accesses, store_load_deps)}
+		"""
+		block_ids = []
+		for loop_info in loop_levels.values():
+			for block_id in loop_info.nodes:
+				if block_id not in block_ids:
+					block_ids.append(block_id)
+
+		# ワーカー起動前に全ブロックのノード/AMを読み込んでおく
+		for block_id in block_ids:
+			self._read_node_list(block_id)
+			self._read_am(block_id)
+
+		if 'fork' in multiprocessing.get_all_start_methods():
+			mp_context = multiprocessing.get_context('fork')
+		else:
+			mp_context = None
+
+		block_results = {}
+		try:
+			with concurrent.futures.ProcessPoolExecutor(
+					max_workers=self.num_workers,
+					mp_context=mp_context,
+					initializer=_init_block_worker,
+					initargs=(self,)) as executor:
+				for block_id, block_result in executor.map(_analyze_block_worker, block_ids):
+					block_results[block_id] = block_result
+
+		except Exception as e:
+			print(f"Error in parallel block analysis, falling back to serial: {e}")
+			return {}
+
+		return block_results
+
+	def analyze(self) -> Tuple[AnalysisResult, Any]:
+		"""
+		プログラム構造の分析
+		結果は型付きモデル (AnalysisResult) で返す. 辞書形式のアクセスも可能
+		"""
 		result = {
 			'array_patterns': {},
 			'loop_levels': self._analyze_loop_levels(),
@@ -3807,21 +4594,26 @@ class Analyzer:
 
 		try:
 			print(f"Analyzing:")
+			# 並列モードでは全基本ブロックを先に解析 (結果はブロックID毎)
+			block_results = {}
+			if self.num_workers > 1:
+				block_results = self._analyze_blocks_parallel(result['loop_levels'])
+
 			# ループレベルごとの分析
 			for loop_id, loop_info in result['loop_levels'].items():
 				loop_nodes = loop_info.nodes
 
-				# 各基本ブロックの分析
+				# 各基本ブロックの分析 (マージはループ/ブロック順で決定的に行う)
 				for block_id in loop_nodes:
-					# 1. ポインタレジスタの分析
-					pointer_regs_info = self._analyze_pointer_registers(block_id)
+					if block_id in block_results:
+						# 同じブロックが複数ループに現れるため, 逐次実行と同様に独立したコピーを使う
+						pointer_regs_info, array_accesses, store_load_deps = copy.deepcopy(block_results[block_id])
+					else:
+						pointer_regs_info, array_accesses, store_load_deps = self._analyze_block(block_id)
+
 					if not pointer_regs_info:
 						continue
 
-					# 2. 配列アクセスパターンの分析
-					nodes = self._read_node_list(block_id)
-					array_accesses = self._analyze_array_access(block_id, nodes)
-
 					# 3. 各配列の情報を整理
 					for pointer_reg in pointer_regs_info:
 						array_name = pointer_reg['array_name']
@@ -3839,7 +4631,8 @@ class Analyzer:
 										'has_load': False,
 										'has_store': False
 									},
-									'loop_access': {}
+									'loop_access': {},
+									'index_expr': pointer_reg['index_regs'].get('index_expr')
 								},
 								'dependencies': {
 									'read_from': [],
@@ -3855,13 +4648,6 @@ class Analyzer:
 									'array_size': dim_access.array_size
 								}
 
-					# 4. store-load依存関係の分析と配列操作の設定
-					store_load_deps = self._analyze_store_load_dependency(
-						block_id,
-						pointer_regs_info,
-						self.loops
-					)
-
 					# 5. 依存関係と操作の設定
 					result['array_patterns'] = self._update_array_operations(result['array_patterns'], store_load_deps)
 
@@ -3870,8 +4656,8 @@ class Analyzer:
 			result['compute_paths'] = compute_paths_info
 
 			#print(f"result:{result}")
-			return result, IndexExpression
+			return _build_result_model(result), IndexExpression
 
 		except Exception as e:
 			print(f"Error in analyze: {e}")
-			return result, IndexExpression
\ No newline at end of file
+			return _build_result_model(result), IndexExpression
\ No newline at end of file
@@ -8,37 +8,88 @@
 ##
 ##################################################################
 import os
+import utils.FileUtils as FileUtils
 from typing import TypedDict, List, Dict, Tuple, Optional, Set, Union, Any
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class LoopBounds:
+	start: int				# Initial Value
+	step: int				# Increment per Iteration
+	bound: int				# Bound compared at Header
+	predicate: str = "slt"	# icmp Predicate
+
+
+# CRAM R-Config Word (hardware/src_hdl/Packages/pkg_en.sv, Common/ConfigDec_RAM.sv)
+CRAM_WIDTH_ADDR = 10						# Address Width of CRAM (RE/CRAM.sv)
+CRAM_POSIT_DECREMENT = 31 - 1				# Flag: Decrement by Stride
+CRAM_POSIT_MODE_LSB = 32 - 4				# Access Mode (2'b10: 32-bit Access)
+CRAM_POSIT_LENGTH_LSB = 32 - 16				# Access Length - 1 (8-bit)
+CRAM_POSIT_STRIDE_LSB = 32 - 24				# Stride Factor - 1 (8-bit)
+CRAM_POSIT_BASE_LSB = 32 - 32				# Base Address (8-bit)
+CRAM_MODE_32BIT = 2
+
+# Attribute Word of R-Config Block
+CRAM_POSIT_ATTRIB_MODE_LSB = 28				# Block Type (2'h2: R-Config)
+CRAM_POSIT_ATTRIB_MY_ATTRIB_BLOCK = 24		# Flag: This Attribute Block is Mine
+CRAM_POSIT_ATTRIB_TERM_BLOCK = 23			# Flag: This Attribute Block is Terminal
+CRAM_POSIT_ATTRIB_LENGTH_LSB = 8			# Block Length (Words)
+CRAM_ATTRIB_RCONFIG = 2
+
+
+@dataclass(slots=True)
+class Descriptor:
+	base: int				# Base Address (Element Offset)
+	stride: int				# Address Increment per Access
+	count: int				# Number of Accesses
 
 
 class AGUGenerator:
 
-	def __init__(self, array_patterns, r_file_path, r_name, IndexExpression):
+	def __init__(self, array_patterns, r_file_path, r_name, IndexExpression, addr_mode: str = "gep", coalesce: bool = False, tile_capacity: Optional[Dict[str, int]] = None, double_buffer: bool = False, shared: bool = False, backend: str = "ir", ir_file: Optional[str] = None):
 		"""
 		AGUGeneratorの初期化
 		Args:
-			array_patterns: AGUAnalyzerの分析結果
-				{
-					'array_patterns': {
-						array_name: {
-							'access_paths': [],
-							'pointer_regs': {},
-							'dependencies': {},
-							'connectivity': {}
-						}
-					},
-					'loop_levels': {},
-					'loops': []
-				}
+			array_patterns: Analyzerの分析結果 (AnalysisResult)
+				array_patterns:	{array_name: ArrayPattern}
+				loop_levels:	{loop_level: LoopInfo}
+				loops:			[[node_id, ...], ...]
 			r_file_path: 入力ファイルのパス
 			r_name: 入力ファイルの名前
+			ir_file: LLVM IRファイル (配列のサイズ), 指定がなければ "r_name".ll
+			addr_mode: アドレス生成方式
+				"gep":			要素毎に配列ベースからgetelementptrでアドレスを計算
+				"incremental":	配列毎にアドレスレジスタを持ち, ループ毎の増分を加算 (強度低減)
+			coalesce: 完全入れ子の矩形ループを単一カウンタのループに融合
+			tile_capacity: 配列毎のオンチップ容量 (ワード) {array_name: words}, '*'は全配列
+				容量の指定がない配列はタイル化しない
+				指定した場合, 容量に収まるタイルでタイル転送と演算のアドレスストリームを生成
+			double_buffer: タイルバッファを2面とし, 転送と演算を並行させる (タイル化の場合のみ)
+			shared: ループ骨格が同じ配列をひとつのAGU (ループ制御1組, 複数のアドレスストリーム) にまとめる
+			backend: AGUプログラムの形式
+				"ir":			LLVM IR形式のAGUプログラム
+				"descriptor":	CRAMのアドレス生成ユニット (AddrGenUnit_Ld/St) のR-Config語
+								(レベル毎の base, stride, count), 記述子に収まらない配列はLLVM IR
 		"""
-		self.array_patterns = array_patterns['array_patterns']
-		self.loop_levels = array_patterns['loop_levels']
-		self.loops = array_patterns['loops']
+		self.array_patterns = array_patterns.array_patterns
+		self.loop_levels = array_patterns.loop_levels
+		self.loops = array_patterns.loops
 		self.r_path = r_file_path
 		self.r_name = r_name
+		self.ir_file = ir_file if ir_file is not None else FileUtils.IRFileName(r_file_path, r_name)
 		self.IndexExpression = IndexExpression
+		self.addr_mode = addr_mode
+		self.coalesce = coalesce
+		self.tile_capacity = tile_capacity or {}
+		self.double_buffer = double_buffer
+		self.shared = shared
+		self.backend = backend
+
+		# ダブルバッファのハンドシェイク {array_name: [{'stream', 'wait', 'signal'}, ...]}
+		self.handshakes = {}
+		# タイル化しない配列 {array_name: {'tile': None, 'reason', 'untiled_words', 'tiled_words'}}
+		self.untiled = {}
 
 		# 配列の次元情報
 		self.array_dims = self._get_array_dimensions()
@@ -47,84 +98,157 @@ class AGUGenerator:
 		self._code_cache = {}
 		self._structure_cache = {}
 
-	def _generate_loop_init(self, loop_info: Dict, loop_level: int) -> List[str]:
-		"""ループのインデックス初期化コードを生成 (Modified)"""
-		init_code = []
-		try:
-			index_reg = f"%i{loop_level}"
-			init_code.extend([
-				f"{index_reg} = alloca i32, align 4",
-				f"store i32 0, i32* {index_reg}, align 4",
-			])
+	def _generate_loop_init(self, loop_info: Optional[Any], loop_level: str, preheader: str) -> List[str]:
+		"""
+		ループカウンタの初期化コードを生成
+		カウンタはSSAレジスタ %i<level> とし, ヘッダのphiでプリヘッダからの初期値とラッチからの更新値を選択
+			loop_info:	IRから抽出した初期値, Noneの場合は0
+			preheader:	ヘッダに分岐するブロックのラベル
+		"""
+		start = loop_info.start if loop_info is not None else 0
+		index_reg = f"%i{loop_level}"
+		return [
+			f"{index_reg} = phi i32 [ {start}, %{preheader} ], [ {index_reg}.next, %loop.latch.{loop_level} ]"
+		]
 
-			if loop_info.get('blocks') and loop_info.get('blocks')['header']:
-				header_block = loop_info['blocks']['header']
-				for index_expression in loop_info.get("index_expressions", []):
-					if index_expression.is_loop_carried:
-						init_code.extend([
-							f"%{index_reg}.load = load i32, i32* {index_reg}, align 4",
-							f"%{index_reg}.cmp = icmp slt i32 %{index_reg}.load, 32",  # Array bound should come from array_dims
-							f"br i1 %{index_reg}.cmp, label %loop.body.{loop_level}, label %loop.end.{loop_level}"
-						])
-						break #If found loop carried, break the loop.
-			return init_code
+	def _generate_array_agu(self, array_name: str, array_info: Dict, array_dims: List[int]) -> Dict:
+		"""配列毎のAGUプログラムの生成 (ストリームがひとつのAGU)"""
+		return self._generate_multi_stream_agu(array_name, [(array_name, array_info, array_dims)])
 
-		except Exception as e:
-			print(f"Error generating loop initialization: {e}")
-			return []
+	def _get_loop_skeleton(self, array_info: Dict, array_dims: List[int]) -> Tuple:
+		"""
+		AGUのループ骨格 (次元毎の初期値, 増分, 境界, 条件)
+		骨格が同じ配列はループ制御を共有し, アドレス式だけが異なる
+		"""
+		skeleton = []
+		for dim in range(array_info.array_info.dimensions):
+			loop_info = self._get_dimension_loop(array_info, dim)
+			if loop_info is None:
+				skeleton.append((0, 1, array_dims[dim], "slt"))
+			else:
+				skeleton.append((loop_info.start, loop_info.step, loop_info.bound, loop_info.predicate))
+		return tuple(skeleton)
 
-	def _generate_array_agu(self, array_name: str, array_info: Dict, array_dims: List[int]) -> Dict:
+	def _generate_multi_stream_agu(self, program_name: str, members: List[Tuple[str, Dict, List[int]]]) -> Dict:
+		"""
+		ループ骨格を共有する配列のAGUプログラムの生成
+		ループ制御 (カウンタ, 比較, 分岐) は1組で, 配列毎のアドレスストリームが同じ反復で進む
+			members: [(array_name, array_info, array_dims), ...], ループ骨格が同じ配列
+		"""
 		result = {
 			'code': [],
-			'structure': {'loops': [], 'entry': None, 'exit': None}
+			'structure': {'loops': [], 'entry': None, 'exit': None, 'arrays': [member[0] for member in members], 'streams': {}}
 		}
+		shared = len(members) > 1
 
 		try:
 			# ヘッダー情報
 			result['code'].extend([
-				f"; AGU for array {array_name}",
+				f"; AGU for array {', '.join(member[0] for member in members)}",
 				"target datalayout = \"e-m:e-p270:32:32-p271:32:32-p272:64:64-i64:64-f80:128-n8:16:32:64-S128\"",
 				"target triple = \"x86_64-pc-linux-gnu\"",
 				"",
-				f"define dso_local void @agu_{array_name}() #0 {{",
+				*self._generate_array_globals([member[0] for member in members]),
+				f"define dso_local void @agu_{program_name}() #0 {{",
+				"entry:",
 			])
+			result['structure']['entry'] = "entry"
 
-			# 配列の次元ごとにループを生成
-			dimensions = array_info['array_info']['dimensions']
-			loop_access = array_info['array_info']['loop_access']
+			# 配列の次元ごとにループを生成 (ループ骨格は先頭の配列による)
+			_, array_info, array_dims = members[0]
+			dimensions = array_info.array_info.dimensions
+			loop_access = array_info.array_info.loop_access
 
 			# 使用されるループレベルを特定
 			used_levels = set()
-			for _, access_info in loop_access.items():
-				used_levels.add(int(access_info['dimension']))
+			for access_info in loop_access.values():
+				used_levels.add(int(access_info.dimension))
 
-			# ループの生成
+			# 次元毎のループ (IRから抽出した境界, 対応するループがなければ次元のサイズ)
+			member_loops = {
+				array_name: [self._get_dimension_loop(info, dim) for dim in range(dimensions)]
+				for array_name, info, _ in members
+			}
+			dim_loops = member_loops[members[0][0]]
+
+			# 強度低減したアドレスストリーム (求まらない場合はGEPによるアドレス計算)
+			# ループ融合 (coalescing) もアドレスストリームのキャリーでアドレスを再構成
+			streams = {}
+			if self.addr_mode == "incremental" or self.coalesce:
+				for array_name, info, dims in members:
+					stream = self._get_address_stream(array_name, info, member_loops[array_name])
+					if stream is None:
+						print(f"Warning: Array {array_name} is not strength-reducible, generating getelementptr chain")
+						continue
+					streams[array_name] = stream
+					result['code'].extend(self._generate_stream_init(array_name, dims, stream))
+			result['structure']['streams'] = streams
+
+			# 完全入れ子の矩形ループを単一カウンタのループに融合 (ストリームがひとつの場合)
+			if self.coalesce and not shared and streams and dimensions > 1:
+				array_name = members[0][0]
+				result['code'].extend(self._generate_coalesced_loop(array_name, array_info, dim_loops, streams[array_name]))
+				result['structure']['loops'].append({
+					'blocks': ["loop.header.flat", "loop.body.flat", "loop.latch.flat"],
+					'level': 1,
+					'coalesced': [loop_info.trip_count for loop_info in dim_loops]
+				})
+				result['structure']['exit'] = "loop.exit.flat"
+				dimensions = 0
+
+			# ループの生成 (外側から)
 			for dim in range(dimensions):
 				level = str(dim + 1)  # ループレベル
 				dim_size = array_dims[dim]  # 次元のサイズ
+				preheader = "entry" if dim == 0 else f"loop.body.{dim}"
+
+				header_phis = [
+					self._generate_stream_phi(array_name, dim, dimensions, stream, preheader)
+					for array_name, stream in streams.items()
+				]
 
 				# ループヘッダー生成
 				loop_code = self._generate_loop_structure(
 					level=level,
 					size=dim_size,
 					array_info=array_info,
-					is_innermost=(dim == dimensions - 1)
+					is_innermost=(dim == dimensions - 1),
+					loop_info=dim_loops[dim],
+					preheader=preheader,
+					header_phis=header_phis
 				)
 				result['code'].extend(loop_code)
+				result['structure']['loops'].append({
+					'blocks': [f"loop.header.{level}", f"loop.body.{level}", f"loop.latch.{level}"],
+					'level': dim + 1
+				})
 
-				# 最内ループでメモリアクセスを生成
+				# 最内ループでメモリアクセスを生成 (共有する場合はレジスタ名に配列名を付ける)
 				if dim == dimensions - 1:
-					access_code = self._generate_memory_access(
-						array_name=array_name,
-						array_info=array_info,
-						array_dims=array_dims
-					)
-					result['code'].extend(access_code)
-
-			# ループの終了部分を生成
-			for dim in range(dimensions):
+					for array_name, info, dims in members:
+						value_reg = f"%{array_name}.val" if shared else "%loaded.val"
+						if array_name in streams:
+							access_code = self._generate_stream_access(array_name, info, dimensions, value_reg)
+						else:
+							access_code = self._generate_memory_access(
+								array_name=array_name,
+								array_info=info,
+								array_dims=dims,
+								dim_loops=member_loops[array_name],
+								value_reg=value_reg,
+								ptr_prefix=f"%{array_name}.ptr" if shared else "%ptr"
+							)
+						result['code'].extend(access_code)
+
+			# ループの終了部分を生成 (内側から)
+			for dim in reversed(range(dimensions)):
 				level = str(dim + 1)
-				result['code'].extend(self._generate_loop_exit(level))
+				latch_code = []
+				for array_name, stream in streams.items():
+					latch_code.extend(self._generate_stream_advance(array_name, dim, dimensions, stream))
+				result['code'].extend(self._generate_loop_exit(level, dim_loops[dim], latch_code))
+			if dimensions:
+				result['structure']['exit'] = "loop.exit.1"
 
 			# 関数終了
 			result['code'].extend([
@@ -137,9 +261,17 @@ class AGUGenerator:
 			return result
 
 		except Exception as e:
-			print(f"Error in _generate_array_agu for {array_name}: {e}")
+			print(f"Error in _generate_multi_stream_agu for {program_name}: {e}")
 			return result
 
+	def _generate_array_globals(self, array_names: List[str]) -> List[str]:
+		"""AGUが参照する配列の宣言 (実体はデータメモリ)"""
+		code = [
+			f"@{array_name} = external global {self._get_array_type(array_name, self.array_dims[array_name])}, align 16"
+			for array_name in array_names
+		]
+		return code + [""]
+
 	def _get_array_type(self, array_name: str, dims: List[int]) -> str:
 		"""配列型の文字列を生成"""
 		type_str = "i32"
@@ -165,33 +297,104 @@ class AGUGenerator:
 
 		return patterns
 
-	def _generate_loop_structure(self, level: str, size: int, array_info: Dict, is_innermost: bool) -> List[str]:
-		"""ループ構造の生成"""
+	def _get_dimension_loop(self, array_info: Dict, dim: int) -> Optional[Any]:
+		"""
+		配列の次元を走査するループ (LoopInfo)
+		次元の添字がひとつの誘導変数だけで決まり, そのループの反復回数が定数の場合のみ
+		"""
+		index_expr = array_info.array_info.index_expr
+		if index_expr is None or dim >= len(index_expr.subscripts) or index_expr.subscripts[dim] is None:
+			return None
+
+		ivs = index_expr.subscripts[dim].Vars()
+		if len(ivs) != 1:
+			return None
+
+		for loop_info in self.loop_levels.values():
+			if loop_info.induction_var == ivs[0] and loop_info.is_counted():
+				if isinstance(loop_info.start, int) and isinstance(loop_info.bound, int):
+					return loop_info
+		return None
+
+	def _generate_loop_structure(self, level: str, size: int, array_info: Dict, is_innermost: bool, loop_info: Optional[Any] = None, preheader: str = "entry", header_phis: Optional[List[str]] = None) -> List[str]:
+		"""
+		ループ構造の生成
+			loop_info:		IRから抽出したループ境界, Noneの場合は0から次元のサイズまで
+			preheader:		ヘッダに分岐するブロックのラベル
+			header_phis:	ヘッダに置く他のphi (アドレスストリーム)
+		"""
+		bound, predicate = size, "slt"
+		if loop_info is not None:
+			bound, predicate = loop_info.bound, loop_info.predicate
+
 		code = [
 			f"; Loop level {level}",
-			f"%i{level} = alloca i32, align 4",
-			f"store i32 0, i32* %i{level}, align 4",
 			f"br label %loop.header.{level}",
 			"",
 			f"loop.header.{level}:",
-			f"%i{level}.load = load i32, i32* %i{level}, align 4",
-			f"%i{level}.cmp = icmp slt i32 %i{level}.load, {size}",
+			*self._generate_loop_init(loop_info, level, preheader),
+			*(header_phis or []),
+			f"%i{level}.cmp = icmp {predicate} i32 %i{level}, {bound}",
 			f"br i1 %i{level}.cmp, label %loop.body.{level}, label %loop.exit.{level}",
 			"",
 			f"loop.body.{level}:"
 		]
 		return code
 
-	def _generate_memory_access(self, array_name: str, array_info: Dict, array_dims: List[int]) -> List[str]:
-		"""任意の次元数に対応したメモリアクセスコードの生成"""
+	def _get_dimension_counter(self, array_info: Dict, dim: int, dim_loops: List[Optional[Any]]) -> Optional[str]:
+		"""次元の添字がループカウンタそのものであればカウンタのレジスタ"""
+		loop_info = dim_loops[dim] if dim < len(dim_loops) else None
+		if loop_info is None:
+			return None
+
+		subscript = array_info.array_info.index_expr.subscripts[dim]
+		if subscript.const != 0 or subscript.Coeff(loop_info.induction_var) != 1:
+			return None
+		return f"%i{dim + 1}"
+
+	def _generate_subscript(self, array_name: str, array_info: Dict, dim: int, dim_loops: List[Optional[Any]], reg: str) -> Tuple[str, List[str]]:
+		"""
+		次元の添字の値 (AGUが生成したループカウンタのみを使用)
+		添字が次元毎のループの誘導変数のアフィン式であれば乗算と加算で求め,
+		境界やアフィン式の情報がない場合はその次元を走査するカウンタ %i<dim+1> を用いる
+		Returns: (値 (レジスタまたは定数), コード)
+		"""
+		counter = self._get_dimension_counter(array_info, dim, dim_loops)
+		if counter is not None:
+			return counter, []
+
+		index_expr = array_info.array_info.index_expr
+		subscript = index_expr.subscripts[dim] if index_expr is not None and dim < len(index_expr.subscripts) else None
+		counters = {loop_info.induction_var: f"%i{level + 1}" for level, loop_info in enumerate(dim_loops) if loop_info is not None}
+		if subscript is not None and all(var in counters for var in subscript.Vars()):
+			code = []
+			value = str(subscript.const)
+			for term_no, var in enumerate(subscript.Vars()):
+				term = counters[var]
+				if subscript.Coeff(var) != 1:
+					code.append(f"{reg}.mul{term_no} = mul i32 {term}, {subscript.Coeff(var)}")
+					term = f"{reg}.mul{term_no}"
+				code.append(f"{reg}.add{term_no} = add i32 {value}, {term}")
+				value = f"{reg}.add{term_no}"
+			return value, code
+
+		if dim >= array_info.array_info.dimensions:
+			raise ValueError(f"no loop counter for subscript {dim} of array {array_name}")
+
+		print(f"Warning: Subscript {dim} of array {array_name} is not affine in the AGU loop counters, indexing by the dimension counter")
+		return f"%i{dim + 1}", []
+
+	def _generate_memory_access(self, array_name: str, array_info: Dict, array_dims: List[int], dim_loops: Optional[List[Optional[Any]]] = None, value_reg: str = "%loaded.val", ptr_prefix: str = "%ptr") -> List[str]:
+		"""任意の次元数に対応したメモリアクセスコードの生成 (value_reg, ptr_prefix: 値とアドレスのレジスタ名)"""
 		code = []
+		dim_loops = dim_loops or []
 
-		# インデックスレジスタのロード
-		for reg in array_info['array_info']['index_regs']:
-			code.extend([
-				f"; Access using {reg}",
-				f"%{reg.replace('%', '')}.val = load i32, i32* {reg}, align 4"
-			])
+		# インデックスの値 (AGUのループカウンタから計算)
+		index_vals = []
+		for i in range(len(array_info.array_info.index_regs)):
+			index_val, index_code = self._generate_subscript(array_name, array_info, i, dim_loops, f"{ptr_prefix}.idx_{i}")
+			code.extend(index_code)
+			index_vals.append(index_val)
 
 		# 型文字列の構築（内側から外側へ）
 		base_type = "i32"
@@ -204,12 +407,10 @@ class AGUGenerator:
 		current_type_ptr = f"{current_type}*"
 
 		# 各次元に対してGEP命令を生成
-		for i, reg in enumerate(array_info['array_info']['index_regs']):
-			reg_val = f"%{reg.replace('%', '')}.val"
-
+		for i, reg_val in enumerate(index_vals):
 			# 次の型を計算（1次元分減らす）
 			next_type = current_type.replace(f"[{array_dims[i]} x ", "", 1)[:-1]
-			ptr_name = f"%ptr_{i}"
+			ptr_name = f"{ptr_prefix}_{i}"
 
 			code.append(
 				f"{ptr_name} = getelementptr inbounds {current_type}, "
@@ -222,24 +423,728 @@ class AGUGenerator:
 			current_type_ptr = f"{current_type}*"
 
 		# 最終ポインタに対するload/store操作
-		ops = array_info['array_info']['operations']
+		ops = array_info.array_info.operations
 		final_ptr = current_ptr
 
-		if ops['has_load']:
-			code.append(f"%loaded.val = load i32, i32* {final_ptr}, align 4")
-		if ops['has_store']:
-			code.append(f"store i32 %loaded.val, i32* {final_ptr}, align 4")
+		if ops.has_load:
+			code.append(f"{value_reg} = load i32, i32* {final_ptr}, align 4")
+		if ops.has_store:
+			code.append(f"store i32 {value_reg}, i32* {final_ptr}, align 4")
+
+		return code
+
+	def _get_address_stream(self, array_name: str, array_info: Dict, dim_loops: List[Optional[Any]]) -> Optional[Dict]:
+		"""
+		強度低減したアドレスストリームの算出
+		要素オフセット (アフィン式) を次元毎のループの誘導変数で表し,
+		ループの1反復毎のアドレス増分とループ終了時の補正 (キャリー) を求める
+			stride[d]:	ループdの1反復でのアドレス増分 (係数 x 増分)
+			carry[d]:	ループdのラッチで加算する値
+						= stride[d] - trip[d+1] x stride[d+1] (内側ループで進んだ分を戻す)
+		Returns:
+			{
+				'init':		int,		# 初期オフセット (要素数)
+				'strides':	List[int],	# 次元毎のループの増分 (外側から)
+				'carries':	List[int]	# 次元毎のラッチでの加算値 (外側から)
+			}
+			アフィンでない, または反復回数が定数でないループがある場合 None
+		"""
+		index_expr = array_info.array_info.index_expr
+		if index_expr is None or not index_expr.is_affine() or any(loop_info is None for loop_info in dim_loops):
+			return None
+
+		ivs = [loop_info.induction_var for loop_info in dim_loops]
+		if len(set(ivs)) != len(ivs) or set(index_expr.affine.Vars()) - set(ivs):
+			return None
+
+		init = index_expr.affine.const
+		strides = []
+		for loop_info in dim_loops:
+			init += index_expr.stride(loop_info.induction_var) * loop_info.start
+			strides.append(index_expr.stride(loop_info.induction_var) * loop_info.step)
+
+		carries = []
+		for dim in range(len(dim_loops)):
+			if dim == len(dim_loops) - 1:
+				carries.append(strides[dim])
+			else:
+				carries.append(strides[dim] - dim_loops[dim + 1].trip_count * strides[dim + 1])
+
+		return {
+			'init': init,
+			'strides': strides,
+			'carries': carries
+		}
+
+	def _generate_stream_init(self, array_name: str, array_dims: List[int], stream: Dict) -> List[str]:
+		"""アドレスストリームの初期アドレス (ループの外で一度だけ配列ベースから計算)"""
+		dims_str = ''.join(f'[{dim} x ' for dim in array_dims) + 'i32' + ']' * len(array_dims)
+		zeros = ', '.join(['i64 0'] * (len(array_dims) + 1))
+		return [
+			f"; Address stream of {array_name}: strides {stream['strides']}, carries {stream['carries']}",
+			f"%{array_name}.base = getelementptr inbounds {dims_str}, {dims_str}* @{array_name}, {zeros}",
+			f"%{array_name}.init = getelementptr inbounds i32, i32* %{array_name}.base, i64 {stream['init']}",
+		]
+
+	def _get_stream_latch_value(self, array_name: str, dim: int, dimensions: int, stream: Dict) -> str:
+		"""
+		ループのラッチでのアドレス (ヘッダのphiへの入力)
+		内側ループを抜けた時点のアドレスにキャリーを加算, キャリーが0の場合はそのまま
+		"""
+		level = dim + 1
+		src = f"%{array_name}.addr.{level + 1}" if dim < dimensions - 1 else f"%{array_name}.addr.{level}"
+		return f"%{array_name}.next.{level}" if stream['carries'][dim] != 0 else src
+
+	def _generate_stream_phi(self, array_name: str, dim: int, dimensions: int, stream: Dict, preheader: str) -> str:
+		"""ループヘッダでのアドレスレジスタ (プリヘッダからの値とラッチからの値を選択)"""
+		level = dim + 1
+		incoming = f"%{array_name}.init" if dim == 0 else f"%{array_name}.addr.{dim}"
+		latch_value = self._get_stream_latch_value(array_name, dim, dimensions, stream)
+		return f"%{array_name}.addr.{level} = phi i32* [ {incoming}, %{preheader} ], [ {latch_value}, %loop.latch.{level} ]"
+
+	def _generate_stream_access(self, array_name: str, array_info: Dict, dimensions: int, value_reg: str = "%loaded.val") -> List[str]:
+		"""アドレスレジスタによるload/store (value_reg: 値のレジスタ名)"""
+		ptr = f"%{array_name}.addr.{dimensions}"
+		code = [
+			f"; Access using address stream of {array_name}"
+		]
+
+		ops = array_info.array_info.operations
+		if ops.has_load:
+			code.append(f"{value_reg} = load i32, i32* {ptr}, align 4")
+		if ops.has_store:
+			code.append(f"store i32 {value_reg}, i32* {ptr}, align 4")
+
+		return code
+
+	def _generate_stream_advance(self, array_name: str, dim: int, dimensions: int, stream: Dict) -> List[str]:
+		"""ループのラッチでアドレスレジスタに増分 (キャリー) を加算, 0の場合は何もしない"""
+		level = dim + 1
+		carry = stream['carries'][dim]
+		if carry == 0:
+			return []
+
+		src = f"%{array_name}.addr.{level + 1}" if dim < dimensions - 1 else f"%{array_name}.addr.{level}"
+		return [
+			f"; Advance address stream of {array_name} at loop level {level}",
+			f"%{array_name}.next.{level} = getelementptr inbounds i32, i32* {src}, i64 {carry}"
+		]
+
+	def _generate_coalesced_loop(self, array_name: str, array_info: Dict, dim_loops: List[Any], stream: Dict) -> List[str]:
+		"""
+		完全入れ子の矩形ループを単一カウンタ %iflat のループとして生成
+		ループ制御 (ヘッダ, 比較, 分岐) は1組となり, アドレスは強度低減したキャリーで再構成する
+			1反復毎に最内ループの増分を加算し,
+			内側の位置カウンタが一周した時だけ外側ループのキャリーをselectで加算 (分岐なし)
+		位置カウンタは, キャリーが0でない最も外側のループより内側のループだけに置く
+		"""
+		dimensions = len(dim_loops)
+		total = 1
+		for loop_info in dim_loops:
+			total *= loop_info.trip_count
+
+		# 位置カウンタが必要な最も外側の次元
+		carried = [dim for dim in range(dimensions - 1) if stream['carries'][dim] != 0]
+		first = carried[0] + 1 if carried else dimensions
+
+		# 位置カウンタの更新 (内側から), 一周した次元の外側のキャリーを加算
+		ptr = f"%{array_name}.addr.flat"
+		addr = f"%{array_name}.step.flat"
+		latch_code = [f"{addr} = getelementptr inbounds i32, i32* {ptr}, i64 {stream['carries'][-1]}"]
+		end = None
+		for dim in reversed(range(first, dimensions)):
+			level = dim + 1
+			loop_info = dim_loops[dim]
+			last = loop_info.start + loop_info.trip_count * loop_info.step
+			latch_code.append(f"%i{level}.next = add i32 %i{level}, {loop_info.step}")
+			if end is None:
+				latch_code.extend([
+					f"%i{level}.end = icmp eq i32 %i{level}.next, {last}",
+					f"%i{level}.wrap = select i1 %i{level}.end, i32 {loop_info.start}, i32 %i{level}.next"
+				])
+			else:
+				latch_code.extend([
+					f"%i{level}.adv = select i1 {end}, i32 %i{level}.next, i32 %i{level}",
+					f"%i{level}.last = icmp eq i32 %i{level}.next, {last}",
+					f"%i{level}.end = and i1 {end}, %i{level}.last",
+					f"%i{level}.wrap = select i1 %i{level}.end, i32 {loop_info.start}, i32 %i{level}.adv"
+				])
+			end = f"%i{level}.end"
+
+			carry = stream['carries'][dim - 1]
+			if carry != 0:
+				latch_code.extend([
+					f"%{array_name}.carry.{dim} = select i1 {end}, i64 {carry}, i64 0",
+					f"%{array_name}.addr.carry.{dim} = getelementptr inbounds i32, i32* {addr}, i64 %{array_name}.carry.{dim}"
+				])
+				addr = f"%{array_name}.addr.carry.{dim}"
+
+		header_phis = [
+			"%iflat = phi i32 [ 0, %entry ], [ %iflat.next, %loop.latch.flat ]",
+			f"{ptr} = phi i32* [ %{array_name}.init, %entry ], [ {addr}, %loop.latch.flat ]"
+		]
+		for dim in range(first, dimensions):
+			level = dim + 1
+			header_phis.append(f"%i{level} = phi i32 [ {dim_loops[dim].start}, %entry ], [ %i{level}.wrap, %loop.latch.flat ]")
+
+		code = [
+			f"; Coalesced loop nest: {' x '.join(str(loop_info.trip_count) for loop_info in dim_loops)} = {total} iterations",
+			"br label %loop.header.flat",
+			"",
+			"loop.header.flat:",
+			*header_phis,
+			f"%iflat.cmp = icmp slt i32 %iflat, {total}",
+			"br i1 %iflat.cmp, label %loop.body.flat, label %loop.exit.flat",
+			"",
+			"loop.body.flat:",
+			f"; Access using address stream of {array_name}"
+		]
+
+		ops = array_info.array_info.operations
+		if ops.has_load:
+			code.append(f"%loaded.val = load i32, i32* {ptr}, align 4")
+		if ops.has_store:
+			code.append(f"store i32 %loaded.val, i32* {ptr}, align 4")
+
+		code.extend([
+			"br label %loop.latch.flat",
+			"",
+			"loop.latch.flat:",
+			*latch_code,
+			"%iflat.next = add i32 %iflat, 1",
+			"br label %loop.header.flat",
+			"",
+			"loop.exit.flat:"
+		])
+		return code
+
+	def _get_descriptors(self, array_info: Dict, array_dims: List[int]) -> Tuple[Optional[List[Descriptor]], str]:
+		"""
+		アドレスストリームのレベル毎の記述子 (内側から)
+		AddrGenUnitは Addr = Addr +/- Stride を Length+1 回繰り返すため,
+		強度低減したストリームを (base, stride, count) の列に落とし,
+		連続する (外側のstrideが内側の走査幅と等しい) レベルは1レベルに融合する
+			外側のレベルのbaseは0 (内側の記述子をstrideだけずらして再設定)
+		Returns:
+			(記述子のリスト, ''), 記述子に収まらない場合 (None, 理由)
+		"""
+		dim_loops = [self._get_dimension_loop(array_info, dim) for dim in range(array_info.array_info.dimensions)]
+		stream = self._get_address_stream('', array_info, dim_loops)
+		if stream is None:
+			return None, "not an affine, counted access"
+
+		size = 1
+		for dim_size in array_dims:
+			size *= dim_size
+		if size > 1 << CRAM_WIDTH_ADDR:
+			return None, f"{size} words exceed CRAM address space"
+
+		# 内側から, 1回だけのレベルは除く
+		levels = []
+		for stride, loop_info in reversed(list(zip(stream['strides'], dim_loops))):
+			if loop_info.trip_count == 1:
+				continue
+			if stride == 0:
+				return None, "repeated access (stride 0)"
+
+			if levels and stride == levels[-1].stride * levels[-1].count and levels[-1].count * loop_info.trip_count <= 1 << 8:
+				levels[-1].count *= loop_info.trip_count
+			else:
+				levels.append(Descriptor(0, stride, loop_info.trip_count))
+
+		if not levels:
+			levels.append(Descriptor(0, 1, 1))
+		levels[0].base = stream['init']
+
+		# フィールド幅 (Length, Base: 8-bit, Stride: AddrGenUnitはWIDTH_ADDR/2-bitを使用)
+		low = high = stream['init']
+		for level in levels:
+			if level.count > 1 << 8:
+				return None, f"count {level.count} exceeds length field"
+			if abs(level.stride) > 1 << (CRAM_WIDTH_ADDR // 2):
+				return None, f"stride {level.stride} exceeds stride field"
+			span = level.stride * (level.count - 1)
+			low += min(0, span)
+			high += max(0, span)
+		if not 0 <= stream['init'] < 1 << 8:
+			return None, f"base {stream['init']} exceeds base field"
+		if low < 0 or high >= size:
+			return None, "address out of array"
+
+		return levels, ''
+
+	def _encode_descriptor(self, level: Descriptor) -> int:
+		"""記述子のR-Config語 (Length, Strideは値-1, 負のstrideは減算フラグ)"""
+		word = CRAM_MODE_32BIT << CRAM_POSIT_MODE_LSB
+		if level.stride < 0:
+			word |= 1 << CRAM_POSIT_DECREMENT
+		word |= (level.count - 1) << CRAM_POSIT_LENGTH_LSB
+		word |= (abs(level.stride) - 1) << CRAM_POSIT_STRIDE_LSB
+		word |= level.base << CRAM_POSIT_BASE_LSB
+		return word
+
+	def _generate_descriptor_agu(self, array_name: str, array_info: Dict, array_dims: List[int]) -> Optional[Dict]:
+		"""
+		CRAMのアドレス生成ユニット向けのR-Config語の生成
+		load (AddrGenUnit_Ld), store (AddrGenUnit_St) 毎に, 属性語と内側からのレベル毎の語のブロック
+		Returns:
+			{
+				'words':		List[int],	# 32-bit R-Config語
+				'structure':	{'descriptors': {'load'|'store': [{'base', 'stride', 'count'}, ...]}}
+			}
+			記述子に収まらない場合 None
+		"""
+		levels, reason = self._get_descriptors(array_info, array_dims)
+		if levels is None:
+			print(f"Warning: Array {array_name} does not fit CRAM descriptors ({reason}), generating IR program")
+			return None
+
+		ops = array_info.array_info.operations
+		units = [unit for unit, used in (("load", ops.has_load), ("store", ops.has_store)) if used]
+
+		words = []
+		for index, unit in enumerate(units):
+			attribute = CRAM_ATTRIB_RCONFIG << CRAM_POSIT_ATTRIB_MODE_LSB
+			attribute |= 1 << CRAM_POSIT_ATTRIB_MY_ATTRIB_BLOCK
+			attribute |= len(levels) << CRAM_POSIT_ATTRIB_LENGTH_LSB
+			if index == len(units) - 1:
+				attribute |= 1 << CRAM_POSIT_ATTRIB_TERM_BLOCK
+
+			words.append(attribute)
+			words.extend(self._encode_descriptor(level) for level in levels)
+
+		table = [{'base': level.base, 'stride': level.stride, 'count': level.count} for level in levels]
+		return {
+			'words': words,
+			'structure': {'descriptors': {unit: table for unit in units}}
+		}
+
+	def _group_shared_arrays(self, tiling: Optional[Dict]) -> Dict[str, List[Tuple[str, Dict, List[int]]]]:
+		"""
+		ループ骨格が同じ配列のグループ (タイル化する配列は除く)
+		Returns:
+			{先頭の配列名: [(array_name, array_info, array_dims), ...]}
+		"""
+		groups = {}
+		for array_name, pattern in self.array_patterns.items():
+			if not array_name or array_name == 'None' or array_name not in self.array_dims:
+				continue
+			if tiling is not None and array_name in tiling['tile_ivs']:
+				continue
+
+			skeleton = self._get_loop_skeleton(pattern, self.array_dims[array_name])
+			groups.setdefault(skeleton, []).append((array_name, pattern, self.array_dims[array_name]))
+
+		return {members[0][0]: members for members in groups.values()}
+
+	def _plan_tiling(self) -> Optional[Dict]:
+		"""
+		タイル化の計画
+		Returns:
+			{
+				'nest':		[LoopInfo, ...],			# ループネスト (外側から)
+				'tile_ivs':	{array_name: [iv, ...]},	# タイル化する配列の次元毎の誘導変数
+				'tiles':	{iv: size}					# ループ毎のタイルサイズ
+			}
+			タイル化できない場合 None
+		"""
+		nest = self._get_loop_nest()
+		if nest is None:
+			print("Warning: Loop nest is not counted, generating untiled AGU")
+			return None
+
+		# 配列毎に判定し, タイル化できない配列だけを除く
+		tile_ivs = {}
+		for array_name, pattern in self.array_patterns.items():
+			if not array_name or array_name == 'None' or array_name not in self.array_dims:
+				continue
+			capacity = self._get_tile_capacity(array_name)
+			if capacity is None:
+				self._set_untiled(array_name, pattern, nest, "no on-chip capacity given")
+				continue
+			ivs = self._get_tile_ivs(pattern, nest)
+			if ivs is None:
+				self._set_untiled(array_name, pattern, nest, "not tileable")
+				continue
+			# 最小のタイル (1要素) も収まらない
+			if self._num_tile_buffers() > capacity:
+				self._set_untiled(array_name, pattern, nest, "on-chip capacity is too small for any tile")
+				continue
+			tile_ivs[array_name] = ivs
+
+		if not tile_ivs:
+			return None
+
+		tiles = self._choose_tiles(nest, tile_ivs)
+		if tiles is None:
+			print("Warning: On-chip capacity is too small for any tile, generating untiled AGU")
+			return None
+
+		return {'nest': nest, 'tile_ivs': tile_ivs, 'tiles': tiles}
+
+	def _get_loop_nest(self) -> Optional[List[Any]]:
+		"""ループネスト (外側から), 反復回数が定数でないループがある場合 None"""
+		nest = [self.loop_levels[level] for level in sorted(self.loop_levels, key=int, reverse=True)]
+		if not nest or any(not loop_info.is_counted() or loop_info.induction_var is None for loop_info in nest):
+			return None
+		return nest
+
+	def _get_tile_ivs(self, array_info: Dict, nest: List[Any]) -> Optional[List[str]]:
+		"""
+		次元毎の誘導変数 (外側の次元から)
+		各次元の添字がループネストの誘導変数そのものである場合のみ, それ以外は None
+		"""
+		index_expr = array_info.array_info.index_expr
+		if index_expr is None or not index_expr.subscripts:
+			return None
+
+		nest_ivs = [loop_info.induction_var for loop_info in nest]
+		ivs = []
+		for subscript in index_expr.subscripts:
+			if subscript is None or subscript.const != 0 or len(subscript.Vars()) != 1:
+				return None
+			iv = subscript.Vars()[0]
+			if subscript.Coeff(iv) != 1 or iv not in nest_ivs or iv in ivs:
+				return None
+			ivs.append(iv)
+		return ivs
+
+	def _get_tile_capacity(self, array_name: str) -> Optional[int]:
+		"""配列のオンチップ容量 (ワード), 指定がない場合 None"""
+		return self.tile_capacity.get(array_name, self.tile_capacity.get('*'))
+
+	def _set_untiled(self, array_name: str, array_info: Dict, nest: List[Any], reason: str):
+		"""タイル化しない配列の記録 (転送量の見積もりに含める)"""
+		print(f"Warning: Array {array_name}: {reason}, generating untiled AGU")
+		words = self._get_untiled_traffic(array_info, nest)
+		self.untiled[array_name] = {'tile': None, 'reason': reason, 'untiled_words': words, 'tiled_words': words}
+
+	def _choose_tiles(self, nest: List[Any], tile_ivs: Dict[str, List[str]]) -> Optional[Dict[str, int]]:
+		"""
+		ループ毎のタイルサイズの決定
+		全ループを反復回数 (タイル = 配列全体) から始め, タイルの大きさ (要素数 x バッファ数) が
+		オンチップ容量を超える配列があれば, その配列の添字のうち最大のタイルを
+		反復回数の約数で次に小さい値に縮める
+		Returns:
+			{誘導変数: タイルサイズ}, 容量に収まらない場合 None
+		"""
+		trips = {loop_info.induction_var: loop_info.trip_count for loop_info in nest}
+		tiles = dict(trips)
+
+		while True:
+			over = [
+				(array_name, ivs) for array_name, ivs in tile_ivs.items()
+				if self._tile_footprint(ivs, tiles) * self._num_tile_buffers() > self._get_tile_capacity(array_name)
+			]
+			if not over:
+				return tiles
+
+			_, ivs = over[0]
+			iv = max(ivs, key=lambda var: tiles[var])
+			if tiles[iv] == 1:
+				return None
+			tiles[iv] = max(size for size in range(1, tiles[iv]) if trips[iv] % size == 0)
+
+	def _num_tile_buffers(self) -> int:
+		"""配列毎のオンチップのタイルバッファ数 (ダブルバッファの場合は2)"""
+		return 2 if self.double_buffer else 1
+
+	def _tile_footprint(self, ivs: List[str], tiles: Dict[str, int]) -> int:
+		"""タイルの要素数"""
+		footprint = 1
+		for iv in ivs:
+			footprint *= tiles[iv]
+		return footprint
+
+	def _get_tile_reload_depth(self, ivs: List[str], nest: List[Any]) -> int:
+		"""
+		タイルを読み直すタイルループの深さ
+		配列の添字にある最も内側のループより内側のタイルループではタイルが再利用される
+		"""
+		nest_ivs = [loop_info.induction_var for loop_info in nest]
+		return max(nest_ivs.index(iv) for iv in ivs) + 1
+
+	def _get_untiled_traffic(self, array_info: Dict, nest: List[Any]) -> int:
+		"""全アクセスが外部メモリに行く場合の転送量 (ループネストの反復回数 x アクセス数)"""
+		ops = array_info.array_info.operations
+		num_ops = int(bool(ops.has_load)) + int(bool(ops.has_store))
+
+		iterations = 1
+		for loop_info in nest:
+			iterations *= loop_info.trip_count
+		return iterations * num_ops
+
+	def _estimate_tile_traffic(self, array_info: Dict, ivs: List[str], nest: List[Any], tiles: Dict[str, int]) -> Dict:
+		"""
+		外部メモリとの転送量 (ワード) の見積もり
+			untiled:	全アクセスが外部メモリに行く場合 (ループネストの反復回数 x アクセス数)
+			tiled:		タイル x タイルを読み直す回数 (load, storeそれぞれ)
+		"""
+		ops = array_info.array_info.operations
+		num_ops = int(bool(ops.has_load)) + int(bool(ops.has_store))
+
+		reloads = 1
+		for loop_info in nest[:self._get_tile_reload_depth(ivs, nest)]:
+			reloads *= loop_info.trip_count // tiles[loop_info.induction_var]
+
+		untiled = self._get_untiled_traffic(array_info, nest)
+		tiled = self._tile_footprint(ivs, tiles) * reloads * num_ops
+		return {
+			'tile': [tiles[iv] for iv in ivs],
+			'footprint': self._tile_footprint(ivs, tiles),
+			'untiled_words': untiled,
+			'tiled_words': tiled,
+			'reduction': (untiled / tiled) if tiled else 0.0
+		}
+
+	def _generate_loop_nest(self, loops: List[Tuple[str, Any]], body: List[str], prologue: Optional[Dict[str, List[str]]] = None, latch: Optional[Dict[str, List[str]]] = None) -> List[str]:
+		"""
+		ループネストの生成 (phiカウンタ, 外側から)
+			loops:		[(level, LoopBounds), ...], カウンタは %i<level>
+			body:		最内ループの本体
+			prologue:	{level: code}, ループ本体の先頭 (内側ループの前) に置くコード
+			latch:		{level: code}, ループのラッチ (内側ループの後) に置くコード
+		"""
+		prologue = prologue or {}
+		latch = latch or {}
+
+		code = []
+		preheader = "entry"
+		for level, bounds in loops:
+			code.extend(self._generate_loop_structure(level=level, size=bounds.bound, array_info=None, is_innermost=False, loop_info=bounds, preheader=preheader))
+			code.extend(prologue.get(level, []))
+			preheader = f"loop.body.{level}"
+
+		code.extend(body)
+		for level, bounds in reversed(loops):
+			code.extend(self._generate_loop_exit(level, bounds, latch.get(level)))
+		return code
+
+	def _get_tile_type(self, array_name: str, ivs: List[str], tiles: Dict[str, int]) -> str:
+		"""オンチップのタイルバッファの型 (ダブルバッファの場合は2面)"""
+		tile_type = self._get_array_type(array_name, [tiles[iv] for iv in ivs])
+		return f"[2 x {tile_type}]" if self.double_buffer else tile_type
+
+	def _get_tile_index(self, counters: List[str]) -> str:
+		"""タイルバッファのインデックス (ダブルバッファの場合は先頭にバッファ選択)"""
+		indices = ["i32 %buf"] if self.double_buffer else []
+		indices.extend(f"i32 {counter}" for counter in counters)
+		return ', '.join(indices)
 
+	def _generate_buffer_select(self, nest: List[Any], tiles: Dict[str, int], depth: int) -> List[str]:
+		"""
+		バッファ選択ビット %buf の計算
+		タイルループ (深さdepthまで) の反復の通し番号 k の最下位ビット
+			k = Σ q_l x Π n_m (q_l: ループlのタイル番号, n_m: ループmのタイル数)
+		転送と演算のストリームで同じ式を用いるため, k番目のタイルは双方で同じバッファを指す
+		"""
+		code = []
+		tile_no = None
+		for pos, loop_info in enumerate(nest[:depth]):
+			level = pos + 1
+			counter = f"%it{level}"
+			if loop_info.start != 0:
+				code.append(f"%tq{level}.ofs = sub i32 {counter}, {loop_info.start}")
+				counter = f"%tq{level}.ofs"
+			code.append(f"%tq{level} = udiv i32 {counter}, {loop_info.step * tiles[loop_info.induction_var]}")
+
+			if tile_no is None:
+				tile_no = f"%tq{level}"
+				continue
+
+			num_tiles = loop_info.trip_count // tiles[loop_info.induction_var]
+			code.extend([
+				f"%tk{level}.mul = mul i32 {tile_no}, {num_tiles}",
+				f"%tk{level} = add i32 %tk{level}.mul, %tq{level}"
+			])
+			tile_no = f"%tk{level}"
+
+		code.append(f"%buf = and i32 {tile_no}, 1")
 		return code
 
-	def _generate_loop_exit(self, level: str) -> List[str]:
-		"""ループ終了コードの生成"""
+	def _get_handshakes(self, array_name: str, array_info: Dict, stream: str) -> Tuple[Optional[str], Optional[str]]:
+		"""
+		ストリームがタイルの前に待つイベントと, タイルの後に通知するイベント
+			filled:		tile_load → compute (タイルの読み込み完了)
+			computed:	compute → tile_store (タイルの演算完了)
+			free:		compute / tile_store → tile_load (バッファの解放)
+		両バッファは初期状態でfree
+		"""
+		ops = array_info.array_info.operations
+		if stream == "tile_load":
+			return "free", "filled"
+		elif stream == "tile_store":
+			return "computed", "free"
+		return ("filled" if ops.has_load else "free"), ("computed" if ops.has_store else "free")
+
+	def _generate_handshake(self, array_name: str, action: str, event: str) -> str:
+		"""バッファのハンドシェイク (wait/signal) の呼び出し"""
+		return f"call void @{array_name}.tile.{action}.{event}(i32 %buf)"
+
+	def _generate_tile_transfer(self, array_name: str, array_dims: List[int], ivs: List[str], nest: List[Any], tiles: Dict[str, int], direction: str, array_info: Optional[Dict] = None) -> List[str]:
+		"""
+		タイル転送 (tile_load: 外部メモリ→オンチップ, tile_store: オンチップ→外部メモリ) のアドレスストリーム
+		タイルループ (タイルを読み直す深さまで) の各反復でタイルの全要素を転送
+		ダブルバッファの場合, タイル毎にバッファを切り替え, 転送の前後でハンドシェイクする
+		"""
+		nest_ivs = [loop_info.induction_var for loop_info in nest]
+		depth = self._get_tile_reload_depth(ivs, nest)
+		loops = []
+		for pos, loop_info in enumerate(nest[:depth]):
+			loops.append((f"t{pos + 1}", LoopBounds(loop_info.start, loop_info.step * tiles[loop_info.induction_var], loop_info.bound, loop_info.predicate)))
+		for dim, iv in enumerate(ivs):
+			loops.append((f"e{dim + 1}", LoopBounds(0, 1, tiles[iv])))
+
+		body = [f"; {direction} of {array_name} tile"]
+		for dim, iv in enumerate(ivs):
+			body.append(f"%x{dim + 1} = add i32 %it{nest_ivs.index(iv) + 1}, %ie{dim + 1}")
+
+		array_type = self._get_array_type(array_name, array_dims)
+		tile_type = self._get_tile_type(array_name, ivs, tiles)
+		ext_index = ', '.join(f'i32 %x{dim + 1}' for dim in range(len(ivs)))
+		tile_index = self._get_tile_index([f'%ie{dim + 1}' for dim in range(len(ivs))])
+		body.extend([
+			f"%ext.ptr = getelementptr inbounds {array_type}, {array_type}* @{array_name}, i32 0, {ext_index}",
+			f"%tile.ptr = getelementptr inbounds {tile_type}, {tile_type}* @{array_name}.tile, i32 0, {tile_index}"
+		])
+		src, dst = ("%ext.ptr", "%tile.ptr") if direction == "tile_load" else ("%tile.ptr", "%ext.ptr")
+		body.extend([
+			f"%loaded.val = load i32, i32* {src}, align 4",
+			f"store i32 %loaded.val, i32* {dst}, align 4"
+		])
+
+		prologue = {}
+		latch = {}
+		if self.double_buffer:
+			wait, signal = self._get_handshakes(array_name, array_info, direction)
+			prologue[f"t{depth}"] = [
+				*self._generate_buffer_select(nest, tiles, depth),
+				self._generate_handshake(array_name, "wait", wait)
+			]
+			latch[f"t{depth}"] = [self._generate_handshake(array_name, "signal", signal)]
+
 		return [
+			f"define dso_local void @agu_{array_name}_{direction}() #0 {{",
+			"entry:",
+			*self._generate_loop_nest(loops, body, prologue, latch),
+			"ret void",
+			"}",
+			""
+		]
+
+	def _generate_tile_compute(self, array_name: str, array_info: Dict, ivs: List[str], nest: List[Any], tiles: Dict[str, int]) -> List[str]:
+		"""
+		演算のアドレスストリーム (オンチップのタイル内アドレス)
+		タイルループとタイル内ループでループネスト全体を走査
+		ダブルバッファの場合, タイルを読み直す深さのタイルループでバッファを選択し, ハンドシェイクする
+		"""
+		nest_ivs = [loop_info.induction_var for loop_info in nest]
+		depth = self._get_tile_reload_depth(ivs, nest)
+		loops = []
+		for pos, loop_info in enumerate(nest):
+			loops.append((f"t{pos + 1}", LoopBounds(loop_info.start, loop_info.step * tiles[loop_info.induction_var], loop_info.bound, loop_info.predicate)))
+		for pos, loop_info in enumerate(nest):
+			loops.append((f"e{pos + 1}", LoopBounds(0, 1, tiles[loop_info.induction_var])))
+
+		tile_type = self._get_tile_type(array_name, ivs, tiles)
+		tile_index = self._get_tile_index([f'%ie{nest_ivs.index(iv) + 1}' for iv in ivs])
+		body = [
+			f"; Access to {array_name} tile",
+			f"%tile.ptr = getelementptr inbounds {tile_type}, {tile_type}* @{array_name}.tile, i32 0, {tile_index}"
+		]
+		ops = array_info.array_info.operations
+		if ops.has_load:
+			body.append(f"%loaded.val = load i32, i32* %tile.ptr, align 4")
+		if ops.has_store:
+			body.append(f"store i32 %loaded.val, i32* %tile.ptr, align 4")
+
+		prologue = {}
+		latch = {}
+		if self.double_buffer:
+			wait, signal = self._get_handshakes(array_name, array_info, "compute")
+			prologue[f"t{depth}"] = [
+				*self._generate_buffer_select(nest, tiles, depth),
+				self._generate_handshake(array_name, "wait", wait)
+			]
+			latch[f"t{depth}"] = [self._generate_handshake(array_name, "signal", signal)]
+
+		return [
+			f"define dso_local void @agu_{array_name}_compute() #0 {{",
+			"entry:",
+			*self._generate_loop_nest(loops, body, prologue, latch),
+			"ret void",
+			"}",
+			""
+		]
+
+	def _generate_tiled_agu(self, array_name: str, array_info: Dict, array_dims: List[int], ivs: List[str], nest: List[Any], tiles: Dict[str, int]) -> Dict:
+		"""
+		タイル化したAGUプログラムの生成
+		タイル転送 (tile_load, tile_store) と演算 (compute) のアドレスストリームを別の関数として出力
+		ダブルバッファの場合, タイルk+1の転送とタイルkの演算が並行し,
+		各ストリームはバッファ毎のハンドシェイク (@<array>.tile.wait/signal.<event>) で同期する
+		"""
+		tile_dims = [tiles[iv] for iv in ivs]
+		report = self._estimate_tile_traffic(array_info, ivs, nest, tiles)
+		report['capacity'] = self._get_tile_capacity(array_name)
+		report['buffers'] = self._num_tile_buffers()
+
+		code = [
+			f"; Tiled AGU for array {array_name}: tile {' x '.join(str(size) for size in tile_dims)}, "
+			f"external traffic {report['untiled_words']} -> {report['tiled_words']} words",
+			"target datalayout = \"e-m:e-p270:32:32-p271:32:32-p272:64:64-i64:64-f80:128-n8:16:32:64-S128\"",
+			"target triple = \"x86_64-pc-linux-gnu\"",
+			"",
+			*self._generate_array_globals([array_name]),
+			f"@{array_name}.tile = internal global {self._get_tile_type(array_name, ivs, tiles)} zeroinitializer, align 4",
+			""
+		]
+
+		ops = array_info.array_info.operations
+		streams = (["tile_load"] if ops.has_load else []) + ["compute"] + (["tile_store"] if ops.has_store else [])
+		if self.double_buffer:
+			handshakes = []
+			for stream in streams:
+				wait, signal = self._get_handshakes(array_name, array_info, stream)
+				handshakes.append({'stream': stream, 'wait': wait, 'signal': signal})
+			self.handshakes[array_name] = handshakes
+			report['handshakes'] = handshakes
+
+			events = sorted({(action, hs[action]) for hs in handshakes for action in ("wait", "signal")})
+			code.append(f"; Buffer handshake of {array_name} tiles (both buffers are free at start)")
+			code.extend(f"declare void @{array_name}.tile.{action}.{event}(i32)" for action, event in events)
+			code.append("")
+
+		for stream in streams:
+			if stream == "compute":
+				code.extend(self._generate_tile_compute(array_name, array_info, ivs, nest, tiles))
+			else:
+				code.extend(self._generate_tile_transfer(array_name, array_dims, ivs, nest, tiles, stream, array_info))
+
+		code.append("attributes #0 = { nounwind }")
+
+		return {
+			'code': code,
+			'structure': {'loops': [], 'entry': "entry", 'exit': None, 'tiling': report}
+		}
+
+	def _generate_loop_exit(self, level: str, loop_info: Optional[Any] = None, latch_code: Optional[List[str]] = None) -> List[str]:
+		"""
+		ループのラッチと終了部分の生成
+		ループ本体 (内側ループの終了) からラッチに分岐し, カウンタを更新してヘッダに戻る
+			loop_info:	IRから抽出した増分, Noneの場合は1
+			latch_code:	カウンタ更新の前に置くコード (アドレスストリームの更新)
+		"""
+		step = loop_info.step if loop_info is not None else 1
+		return [
+			f"br label %loop.latch.{level}",
 			"",
-			f"loop.exit.{level}:",
-			f"%i{level}.next = add i32 %i{level}.load, 1",
-			f"store i32 %i{level}.next, i32* %i{level}, align 4",
-			f"br label %loop.header.{level}"
+			f"loop.latch.{level}:",
+			*(latch_code or []),
+			f"%i{level}.next = add i32 %i{level}, {step}",
+			f"br label %loop.header.{level}",
+			"",
+			f"loop.exit.{level}:"
 		]
 
 	def _generate_store_instruction(self, store_id: str, addr_reg: str) -> List[str]:
@@ -501,14 +1406,11 @@ class AGUGenerator:
 		array_dims: Dict[str, List[int]] = {}
 
 		try:
-			# LLVM IRファイルのパスを構築
-			llvm_file = os.path.join(self.r_path, "mmm.ll")
-			if not os.path.exists(llvm_file):
-				print(f"Warning: LLVM IR file not found: {llvm_file}")
+			if self.ir_file is None:
 				return array_dims
 
 			# ファイルを読み込んで配列定義を解析
-			with open(llvm_file, 'r') as f:
+			with open(self.ir_file, 'r') as f:
 				for line in f:
 					# グローバル配列の定義行を検出
 					if '@' in line and 'global' in line and 'zeroinitializer' in line:
@@ -562,6 +1464,11 @@ class AGUGenerator:
 		result = {}
 		try:
 			print(f"Generating Code.")
+			tiling = self._plan_tiling() if self.tile_capacity else None
+			if self.double_buffer and not self.tile_capacity:
+				print("Warning: Double buffering needs tiling (on-chip capacity), generating single-buffered AGU")
+			shared_groups = self._group_shared_arrays(tiling) if self.shared else {}
+
 			# 配列ごとのAGUプログラム生成
 			for array_name, pattern in self.array_patterns.items():
 				# 空の配列名と'None'をスキップ
@@ -573,12 +1480,40 @@ class AGUGenerator:
 					print(f"Warning: No dimension information for array {array_name}")
 					continue
 
+				# ループ骨格を共有するAGUにまとめる配列 (先頭の配列でまとめて生成)
+				if array_name in shared_groups:
+					members = shared_groups[array_name]
+					if len(members) > 1:
+						program_name = '_'.join(member[0] for member in members)
+						print(f"Sharing AGU {program_name}: arrays {[member[0] for member in members]}")
+						result[program_name] = self._generate_multi_stream_agu(program_name, members)
+						continue
+				elif any(array_name in [member[0] for member in members] for members in shared_groups.values()):
+					continue
+
 				# AGUプログラムの生成
-				agu_program = self._generate_array_agu(
-					array_name,
-					pattern,
-					self.array_dims[array_name]
-				)
+				if tiling is not None and array_name in tiling['tile_ivs']:
+					agu_program = self._generate_tiled_agu(
+						array_name,
+						pattern,
+						self.array_dims[array_name],
+						tiling['tile_ivs'][array_name],
+						tiling['nest'],
+						tiling['tiles']
+					)
+					report = agu_program['structure']['tiling']
+					print(f"Tiling {array_name}: tile {report['tile']} ({report['footprint']}/{report['capacity']} words), "
+						f"external traffic {report['untiled_words']} -> {report['tiled_words']} words ({report['reduction']:.1f}x)")
+				else:
+					agu_program = None
+					if self.backend == "descriptor":
+						agu_program = self._generate_descriptor_agu(array_name, pattern, self.array_dims[array_name])
+					if agu_program is None:
+						agu_program = self._generate_array_agu(
+							array_name,
+							pattern,
+							self.array_dims[array_name]
+						)
 
 				result[array_name] = agu_program
 
@@ -38,11 +38,18 @@ def setup_logger():
 logger = setup_logger()
 
 class DataPathGenerator:
-	def __init__(self, array_patterns, compute_paths, r_file_path, r_name):
-		self.array_patterns = array_patterns['array_patterns']
+	def __init__(self, array_patterns, compute_paths, r_file_path, r_name, handshakes=None):
+		"""
+		Args:
+			handshakes: ダブルバッファのハンドシェイク (AGUGenerator.handshakes)
+				{array_name: [{'stream', 'wait', 'signal'}, ...]}
+				指定した場合, タイルの前後にcomputeストリームのハンドシェイク点を出力
+		"""
+		self.handshakes = handshakes or {}
+		self.array_patterns = array_patterns.array_patterns
 		self.compute_paths = compute_paths
-		self.loop_levels = array_patterns['loop_levels']
-		self.loops = array_patterns['loops']
+		self.loop_levels = array_patterns.loop_levels
+		self.loops = array_patterns.loops
 		self.r_path = r_file_path
 		self.r_name = r_name
 		self.array_dims = self._get_array_dimensions()  # ここで呼び出し
@@ -57,12 +64,9 @@ class DataPathGenerator:
 			array_dims = {}
 			for array_name, pattern in self.array_patterns.items():
 				dims = []
-				if 'array_info' in pattern:
-					array_info = pattern['array_info']
-					# loop_accessから次元サイズを収集
-					for access in array_info.get('loop_access', {}).values():
-						if 'array_size' in access:
-							dims.append(access['array_size'])
+				# loop_accessから次元サイズを収集
+				for access in pattern.array_info.loop_access.values():
+					dims.append(access.array_size)
 				
 				if dims:  # 次元情報が得られた場合のみ追加
 					array_dims[array_name] = dims
@@ -79,14 +83,14 @@ class DataPathGenerator:
 			dataflows = {}
 			
 			for path in paths:
-				print(f"Debug: Processing path: {path['path_id']}, type: {path['type']}")
+				print(f"Debug: Processing path: {path.path_id}, type: {path.type}")
 				
 				# 計算シーケンスの分析
 				computation_sequence = []
 				control_sequence = []
 				
-				for comp in path.get('computation', {}).get('sequence', []):
-					opcode = comp['opcode'].split('_')[0]
+				for comp in path.computation.sequence:
+					opcode = comp.opcode.split('_')[0]
 					if opcode == 'icmp':
 						control_sequence.append(comp)
 					elif opcode in {'add', 'mul', 'sub'}:
@@ -94,31 +98,31 @@ class DataPathGenerator:
 				
 				# パスの分類
 				if computation_sequence:
-					flow_id = f"compute_{path['path_id']}"
+					flow_id = f"compute_{path.path_id}"
 					dataflows[flow_id] = {
-						'loads': path.get('inputs', {}).get('loads', []),
+						'loads': path.inputs.loads,
 						'computation': computation_sequence,
 						'stores': [],
-						'blocks': {path['path_id'].split('_')[1]},
+						'blocks': {path.path_id.split('_')[1]},
 						'splits': {}
 					}
 					
 				if control_sequence:
-					flow_id = f"control_{path['path_id']}"
+					flow_id = f"control_{path.path_id}"
 					dataflows[flow_id] = {
 						'loads': [],
 						'computation': control_sequence,
 						'stores': [],
-						'blocks': {path['path_id'].split('_')[1]},
+						'blocks': {path.path_id.split('_')[1]},
 						'splits': {
 							'condition': {
-								'reg': control_sequence[0]['output_reg'],
+								'reg': control_sequence[0].output_reg,
 								'comp': control_sequence[0]
 							}
 						}
 					}
 				
-				print(f"Debug: Created flows for path {path['path_id']}")
+				print(f"Debug: Created flows for path {path.path_id}")
 				
 			return dataflows
 
@@ -130,9 +134,9 @@ class DataPathGenerator:
 		"""分岐情報の処理"""
 		try:
 			# 分岐条件を特定
-			for comp in path['computation']['sequence']:
-				if comp['opcode'].startswith('icmp'):
-					condition_reg = comp['output_reg']
+			for comp in path.computation.sequence:
+				if comp.opcode.startswith('icmp'):
+					condition_reg = comp.output_reg
 					dataflow['splits']['condition'] = {
 						'reg': condition_reg,
 						'comp': comp
@@ -140,7 +144,7 @@ class DataPathGenerator:
 					break
 
 			# 分岐後のパスを記録
-			block_id = path['path_id'].split('_')[1]
+			block_id = path.path_id.split('_')[1]
 			if 'paths' not in dataflow['splits']:
 				dataflow['splits']['paths'] = {}
 			dataflow['splits']['paths'][block_id] = path
@@ -171,11 +175,11 @@ class DataPathGenerator:
 				if flow_id.startswith('condition_'):
 					# 条件ノードを特定
 					for comp in flow['computation']:
-						if comp['opcode'].startswith('icmp'):
+						if comp.opcode.startswith('icmp'):
 							if 'splits' not in current_flow:
 								current_flow['splits'] = {}
 							current_flow['splits']['condition'] = {
-								'reg': comp['output_reg'],
+								'reg': comp.output_reg,
 								'comp': comp
 							}
 							break
@@ -209,7 +213,7 @@ class DataPathGenerator:
 					connected['path_sequence'].append({
 						'block': block_id,
 						'type': 'computation',
-						'sequence': path['computation']['sequence']
+						'sequence': path.computation.sequence
 					})
 
 			return connected
@@ -229,8 +233,8 @@ class DataPathGenerator:
 		"""
 		try:
 			# ロードとストアの配列名を収集
-			load_arrays = [load['array'] for load in loads if 'array' in load]
-			store_arrays = [store['array'] for store in stores if 'array' in store]
+			load_arrays = [load.array for load in loads if load.array]
+			store_arrays = [store.array for store in stores if store.array]
 			
 			# 識別子の生成（例：load_a_b_store_c）
 			flow_parts = []
@@ -256,16 +260,16 @@ class DataPathGenerator:
 
 			compute_seq = []
 			for comp in flow.get('computation', []):
-				opcode = comp['opcode'].split('_')[0]
+				opcode = comp.opcode.split('_')[0]
 				if opcode in {'mul', 'add', 'sub', 'and', 'or', 'xor', 'shl', 'ashr', 'lshr'}:
 					compute_seq.append(comp)
-					print(f"Debug: Added computation: {opcode} {comp['input_regs']} -> {comp['output_reg']}")
+					print(f"Debug: Added computation: {opcode} {comp.input_regs} -> {comp.output_reg}")
 
 			if compute_seq:
 				# 1. ロードすべき入力の特定
-				output_regs = {comp['output_reg'] for comp in compute_seq}
+				output_regs = {comp.output_reg for comp in compute_seq}
 				for comp in compute_seq:
-					for input_reg in comp['input_regs']:
+					for input_reg in comp.input_regs:
 						if input_reg not in output_regs:
 							code.append(f"{input_reg} = load i32, i32* %ptr_{input_reg.strip('%')}, align 4")
 
@@ -275,7 +279,7 @@ class DataPathGenerator:
 
 				# 3. 最終結果のストア
 				# データフローの最終出力を特定
-				final_output = compute_seq[-1]['output_reg']
+				final_output = compute_seq[-1].output_reg
 				code.append(f"store i32 {final_output}, i32* %ptr_out_{final_output.strip('%')}, align 4")
 
 			print(f"Debug: Generated code:\n" + "\n".join(code))
@@ -299,9 +303,9 @@ class DataPathGenerator:
 			'lshr': 'lshr'
 		}
 		
-		opcode = comp['opcode'].split('_')[0]
+		opcode = comp.opcode.split('_')[0]
 		if opcode in op_map:
-			return f"{comp['output_reg']} = {op_map[opcode]} i32 {comp['input_regs'][0]}, {comp['input_regs'][1]}"
+			return f"{comp.output_reg} = {op_map[opcode]} i32 {comp.input_regs[0]}, {comp.input_regs[1]}"
 		
 		return ""
 
@@ -324,9 +328,9 @@ class DataPathGenerator:
 			print(f"Debug: Generating computation sequence for: {sequence}")
 			code = []
 			for comp in sequence:
-				opcode = comp['opcode'].split('_')[0]
-				output_reg = comp['output_reg'].strip('%') if comp.get('output_reg') else None
-				input_regs = [reg.strip('%') for reg in comp.get('input_regs', [])]
+				opcode = comp.opcode.split('_')[0]
+				output_reg = comp.output_reg.strip('%') if comp.output_reg else None
+				input_regs = [reg.strip('%') for reg in comp.input_regs]
 
 				# 入力レジスタの存在を確認
 				if not input_regs or not output_reg:
@@ -365,8 +369,8 @@ class DataPathGenerator:
 		try:
 			print(f"Debug: Generating condition code for: {comp}")
 			code = []
-			output_reg = comp['output_reg'].strip('%')
-			input_regs = [reg.strip('%') for reg in comp['input_regs']]
+			output_reg = comp.output_reg.strip('%')
+			input_regs = [reg.strip('%') for reg in comp.input_regs]
 
 			# LLVM IRの標準的な比較条件
 			condition_map = {
@@ -380,7 +384,7 @@ class DataPathGenerator:
 			
 			# opcodeから条件を抽出
 			# 例: icmp_slt_123 -> slt
-			opcode_parts = comp['opcode'].split('_')
+			opcode_parts = comp.opcode.split('_')
 			cond = 'slt'  # デフォルト値
 			for part in opcode_parts[1:]:  # icmpの後の部分を確認
 				if part in condition_map:
@@ -405,19 +409,56 @@ class DataPathGenerator:
 	def _get_loop_bound(self, loop_level: str) -> int:
 		"""
 		ループレベルに対応する境界値を取得
+		IRから抽出した境界 (LoopInfo.bound) を優先し, 記号的な場合は配列の次元サイズを用いる
 		"""
 		try:
 			if loop_level in self.loop_levels:
+				loop_info = self.loop_levels[loop_level]
+				if isinstance(loop_info.bound, int):
+					return loop_info.bound
 				for array_name, pattern in self.array_patterns.items():
-					loop_access = pattern.get('array_info', {}).get('loop_access', {})
+					loop_access = pattern.array_info.loop_access
 					if loop_level in loop_access:
-						return loop_access[loop_level].get('array_size', 32)
+						return loop_access[loop_level].array_size
 			return 32  # デフォルト値
 
 		except Exception as e:
 			logger.error(f"Error getting loop bound: {e}")
 			return 32
 
+	def _generate_handshake_points(self) -> Tuple[List[str], List[str]]:
+		"""
+		ダブルバッファのハンドシェイク点 (タイルの演算の開始と終了)
+		バッファ選択 %<array>.buf はAGUのcomputeストリームが与える
+		Returns:
+			(タイル開始のコード, タイル終了のコード)
+		"""
+		declares = []
+		waits = []
+		signals = []
+		for array_name, handshakes in self.handshakes.items():
+			for handshake in handshakes:
+				if handshake['stream'] != 'compute':
+					continue
+				declares.append(f"declare void @{array_name}.tile.wait.{handshake['wait']}(i32)")
+				declares.append(f"declare void @{array_name}.tile.signal.{handshake['signal']}(i32)")
+				waits.append(f"call void @{array_name}.tile.wait.{handshake['wait']}(i32 %{array_name}.buf)")
+				signals.append(f"call void @{array_name}.tile.signal.{handshake['signal']}(i32 %{array_name}.buf)")
+
+		begin_code = [
+			"; Tile handshake points (buffer select %<array>.buf is given by the AGU compute stream)",
+			*declares,
+			"",
+			"tile.begin:",
+			*waits
+		]
+		end_code = [
+			"",
+			"tile.end:",
+			*signals
+		]
+		return begin_code, end_code
+
 	def _generate_load_node(self, load: Dict) -> str:
 		"""
 		ロードノードの登録（レジスタ名の生成）
@@ -427,7 +468,7 @@ class DataPathGenerator:
 		try:
 			# ロードノードのレジスタ名を生成
 			# AGUが生成したポインタを使用する想定
-			return f"load_{load['node_id']}"
+			return f"load_{load.node_id}"
 
 		except Exception as e:
 			logger.error(f"Error generating load node: {e}")
@@ -437,7 +478,7 @@ class DataPathGenerator:
 		result = {'code': [], 'structure': {'entry': None, 'exit': None}}
 		
 		try:
-			compute_paths = self.compute_paths.get('compute_paths', [])
+			compute_paths = self.compute_paths.compute_paths
 			print(f"Initial compute_paths: {compute_paths}")  # デバッグ出力
 			
 			path_groups = self._group_paths_by_dataflow(compute_paths)
@@ -449,7 +490,13 @@ class DataPathGenerator:
 			for flow in connected_paths:
 				code = self._generate_dataflow_code(flow)
 				result['code'].extend(code)
-				
+
+			if self.handshakes:
+				begin_code, end_code = self._generate_handshake_points()
+				result['code'] = begin_code + result['code'] + end_code
+				result['structure']['entry'] = "tile.begin"
+				result['structure']['exit'] = "tile.end"
+
 			return result
 			
 		except Exception as e:
@@ -10,8 +10,84 @@
 import numpy as np
 
 
+class PathTrie:
+	"""
+	Prefix Tree of Node-IDs
+
+	Paths sharing a common prefix share the trie nodes of that prefix,
+	a registered path is represented by the handle of its last node.
+		handle 0:	root (empty path)
+	"""
+	def __init__( self ):
+		self.parent = [ -1 ]
+		self.node_id = [ -1 ]
+		self.depth = [ 0 ]
+		self.child = {}
+
+	def Intern( self, path, handle=0 ):
+		"""
+		Register path (appended to the path of handle) and return its handle
+		"""
+		for node_id in path:
+			key = ( handle, node_id )
+			next_handle = self.child.get( key )
+			if next_handle is None:
+				next_handle = len( self.node_id )
+				self.parent.append( handle )
+				self.node_id.append( node_id )
+				self.depth.append( self.depth[ handle ] + 1 )
+				self.child[ key ] = next_handle
+			handle = next_handle
+		return handle
+
+	def Read( self, handle ):
+		"""
+		Materialize path (list of node-IDs) of handle
+		"""
+		path = [ None ] * self.depth[ handle ]
+		for pos in range( len( path ) - 1, -1, -1 ):
+			path[ pos ] = self.node_id[ handle ]
+			handle = self.parent[ handle ]
+		return path
+
+	def Length( self, handle ):
+		return self.depth[ handle ]
+
+	def Nodes( self, handle ):
+		"""
+		(position, node-ID) of the path of handle, from the last node
+		"""
+		while handle > 0:
+			yield self.depth[ handle ] - 1, self.node_id[ handle ]
+			handle = self.parent[ handle ]
+
+	def Prefix( self, handle, length ):
+		"""
+		Handle of the first length nodes of the path of handle
+		"""
+		while self.depth[ handle ] > length:
+			handle = self.parent[ handle ]
+		return handle
+
+	def Positions( self, handle ):
+		"""
+		First position of every node-ID in the path of handle
+		"""
+		position = {}
+		for pos, node_id in self.Nodes( handle ):
+			position[ node_id ] = pos
+		return position
+
+	def NumNodes( self ):
+		return len( self.node_id ) - 1
+
+
 class Path:
 	def __init__( self ):
+		# Path Storage
+		#	every category keeps handles to the shared prefix tree
+		self.trie = PathTrie()
+
 		self.st_route_path = []
 		self.st_ld_path = []
 		self.st_leaf_path = []
@@ -23,23 +99,7 @@ class Path:
 
 		self.Branch = []
 
-	def Register( self, path_select, path ):
-		if path_select == 'st_route_path':
-			self.st_route_path.append( path[:] )
-
-		elif path_select == 'st_ld_path':
-			self.st_ld_path.append( path[:] )
-
-		elif path_select == 'st_leaf_path':
-			self.st_leaf_path.append( path[:] )
-
-		elif path_select == 'ld_ld_path':
-			self.ld_ld_path.append( path[:] )
-
-		elif path_select == 'ld_leaf_path':
-			self.ld_leaf_path.append( path[:] )
-
-	def Get( self, path_select ):
+	def Handles( self, path_select ):
 		if path_select == 'st_route_path':
 			return self.st_route_path
 
@@ -55,6 +115,23 @@ class Path:
 		elif path_select == 'ld_leaf_path':
 			return self.ld_leaf_path
 
+	def Register( self, path_select, path ):
+		handles = self.Handles( path_select )
+		if handles is not None:
+			handles.append( self.trie.Intern( path ) )
+
+	def Get( self, path_select ):
+		handles = self.Handles( path_select )
+		if handles is None:
+			return None
+		return [ self.trie.Read( handle ) for handle in handles ]
+
+	def Count( self, path_select ):
+		handles = self.Handles( path_select )
+		if handles is None:
+			return 0
+		return len( handles )
+
 	def Set_BranchStNode( self, index ):
 		self.Branch_St.append( index )
 
@@ -416,19 +493,28 @@ def Explore_Path( am, NodeList ):
 
 	return path
 
-def St_Path_Formatter( paths ):
-
-	for start, chain in enumerate(paths):
-		if start+1 < len(paths):
-			append_no = start+1
-			check_chain = paths[append_no]
-			#print(f"append_no:{append_no} chain:{chain} check_chain:{check_chain}")
-			for check_node in check_chain:
-				if check_node in chain:
-					index = chain.index(check_node)
-					check_chain = chain[0:index]+check_chain
-					paths[append_no] = check_chain
-					break
+def St_Path_Formatter( trie, paths ):
+	"""
+	Splice neighboring store paths (handles of trie, updated in place):
+	a path continues the previous one from the first node they share
+	"""
+	for start in range( len(paths) - 1 ):
+		chain = paths[start]
+		append_no = start+1
+		check_chain = paths[append_no]
+
+		# First position of each node in the chain
+		position = trie.Positions( chain )
+
+		# First node of the check_chain found in the chain
+		index = None
+		for _, check_node in trie.Nodes( check_chain ):
+			if check_node in position:
+				index = position[ check_node ]
+
+		#print(f"append_no:{append_no} chain:{chain} check_chain:{check_chain}")
+		if index is not None:
+			paths[append_no] = trie.Intern( trie.Read( check_chain ), trie.Prefix( chain, index ) )
 
 	return paths
 
@@ -476,11 +562,15 @@ def Get_StNodeIDs(NodeList):
 
 def Flatten_List(nested_list):
 	flattened = []
-	for item in nested_list:
-		if isinstance(item, list):
-			flattened.extend(Flatten_List(item))
-		else:
+	stack = [ iter(nested_list) ]
+	while stack:
+		for item in stack[-1]:
+			if isinstance(item, list):
+				stack.append( iter(item) )
+				break
 			flattened.append(item)
+		else:
+			stack.pop()
 	return flattened
 
 def Get_St_Path( am, NodeList ):
@@ -561,11 +651,12 @@ def Get_St_Ld(paths, NodeList):
 
 	return Paths
 
-def Gen_StLd_Path( NodeList, st_leaves, st_ld_paths ):
+def Gen_StLd_Path( NodeList, st_leaves, st_ld_paths, trie ):
 
 	st_leaves_ = st_leaves
 	match_list = []
-	for check_st_ld_path in st_ld_paths:
+	for st_ld_handle in st_ld_paths:
+		check_st_ld_path = trie.Read( st_ld_handle )
 		for mo, st_leaf_path in enumerate(st_leaves):
 			Mismatch = False
 			if len(st_leaf_path) > len(check_st_ld_path):
@@ -629,88 +720,190 @@ def Gen_StLd_Path( NodeList, st_leaves, st_ld_paths ):
 
 	return Path
 
-def Get_StLd_Path(st_leaf_path, NodeList):
+def Get_StLd_Path( trie, st_leaf_path, NodeList ):
+	"""
+	Store paths cut at their first load (handles of trie, without duplicates)
+	"""
 	Path_ = []
 	for path in st_leaf_path:
-		Path = []
-		LOAD_EXIST = False
-		for path_ in path:
-			node_id = path_
-			Path.append(node_id)
+		# Position of the first load
+		ld_pos = None
+		for pos, node_id in trie.Nodes( path ):
 			mnemonic = Get_Mnemonic( NodeList, int(node_id) )
-			#print(mnemonic)
 			if 'load' in mnemonic[1]:
-				LOAD_EXIST = True
-				break
+				ld_pos = pos
 
-		if LOAD_EXIST:
+		if ld_pos is not None:
+			Path = trie.Prefix( path, ld_pos + 1 )
 			if Path not in Path_:
 				Path_.append(Path)
-				Path = []
 
 	return Path_
 
 def merge(list_a, list_b):
 
-	for item_a in list_a:
-		#print(f"item_a:{item_a}")
-		for index_b, item_b in enumerate(list_b):
-			#print(f"item_b:{item_b}")
-			if len(item_a) == len(item_b):
-				CHECK = False
-				for no in range(len(item_a)):
-					if item_a[no] != item_b[no]:
-						CHECK = True
-						break
-				if not CHECK:
-					list_b.pop(index_b)
-
-	return list_a + list_b
-
-def Gen_Path( am, NodeList, w_path, w_name ):
-
+	# Paths are handles of one trie, equal paths have equal handles
+	#	paths in list_b already in list_a are dropped
+	registered = set( list_a )
+
+	merged = list_a[:]
+	for item_b in list_b:
+		#print(f"item_b:{item_b}")
+		if item_b not in registered:
+			merged.append( item_b )
+
+	return merged
+
+def Count_Paths( am, NodeList ):
+	"""
+	Path Counter (exact)
+
+	Counts paths of every category exactly as Get_Paths extracts them
+	(same pruning, chain splicing and de-duplication),
+	the paths stay handles of the shared trie and no path list is built.
+
+	Returns:
+		{path_type: number of paths}
+		path_type:	'st_root', 'st_leaf', 'st_ld', 'ld_ld', 'ld_leaf'
+	"""
+	_, handles = Get_Path_Handles( am, NodeList )
+	return { path_type: len( path_handles ) for path_type, path_handles in handles.items() }
+
+def Count_DAG_Paths( am, NodeList ):
+	"""
+	DAG-Path Counter (estimate)
+
+	Counts paths of every category in the DAG (edges run from lower to higher
+	node index) by dynamic programming, nothing is explored or enumerated.
+	This is NOT the number of extracted paths: the extractor drops some DAG
+	paths and splices neighboring store chains into paths the DAG does not
+	have, so the count is neither a lower nor an upper bound of Count_Paths.
+		st_root, st_leaf:	store -> LEAF
+		st_ld:		store -> first load
+		ld_ld:		load -> next load
+		ld_leaf:	load -> LEAF without intermediate load
+
+	Returns:
+		{path_type: number of DAG paths}
+	"""
+	TotalNumNodes = len( NodeList )
+
+	# Number of paths from node
+	to_leaf = [ 0 ] * TotalNumNodes
+	to_leaf_wo_ld = [ 0 ] * TotalNumNodes
+	to_ld = [ 0 ] * TotalNumNodes
+
+	for index in range( TotalNumNodes - 1, -1, -1 ):
+		mnemonic = Get_Mnemonic( NodeList, index )
+		if is_LeafNode( mnemonic, index ):
+			to_leaf[ index ] = 1
+			continue
+
+		for dst_idx in PopList( am[ index ][ index+1: ], index+1 ):
+			if dst_idx >= TotalNumNodes:
+				continue
+
+			dst_mnemonic = Get_Mnemonic( NodeList, dst_idx )
+			to_leaf[ index ] += to_leaf[ dst_idx ]
+			if is_LeafNode( dst_mnemonic, dst_idx ):
+				to_leaf_wo_ld[ index ] += 1
+			elif is_LdNode( dst_mnemonic ):
+				to_ld[ index ] += 1
+			else:
+				to_leaf_wo_ld[ index ] += to_leaf_wo_ld[ dst_idx ]
+				to_ld[ index ] += to_ld[ dst_idx ]
+
+	counts = {
+		'st_root': 0,
+		'st_leaf': 0,
+		'st_ld': 0,
+		'ld_ld': 0,
+		'ld_leaf': 0
+	}
+	for index in range( TotalNumNodes ):
+		mnemonic = Get_Mnemonic( NodeList, index )
+		if is_LeafNode( mnemonic, index ):
+			continue
+
+		if is_StNode( mnemonic ):
+			counts['st_root'] += to_leaf[ index ]
+			counts['st_leaf'] += to_leaf[ index ]
+			counts['st_ld'] += to_ld[ index ]
+		elif is_LdNode( mnemonic ):
+			counts['ld_ld'] += to_ld[ index ]
+			counts['ld_leaf'] += to_leaf_wo_ld[ index ]
+
+	return counts
+
+def Get_Path_Handles( am, NodeList ):
+	"""
+	Path Extractor for a Basic Block
+
+	Returns:
+		trie, {path_type: [handle, ...]}
+		path_type:	'st_root', 'st_leaf', 'st_ld', 'ld_ld', 'ld_leaf'
+	"""
 	st_leaf_path = Get_St_Path( am, NodeList )
 	#print(f"st_leaf_path:{st_leaf_path}")
 
 	explored_path = Explore_Path( am, NodeList )
+	trie = explored_path.trie
 
-	st_ld_paths = explored_path.Get( 'st_ld_path' )
-	#print(f"st_ld_paths:{st_ld_paths}")
-	st_ld_paths = St_Path_Formatter(st_ld_paths)
+	st_ld_paths = list( explored_path.Handles( 'st_ld_path' ) )
+	st_ld_paths = St_Path_Formatter( trie, st_ld_paths )
 	#print(f"st_ld_paths:{st_ld_paths}")
 
-	st_leaves = Gen_StLd_Path(NodeList, st_leaf_path, st_ld_paths)
+	st_leaves = Gen_StLd_Path( NodeList, st_leaf_path, st_ld_paths, trie )
+	st_leaves = [ trie.Intern( path ) for path in st_leaves ]
 	#print(f"st_leaves:{st_leaves}")
 
-	st_leaf_paths = explored_path.Get( 'st_leaf_path' )
-	#print(f"st_leaf_paths-0:{st_leaf_paths}")
-	st_leaf_paths = St_Path_Formatter(st_leaf_paths)
-	#print(f"st_leaf_paths-1:{st_leaf_paths}")
-	st_leaf_paths = merge(st_leaf_paths, st_leaves)
-	#print(f"st_leaf_paths-2:{st_leaf_paths}")
+	st_leaf_paths = list( explored_path.Handles( 'st_leaf_path' ) )
+	st_leaf_paths = St_Path_Formatter( trie, st_leaf_paths )
+	st_leaf_paths = merge( st_leaf_paths, st_leaves )
+	#print(f"st_leaf_paths:{st_leaf_paths}")
 
-	st_ld_remained = Get_StLd_Path(st_leaf_paths, NodeList)
+	st_ld_remained = Get_StLd_Path( trie, st_leaf_paths, NodeList )
 	#print(f"st_ld_remained:{st_ld_remained}")
-	
-	st_ld_paths = merge(st_ld_paths, st_ld_remained)
-	#print(f"st_ld_paths:{st_ld_paths}\n")
-
-	w_path_name = w_path+'/'+w_name+"_bpath_st_root.txt"
-	with open(w_path_name, "w") as st_route_path:
-		st_route_path.writelines(map(str, explored_path.Get( 'st_route_path' )))
-
-	w_path_name = w_path+'/'+w_name+"_bpath_st_leaf.txt"
-	with open(w_path_name, "w") as st_leaf_path:
-		st_leaf_path.writelines(map(str, st_leaf_paths ))
 
-	w_path_name = w_path+'/'+w_name+"_bpath_st_ld.txt"
-	with open(w_path_name, "w") as st_ld_path:
-		st_ld_path.writelines(map(str, st_ld_paths))
+	st_ld_paths = merge( st_ld_paths, st_ld_remained )
+	#print(f"st_ld_paths:{st_ld_paths}\n")
 
-	w_path_name = w_path+'/'+w_name+"_bpath_ld_ld.txt"
-	with open(w_path_name, "w") as ld_ld_path:
-		ld_ld_path.writelines(map(str, explored_path.Get( 'ld_ld_path' )))
+	return trie, {
+		'st_root': list( explored_path.Handles( 'st_route_path' ) ),
+		'st_leaf': st_leaf_paths,
+		'st_ld': st_ld_paths,
+		'ld_ld': list( explored_path.Handles( 'ld_ld_path' ) ),
+		'ld_leaf': list( explored_path.Handles( 'ld_leaf_path' ) )
+	}
+
+def Get_Paths( am, NodeList ):
+	"""
+	Path Extractor for a Basic Block, paths are materialized for writing
+
+	Returns:
+		{path_type: [[node_id, ...], ...]}
+		path_type:	'st_root', 'st_leaf', 'st_ld', 'ld_ld', 'ld_leaf'
+	"""
+	trie, handles = Get_Path_Handles( am, NodeList )
+	return { path_type: [ trie.Read( handle ) for handle in path_handles ] for path_type, path_handles in handles.items() }
+
+def Gen_Path( am, NodeList, w_path, w_name, count=None ):
+	"""
+	Write Paths of a Basic Block to legacy "_bpath_*.txt" files
+
+		count:	"exact" returns Count_Paths, "dag" returns Count_DAG_Paths,
+				no path file is written
+	"""
+	if count == "exact":
+		return Count_Paths( am, NodeList )
+	if count == "dag":
+		return Count_DAG_Paths( am, NodeList )
+
+	paths = Get_Paths( am, NodeList )
+
+	for path_type, block_paths in paths.items():
+		w_path_name = w_path+'/'+w_name+"_bpath_"+path_type+".txt"
+		with open(w_path_name, "w") as path_file:
+			path_file.writelines(map(str, block_paths))
 
-	w_path_name = w_path+'/'+w_name+"_bpath_ld_leaf.txt"
-	with open(w_path_name, "w") as ld_leaf_path:
-		ld_leaf_path.writelines(map(str, explored_path.Get( 'ld_leaf_path' )))
+	return paths
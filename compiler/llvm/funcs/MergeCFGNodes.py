@@ -7,6 +7,7 @@
 ##	version 3.0
 ##
 ##################################################################
+import re
 
 
 def ExtractBBs( file_path, file_name ):
@@ -89,120 +90,151 @@ def GetLabelInfo( basic_blocks ):
     return label_info
 
 
+def FindRoot( parent, index ):
+    """
+    Union-Find: Root (Representative) of Set with Path Compression
+    """
+    root = index
+    while parent[root] != root:
+        root = parent[root]
+
+    while parent[index] != root:
+        parent[index], index = root, parent[index]
+
+    return root
+
+
+def GetPreds( label_info, label_to_block ):
+    """
+    Predecessor Map
+        preds[block_index] = [pred_block_index, ...]
+    """
+    preds = [ [] for _ in label_info ]
+    for index, (_, target_labels) in enumerate(label_info):
+        for target_label in target_labels:
+            if target_label in label_to_block:
+                preds[ label_to_block[ target_label ] ].append(index)
+
+    return preds
+
+
+def RetargetBranch( branch_instr, target_of ):
+    """
+    Rewrite Branch Targets
+        target_of: {label: new_label}
+    """
+    return re.sub(r'label %([-\w.$]+)',
+                  lambda m: 'label %'+target_of.get(m.group(1), m.group(1)),
+                  branch_instr)
+
+
+def ExpandPreds( label_line, removed_preds ):
+    """
+    Predecessor Labels in "; preds = ..." Comment of Label Line,
+    removed predecessors are replaced with their own predecessors
+        removed_preds: {removed_label: [pred_label, ...]}, pred_label has '%' prefix
+    """
+    pred_labels = []
+    if '; preds =' not in label_line:
+        return pred_labels
+
+    for pred in label_line.split('; preds =', 1)[1].split(','):
+        pred = pred.strip()
+        for new_pred in removed_preds.get(pred[1:], [pred]):
+            if new_pred and new_pred not in pred_labels:
+                pred_labels.append(new_pred)
+
+    return pred_labels
+
+
+def RewritePreds( label_line, removed_preds ):
+    """
+    Rewrite "; preds = ..." Comment of Label Line
+    """
+    if '; preds =' not in label_line:
+        return label_line
+
+    head = label_line.split('; preds =', 1)[0]
+    return head+'; preds = '+', '.join(ExpandPreds(label_line, removed_preds))+'\n'
+
+
 def CFGNodeMerger( r_file_path, r_file_name ):
     """
     Node Merger for Control-Flow Graph
+
+    Removes branch-only basic blocks (label and unconditional br),
+    every branch to such a block is retargeted to the end of its chain
     """
     bblocks, basic_blocks = ExtractBBs(r_file_path, r_file_name)
 
     label_info = GetLabelInfo(basic_blocks)
     #print(f"label_info:{label_info}")
 
-    hit_count = 0
+    num_bblocks = len(label_info)
+    label_to_block = { label: index for index, (label, _) in enumerate(label_info) }
+    preds = GetPreds(label_info, label_to_block)
+
+    # Collapse Chains of Branch-only Blocks
+    parent = list(range(num_bblocks))
+    removed = [ False ] * num_bblocks
     for bb_index, basic_block in enumerate(basic_blocks):
-        #print(f"basic_block:{basic_block}")
         num_instrs = basic_block[2]
-        find = False
-        if num_instrs == 2 and len(label_info[bb_index][1]) < 2:
-            find = True
-            bb_label = label_info[bb_index][0]
-            print(f"br only basic block label:{bb_label} bblock-no:{bb_index}")
-
-            for bb_chk_index, bblock in enumerate(bblocks):
-                label = label_info[bb_chk_index][0]
-                if label == bb_label:
-                    target_labels = label_info[bb_chk_index][1]
-                    label_t = None
-                    label_f = None
-                    if len(target_labels)>2:
-                        label_t = target_labels[1]
-                        label_f = target_labels[2]
-                    elif len(target_labels)>1:
-                        label_t = target_labels[0]
-                        label_f = target_labels[1]
-                    elif len(target_labels)>0:
-                        label_t = target_labels[0]
-
-                    print(f"target_labels:{target_labels} at bblock-no:{bb_chk_index} label_t:{label_t} label_f:{label_f}")
-
-                    if label_t is not None:
-                        t_index_t = 0
-                        t_label = ""
-                        for index, chk_label in enumerate(label_info):
-                            if label_t in chk_label[0]:
-                                t_label = chk_label[1]
-                                t_index_t = index
-                                #print(f"t_index_t:{t_index_t}")
-                                break
-
-                        index_t = 0
-                        pred_label = ""
-                        for index, chk_label in enumerate(label_info):
-                            if bb_label in chk_label[1]:
-                                pred_label = chk_label[0]
-                                if pred_label != 'entry':
-                                    pred_label = '%'+pred_label
-                                index_t = index
-                                #print(f"index_t:{index_t} pred_label:{pred_label}")
-                                break
-
-                        bblocks[t_index_t-hit_count][0] = bblocks[t_index_t-hit_count][0].replace('%', '').replace(bb_label, " "+pred_label).replace('\n', '')
-                        #print(f"bblocks[t_index_t][0]:{bblocks[t_index_t][0]}")
-
-                        target_label = '%'+label_t
-                        label = '%'+bb_label
-                        print(f"replace label:{label} with target_label:{target_label} at bblock-no:{index}")
-                        for index, labels in enumerate(label_info):
-                            chk_label = labels[1]
-                            if bb_label in chk_label:
-                                bblocks[index][len(bblocks[index])-2] = bblocks[index][len(bblocks[index])-2].replace(label, target_label)
-                                #print(f"bblock:{bblocks[index]}  label:{label}  target_label:{target_label}")
-                                bblocks.pop(bb_chk_index-hit_count)
-                                hit_count += 1
-
-                    if label_f is not None:
-                        f_index_t = 0
-                        f_label = ""
-                        for index, chk_label in enumerate(label_info):
-                            if label_t in chk_label[0]:
-                                f_label = chk_label[1]
-                                f_index_t = index
-                                #print(f"f_index_t:{f_index_t}")
-                                break
-
-                        index_t = 0
-                        pred_label = ""
-                        for index, chk_label in enumerate(label_info):
-                            if bb_label in chk_label[1]:
-                                pred_label = chk_label[0]
-                                if pred_label != 'entry':
-                                    pred_label = '%'+pred_label
-                                index_t = index
-                                #print(f"index_t:{index_t} pred_label:{pred_label}")
-                                break
-
-                        bblocks[f_index_t][0] = bblocks[f_index_t][0].replace('%', '').replace(bb_label, " "+pred_label)
-                        #print(f"bblocks[f_index_t][0]:{bblocks[f_index_t][0]}")
-
-                        target_label = '%'+label_f
-                        label = '%'+bb_label
-                        print(f"replace label:{label} with target_label:{target_label} at bblock-no:{index}")
-                        for index, labels in enumerate(label_info):
-                            chk_label = labels[1]
-                            if bb_label in chk_label:
-                                bblocks[index][len(bblocks[index])-2] = bblocks[index][len(bblocks[index])-2].replace(label, target_label)
-                                #print(f"bblock:{bblocks[index]}  label:{label}  target_label:{target_label}")
-                                bblocks.pop(bb_chk_index-hit_count)
-                                hit_count += 1
-
-                    print("\n")
-        if not find and bb_index < len(bblocks):
-            bblocks[bb_index].append('\n')
-
+        target_labels = label_info[bb_index][1]
+        if num_instrs != 2 or len(target_labels) != 1 or target_labels[0] not in label_to_block:
+            continue
+
+        bb_label = label_info[bb_index][0]
+        root = FindRoot(parent, label_to_block[ target_labels[0] ])
+        if root == bb_index:
+            # self loop (chain closed to this block) is kept
+            continue
+
+        print(f"br only basic block label:{bb_label} bblock-no:{bb_index}")
+        parent[bb_index] = root
+        removed[bb_index] = True
+
+    target_of = {}
+    for bb_index in range(num_bblocks):
+        if removed[bb_index]:
+            target_of[ label_info[bb_index][0] ] = label_info[ FindRoot(parent, bb_index) ][0]
+
+    # Predecessors of Removed Blocks seen from Kept Blocks (for preds comments)
+    removed_preds = {}
+    for bb_index in range(num_bblocks):
+        if not removed[bb_index] or label_info[bb_index][0] in removed_preds:
+            continue
+
+        stack = [ bb_index ]
+        while stack:
+            index = stack[-1]
+            pending = [ pred for pred in preds[index]
+                        if removed[pred] and label_info[pred][0] not in removed_preds ]
+            if pending:
+                stack.extend(pending)
+                continue
+
+            stack.pop()
+            label = label_info[index][0]
+            if label in removed_preds:
+                continue
+
+            removed_preds[label] = ExpandPreds(bblocks[index][0], removed_preds)
+
+    # Retarget Branches and Rewrite preds Comments in One Pass
     bblocks_ = []
-    for bblock in bblocks:
-        if len(bblock[-1]) > 2:
-            bblock.append('\n')
+    for bb_index, bblock in enumerate(bblocks):
+        if bb_index < num_bblocks and removed[bb_index]:
+            continue
+
+        if bb_index < num_bblocks:
+            if any( target_label in target_of for target_label in label_info[bb_index][1] ):
+                bblock[-1] = RetargetBranch(bblock[-1], target_of)
+                print(f"retarget branch:{bblock[-1].strip()} at bblock-no:{bb_index}")
+
+            if any( label_info[pred][0] in removed_preds for pred in preds[bb_index] ):
+                bblock[0] = RewritePreds(bblock[0], removed_preds)
+
+        bblock.append('\n')
         bblocks_.append(bblock)
 
     return bblocks_
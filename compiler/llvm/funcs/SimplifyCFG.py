@@ -0,0 +1,249 @@
+##################################################################
+##
+##	ElectronNest_CP
+##	Copyright (C) 2024  Shigeyuki TAKANO
+##
+##  GNU AFFERO GENERAL PUBLIC LICENSE
+##	version 3.0
+##
+##################################################################
+import re
+
+
+DEBUG = False
+
+def Label( bblock ):
+    """
+    Branch Label of Basic Block (br_t/br_f format)
+    """
+    return "label:<"+bblock.name+">"
+
+
+def Target( label ):
+    """
+    Normalized Branch Label ("br label %5, !llvm.loop !6" is parsed as "label:<5,>")
+    """
+    if label is None:
+        return None
+    return label.replace(',', '')
+
+
+def GetSuccs( bblock ):
+    """
+    Successor Labels of Basic Block
+    """
+    if bblock.num_instrs == 0:
+        return []
+
+    instr = bblock.instrs[-1]
+    br_t = Target(instr.br_t)
+    br_f = Target(instr.br_f)
+    if instr.opcode == "jmp":
+        return [ br_t ]
+    elif instr.opcode == "br":
+        if br_t == br_f:
+            return [ br_t ]
+        return [ br_t, br_f ]
+
+    return []
+
+
+def HasPhi( bblock ):
+    """
+    Check Basic Block having Phi Instruction
+    """
+    for instr in bblock.instrs:
+        if instr.nemonic is not None and " phi " in instr.nemonic:
+            return True
+
+    return False
+
+
+def IsSimplifiable( func ):
+    """
+    Check Function is Handled by This Pass
+        every terminator must be br/jmp/ret (switch is not handled)
+    """
+    for bblock in func.bblocks:
+        if bblock.num_instrs != len(bblock.instrs) or bblock.num_instrs == 0:
+            return False
+
+        for instr in bblock.instrs:
+            if getattr(instr, 'sw', False):
+                return False
+
+        if bblock.instrs[-1].opcode not in ("jmp", "br", "ret"):
+            return False
+
+    return True
+
+
+def Retarget( instr, target_of ):
+    """
+    Rewrite Branch Targets of Terminator
+        target_of: {old_label: new_label}, label is br_t/br_f format
+    """
+    old_br_t = Target(instr.br_t)
+    old_br_f = Target(instr.br_f)
+    if old_br_t in target_of:
+        instr.br_t = target_of[ old_br_t ]
+    if old_br_f in target_of:
+        instr.br_f = target_of[ old_br_f ]
+
+    if instr.nemonic is not None:
+        names = {}
+        for old_label in (old_br_t, old_br_f):
+            new_label = target_of.get(old_label, old_label)
+            if old_label != new_label:
+                names[ old_label[7:-1] ] = new_label[7:-1]
+
+        instr.nemonic = re.sub(r'label %([-\w.$]+)',
+                               lambda m: 'label %'+names.get(m.group(1), m.group(1)),
+                               instr.nemonic)
+
+
+def JumpThreading( func ):
+    """
+    Jump Threading through Jump-only Basic Blocks
+        branch to a block having only "br label %N" is redirected to its final target
+    """
+    label_to_block = { Label(bblock): bblock for bblock in func.bblocks }
+
+    # Forwarding Label of Jump-only Blocks
+    forward = {}
+    for b_index, bblock in enumerate(func.bblocks):
+        if b_index == 0 or bblock.num_instrs != 1 or bblock.instrs[0].opcode != "jmp":
+            continue
+
+        target = Target(bblock.instrs[0].br_t)
+        if target in label_to_block and target != Label(bblock) and not HasPhi(label_to_block[ target ]):
+            forward[ Label(bblock) ] = target
+
+    # Final Target of every Chain (chain closed as loop is not forwarded)
+    target_of = {}
+    for label in forward:
+        chain = [ label ]
+        target = forward[ label ]
+        while target in forward and target not in chain and target not in target_of:
+            chain.append(target)
+            target = forward[ target ]
+
+        if target in chain:
+            continue
+
+        target = target_of.get(target, target)
+        for chain_label in chain:
+            target_of[ chain_label ] = target
+
+    num_threaded = 0
+    for bblock in func.bblocks:
+        if Label(bblock) in target_of:
+            # becomes unreachable
+            continue
+
+        if any( succ in target_of for succ in GetSuccs(bblock) ):
+            Retarget(bblock.instrs[-1], target_of)
+            num_threaded += 1
+
+    return num_threaded
+
+
+def MergeBlocks( func ):
+    """
+    Merge Basic Block with its Single Successor
+        successor must have this block as its only predecessor
+    """
+    num_merged = 0
+    label_to_block = { Label(bblock): bblock for bblock in func.bblocks }
+
+    preds = { Label(bblock): [] for bblock in func.bblocks }
+    for bblock in func.bblocks:
+        for succ in GetSuccs(bblock):
+            if succ in preds:
+                preds[ succ ].append(Label(bblock))
+
+    merged = set()
+    for bblock in func.bblocks:
+        if Label(bblock) in merged:
+            continue
+
+        while bblock.instrs[-1].opcode == "jmp":
+            succ_label = Target(bblock.instrs[-1].br_t)
+            if succ_label not in label_to_block or succ_label == Label(bblock) or succ_label in merged:
+                break
+
+            succ = label_to_block[ succ_label ]
+            if succ is func.bblocks[0] or len(preds[ succ_label ]) != 1 or HasPhi(succ):
+                break
+
+            # successor's successors must not name the successor in phi
+            if any( HasPhi(label_to_block[ label ]) for label in GetSuccs(succ) if label in label_to_block ):
+                break
+
+            if DEBUG:
+                print(f"merge bblock:{succ.name} into bblock:{bblock.name}")
+
+            bblock.instrs = bblock.instrs[:-1] + succ.instrs
+            bblock.num_instrs = len(bblock.instrs)
+            for label in GetSuccs(bblock):
+                if label in preds:
+                    preds[ label ] = [ Label(bblock) if pred == succ_label else pred for pred in preds[ label ] ]
+
+            merged.add(succ_label)
+            num_merged += 1
+
+    func.bblocks = [ bblock for bblock in func.bblocks if Label(bblock) not in merged ]
+    func.num_bblocks = len(func.bblocks)
+
+    return num_merged
+
+
+def RemoveUnreachable( func ):
+    """
+    Remove Basic Blocks Unreachable from Entry Block
+    """
+    if not func.bblocks:
+        return 0
+
+    label_to_block = { Label(bblock): bblock for bblock in func.bblocks }
+
+    reached = { Label(func.bblocks[0]) }
+    stack = [ func.bblocks[0] ]
+    while stack:
+        bblock = stack.pop()
+        for succ in GetSuccs(bblock):
+            if succ in label_to_block and succ not in reached:
+                reached.add(succ)
+                stack.append(label_to_block[ succ ])
+
+    num_bblocks = func.num_bblocks
+    func.bblocks = [ bblock for bblock in func.bblocks if Label(bblock) in reached ]
+    func.num_bblocks = len(func.bblocks)
+
+    return num_bblocks - func.num_bblocks
+
+
+def SimplifyCFG( prog ):
+    """
+    Control-Flow Graph Simplification on Parsed Program (program class)
+
+    Works on the object given by IR_Parser and modifies it in place,
+    the result feeds Gen_CFG/Gen_DFG directly without writing LLVM IR file:
+        1. jump threading through jump-only blocks
+        2. removing unreachable blocks
+        3. merging a block with its single successor
+    """
+    for func in prog.funcs:
+        if not IsSimplifiable(func):
+            print(f"Skip CFG Simplification: Function {func.name}")
+            continue
+
+        num_bblocks = func.num_bblocks
+        num_threaded = JumpThreading(func)
+        num_removed = RemoveUnreachable(func)
+        num_merged = MergeBlocks(func)
+
+        print(f"Function {func.name}: {num_bblocks} -> {func.num_bblocks} blocks "
+              f"(threaded:{num_threaded} removed:{num_removed} merged:{num_merged})")
+
+    return prog
@@ -11,6 +11,7 @@ import utils.IRPaser as irparser
 import utils.FileUtils as progfile
 import funcs.Gen_DFG as Gen_DFG
 import funcs.Gen_CFG as Gen_CFG
+import funcs.SimplifyCFG as SimplifyCFG
 import argparse
 
 
@@ -27,6 +28,7 @@ parser.add_argument('--block',		help='block: yes/no',			default='yes')
 parser.add_argument('--nm_mode',	help='mnemonic mode: yes/no',	default='yes')
 parser.add_argument('--unique_id',  help='unique id: yes/no',		default='yes')
 parser.add_argument('--parse',		help='parsing IR: yes/no',		default='yes')
+parser.add_argument('--simplify',	help='simplify CFG: yes/no',	default='no')
 
 args	= parser.parse_args()
 
@@ -63,6 +65,9 @@ else:
 
 
 prog	= irparser.IR_Parser( r_file_path, r_file_name )
+if 'yes' == args.simplify:
+	SimplifyCFG.SimplifyCFG( prog )
+
 if 'yes' == args.parse:
 	progfile.ProgWriter( prog, w_file_path, w_file_name )
 
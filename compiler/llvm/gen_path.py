@@ -21,6 +21,8 @@ parser = argparse.ArgumentParser(description="args")
 parser.add_argument('--src_path',   help='source file path',    default='.')
 parser.add_argument('--src_name',   help='source file name',    required=True)
 parser.add_argument('--w_path',     help='gened file path',     default='.')
+parser.add_argument('--count',      help='count paths only: no/exact/dag', default='no')
+parser.add_argument('--path_format', help='path output: db/txt', default='db')
 
 args = parser.parse_args()
 
@@ -28,12 +30,18 @@ r_file_path = args.src_path
 r_file_name = args.src_name
 w_file_path = args.w_path
 
+COUNT_ONLY = args.count in ( 'exact', 'dag' )
+PATH_DB    = 'db' == args.path_format and not COUNT_ONLY
+
 prog = fileutils.ProgReader( r_file_path=r_file_path, r_file_name=r_file_name )
 
 
 for func in prog.funcs:
     name_func = func.name.replace('\n', '')
 
+    if PATH_DB:
+        path_db = fileutils.PathDBWriter( w_file_path, name_func+"_bblock" )
+
     for bblock in func.bblocks:
         name_bblock = bblock.name.replace('\n', '')
         r_file_name = name_func+"_bblock_"+name_bblock
@@ -43,4 +51,13 @@ for func in prog.funcs:
         NodeList = graphutils.ReadNodeList(r_file_name)
 
         w_file_name = name_func+"_bblock_"+name_bblock
-        genpath.Gen_Path( am, NodeList, w_file_path, w_file_name )
\ No newline at end of file
+        if COUNT_ONLY:
+            counts = genpath.Gen_Path( am, NodeList, w_file_path, w_file_name, count=args.count )
+            print(f"  Path Counts ({args.count}): {counts}")
+        elif PATH_DB:
+            path_db.Write( name_bblock, genpath.Get_Paths( am, NodeList ) )
+        else:
+            genpath.Gen_Path( am, NodeList, w_file_path, w_file_name )
+
+    if PATH_DB:
+        path_db.Close()
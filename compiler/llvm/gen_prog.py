@@ -10,9 +10,13 @@
 import os
 import sys
 import argparse
+import json
+import shutil
+import subprocess
 import funcs.Analyzer as analyzis
 import funcs.Gen_AGU as gen_agu_prog
 import funcs.Gen_DataPath as gen_datapath_prog
+import utils.FileUtils as fileutils
 
 def verify_paths(src_path, w_path):
     """Verify input/output paths exist"""
@@ -46,6 +50,32 @@ def verify_files(src_path, src_name):
 
     return True
 
+def parse_capacity(text):
+    """Parse on-chip capacity in words: "1024" for every array or "a=256,b=256,c=512" """
+    capacity = {}
+    if not text:
+        return capacity
+
+    for item in text.split(','):
+        name, _, words = item.strip().rpartition('=')
+        capacity[name or '*'] = int(words)
+
+    return capacity
+
+def verify_ir(path):
+    """Assemble a generated LLVM IR file with llvm-as (typed pointers), return error message or None"""
+    llvm_as = shutil.which('llvm-as')
+    if llvm_as is None:
+        print(f"Warning: llvm-as not found, {path} is not verified")
+        return None
+
+    result = subprocess.run([llvm_as, '-opaque-pointers=0', path, '-o', os.devnull], capture_output=True, text=True)
+    if 'Unknown command line argument' in result.stderr:
+        # typed pointers are the default before LLVM 15
+        result = subprocess.run([llvm_as, path, '-o', os.devnull], capture_output=True, text=True)
+
+    return result.stderr.strip() if result.returncode != 0 else None
+
 if __name__ == "__main__":
     """Main entry point"""
     try:
@@ -53,9 +83,20 @@ if __name__ == "__main__":
         parser = argparse.ArgumentParser(description="AGU Generator for ElectronNest")
         parser.add_argument('--src_path', help='Source file path', default='.')
         parser.add_argument('--src_name', help='Source file name', required=True)
+        parser.add_argument('--src_ir', help='LLVM IR file name in src_path, default: src_name.ll', default=None)
         parser.add_argument('--w_path', help='Output file path', default='.')
         parser.add_argument('--w_name', help='Output file name prefix', required=True)
         parser.add_argument('--gen_path', help='agu/datapath/both', default='agu')
+        parser.add_argument('--cache_stats', help='Analysis cache statistics file name (JSON)', default=None)
+        parser.add_argument('--workers', help='Number of processes for basic block analysis', type=int, default=1)
+        parser.add_argument('--result_cache', help='Reuse analysis result cached in w_path: yes/no', default='no')
+        parser.add_argument('--agu_addr', help='AGU address generation: gep/incremental', default='gep')
+        parser.add_argument('--agu_coalesce', help='Coalesce perfectly nested AGU loops into one counter: yes/no', default='no')
+        parser.add_argument('--agu_tile_capacity', help='On-chip capacity in words for tiled AGU: N or array=N,...', default=None)
+        parser.add_argument('--agu_double_buffer', help='Double-buffered (ping-pong) tiles in AGU and datapath: yes/no', default='no')
+        parser.add_argument('--agu_backend', help='AGU program: ir (LLVM IR) or descriptor (CRAM R-Config words, IR for arrays not fitting)', default='ir')
+        parser.add_argument('--agu_shared', help='Single AGU with one loop skeleton and an address stream per array for arrays sharing a loop nest: yes/no', default='no')
+        parser.add_argument('--verify_ir', help='Check generated AGU LLVM IR with llvm-as: yes/no', default='yes')
         args = parser.parse_args()
 
         if not verify_paths(args.src_path, args.w_path):
@@ -78,25 +119,84 @@ if __name__ == "__main__":
             GEN_PATH = False
 
         if GEN_AGU or GEN_PATH:
+            # ループの境界と配列のサイズを読むLLVM IRファイル (分析とAGU生成で共通)
+            ir_file = fileutils.IRFileName(args.src_path, args.src_name, args.src_ir)
+            if ir_file is None:
+                print("Error: LLVM IR file is required, give it by --src_ir")
+                sys.exit(1)
+
             # パターン分析
-            analyzer = analyzis.Analyzer(args.src_path, args.src_name)
-            array_patterns, IndexExpression = analyzer.analyze()
+            if args.result_cache == 'yes':
+                # 入力ファイルが変わらなければ前回の分析結果を再利用 (Analyzerは構築しない)
+                result_cache_file = os.path.join(args.w_path, f"{args.w_name}_analysis.pkl")
+                array_patterns, IndexExpression, analyzer = analyzis.analyze_cached(
+                    result_cache_file, args.src_path, args.src_name, ir_file=ir_file, num_workers=args.workers)
+            else:
+                analyzer = analyzis.Analyzer(args.src_path, args.src_name, num_workers=args.workers, ir_file=ir_file)
+                array_patterns, IndexExpression = analyzer.analyze()
+
+            if args.cache_stats:
+                if analyzer is not None:
+                    analyzer.dump_cache_stats(os.path.join(args.w_path, args.cache_stats))
+                else:
+                    print("Analysis result is loaded from cache, no cache statistics")
 
         if GEN_AGU:
             # AGUプログラム生成
             agu_generator = gen_agu_prog.AGUGenerator(
-                array_patterns, args.src_path, args.src_name, IndexExpression
+                array_patterns, args.src_path, args.src_name, IndexExpression,
+                ir_file=ir_file,
+                addr_mode=args.agu_addr,
+                coalesce=(args.agu_coalesce == 'yes'),
+                tile_capacity=parse_capacity(args.agu_tile_capacity),
+                double_buffer=(args.agu_double_buffer == 'yes'),
+                shared=(args.agu_shared == 'yes'),
+                backend=args.agu_backend
             )
             agu_code = agu_generator.generate()
 
             # AGUコードの出力
             for array_name, program in agu_code.items():
+                if 'words' in program:
+                    # CRAMのR-Config語 (32-bit, リトルエンディアン)
+                    w_path = os.path.join(args.w_path, f"{args.w_name}_{array_name}_agu.bin")
+                    with open(w_path, 'wb') as f:
+                        f.write(b''.join(word.to_bytes(4, 'little') for word in program['words']))
+                    continue
+
                 w_file_name = f"{args.w_name}_{array_name}_agu.ll"
                 w_path = os.path.join(args.w_path, w_file_name)
                 with open(w_path, 'w') as f:
                     if isinstance(program.get('code'), list):
                         f.write('\n'.join(program['code']))
 
+                if args.verify_ir == 'yes':
+                    error = verify_ir(w_path)
+                    if error is not None:
+                        print(f"Error: {w_file_name} is not valid LLVM IR: {error}")
+                        sys.exit(1)
+
+            descriptor_report = {
+                array_name: program['structure']['descriptors']
+                for array_name, program in agu_code.items()
+                if 'descriptors' in program.get('structure', {})
+            }
+            if descriptor_report:
+                with open(os.path.join(args.w_path, f"{args.w_name}_descriptors.json"), 'w') as f:
+                    json.dump(descriptor_report, f, indent=2)
+
+            # タイル化による外部メモリ転送量の見積もり
+            tiling_report = {
+                array_name: program['structure']['tiling']
+                for array_name, program in agu_code.items()
+                if 'tiling' in program.get('structure', {})
+            }
+            # タイル化しなかった配列
+            tiling_report.update(agu_generator.untiled)
+            if tiling_report:
+                with open(os.path.join(args.w_path, f"{args.w_name}_tiling.json"), 'w') as f:
+                    json.dump(tiling_report, f, indent=2)
+
             print("AGU Code generation completed successfully")
 
         if GEN_PATH:
@@ -105,7 +205,8 @@ if __name__ == "__main__":
                 array_patterns,
                 array_patterns.get('compute_paths', {}),
                 args.src_path,
-                args.src_name
+                args.src_name,
+                handshakes=agu_generator.handshakes if GEN_AGU else None
             )
             datapath_code = datapath_generator.ComputeDataPath()
 
@@ -0,0 +1,306 @@
+##################################################################
+##
+##	ElectronNest_CP
+##	Copyright (C) 2024  Shigeyuki TAKANO
+##
+##  GNU AFFERO GENERAL PUBLIC LICENSE
+##	version 3.0
+##
+##################################################################
+import re
+
+
+# Integer Literal Operand
+INT_PATTERN = re.compile(r'^-?\d+$')
+
+# Value Casts Folded Transparently
+CAST_OPCODES = ( "sext", "zext", "trunc" )
+
+
+class AffineExpr:
+    """
+    Affine Expression: const + sum( coeff_k * var_k )
+
+    Arguments
+        const:  constant term
+        coeffs: {variable: coefficient}
+                a variable is an induction variable, named by its stack slot
+                (-O0 code loads it from alloca) or by its register (phi)
+    """
+    __slots__ = ( 'const', 'coeffs' )
+
+    def __init__( self, const=0, coeffs=None ):
+        self.const = const
+        self.coeffs = { var: coeff for var, coeff in (coeffs or {}).items() if coeff != 0 }
+
+    @staticmethod
+    def Var( var ):
+        return AffineExpr(0, { var: 1 })
+
+    def IsConst( self ):
+        return not self.coeffs
+
+    def Coeff( self, var ):
+        """
+        Coefficient (stride in elements) of Variable
+        """
+        return self.coeffs.get(var, 0)
+
+    def Vars( self ):
+        return sorted(self.coeffs)
+
+    def Add( self, other ):
+        coeffs = dict(self.coeffs)
+        for var, coeff in other.coeffs.items():
+            coeffs[var] = coeffs.get(var, 0) + coeff
+        return AffineExpr(self.const + other.const, coeffs)
+
+    def Scale( self, factor ):
+        return AffineExpr(self.const * factor, { var: coeff * factor for var, coeff in self.coeffs.items() })
+
+    def Sub( self, other ):
+        return self.Add(other.Scale(-1))
+
+    def Rename( self, names ):
+        """
+        Rename Variables ({old: new}), coefficients of merged variables are summed
+        """
+        expr = AffineExpr(self.const)
+        for var, coeff in self.coeffs.items():
+            expr = expr.Add(AffineExpr.Var(names.get(var, var)).Scale(coeff))
+        return expr
+
+    def Mul( self, other ):
+        """
+        Product, None when both sides have variables (not affine)
+        """
+        if other.IsConst():
+            return self.Scale(other.const)
+        if self.IsConst():
+            return other.Scale(self.const)
+        return None
+
+    def __eq__( self, other ):
+        return isinstance(other, AffineExpr) and self.const == other.const and self.coeffs == other.coeffs
+
+    def __hash__( self ):
+        return hash((self.const, tuple(sorted(self.coeffs.items()))))
+
+    def __getstate__( self ):
+        return ( self.const, self.coeffs )
+
+    def __setstate__( self, state ):
+        self.const, self.coeffs = state
+
+    def __repr__( self ):
+        terms = []
+        for var in self.Vars():
+            coeff = self.coeffs[ var ]
+            terms.append(var if coeff == 1 else f"{coeff}*{var}")
+        if self.const or not terms:
+            terms.append(str(self.const))
+        return " + ".join(terms)
+
+
+def NodeDefs( node_tokens ):
+    """
+    Definition Table of Node List
+
+    Arguments
+        node_tokens:    token lists of node list rows
+                        [node_id, opcode_suffix, dst, operand, ...]
+
+    Returns
+        {dst: (opcode, suffix, operands)}
+        operands are listed in reverse order of LLVM IR (as node list does)
+    """
+    defs = {}
+    for tokens in node_tokens:
+        if len(tokens) < 3 or tokens[2] == "None" or tokens[-1] == "LEAF":
+            continue
+
+        opcode, _, suffix = tokens[1].partition('_')
+        defs.setdefault(tokens[2], ( opcode, suffix, tokens[3:] ))
+
+    return defs
+
+
+def GEPBase( suffix ):
+    """
+    Base Pointer of getelementptr ("getelementptr_@a_29" has suffix "@a_29")
+    """
+    return suffix.rsplit('_', 1)[0]
+
+
+def FoldRegister( defs, reg, visiting=None ):
+    """
+    Fold Register into Affine Expression
+
+    Arguments
+        defs:   definition table by NodeDefs
+        reg:    register or integer literal
+
+    Returns
+        AffineExpr, or None when the value is not affine
+        (product of variables, value loaded from memory, unknown opcode)
+    """
+    if INT_PATTERN.match(reg):
+        return AffineExpr(int(reg))
+
+    if reg not in defs:
+        # defined out of the block (phi induction variable, argument)
+        return AffineExpr.Var(reg) if reg.startswith('%') else None
+
+    visiting = visiting if visiting is not None else set()
+    if reg in visiting:
+        return None
+    visiting.add(reg)
+
+    opcode, _, operands = defs[ reg ]
+    # operands are in reverse order of LLVM IR
+    operands = operands[::-1]
+
+    if opcode == "load":
+        slot = operands[0] if operands else None
+        if slot is None or slot in defs:
+            # load from computed address, not an induction variable
+            return None
+        return AffineExpr.Var(slot)
+
+    if opcode in CAST_OPCODES:
+        return FoldRegister(defs, operands[0], visiting) if operands else None
+
+    if opcode not in ( "add", "sub", "mul", "shl" ) or len(operands) != 2:
+        return None
+
+    lhs = FoldRegister(defs, operands[0], visiting)
+    rhs = FoldRegister(defs, operands[1], visiting)
+    if lhs is None or rhs is None:
+        return None
+
+    if opcode == "add":
+        return lhs.Add(rhs)
+    elif opcode == "sub":
+        return lhs.Sub(rhs)
+    elif opcode == "mul":
+        return lhs.Mul(rhs)
+    elif rhs.IsConst() and 0 <= rhs.const < 64:
+        return lhs.Scale(1 << rhs.const)
+
+    return None
+
+
+def GEPSubscripts( defs, reg ):
+    """
+    Subscripts of getelementptr Chain
+
+    Arguments
+        defs:   definition table by NodeDefs
+        reg:    address register (terminal getelementptr)
+
+    Returns
+        (array name, [AffineExpr or None, ...]) from outermost dimension
+        leading zero index of pointer-to-array getelementptr is not listed in node list
+    """
+    subscripts = []
+    while reg in defs and defs[ reg ][0] == "getelementptr":
+        _, suffix, operands = defs[ reg ]
+        base = GEPBase(suffix)
+        indices = [ operand for operand in operands[::-1] if operand != base ]
+        subscripts = [ FoldRegister(defs, index) for index in indices ] + subscripts
+        reg = base
+
+    return reg.lstrip('@'), subscripts
+
+
+def Linearize( subscripts, dims ):
+    """
+    Element Offset of Subscripts in Row-Major Array
+
+    Arguments
+        subscripts: [AffineExpr, ...] from outermost dimension
+        dims:       [size, ...] from outermost dimension
+
+    Returns
+        AffineExpr, or None when a subscript is not affine or dims are unknown
+    """
+    if not subscripts or len(dims) < len(subscripts) or any( subscript is None for subscript in subscripts ):
+        return None
+    if any( size <= 0 for size in dims ):
+        return None
+
+    # subscripts may address a sub-array (fewer subscripts than dims)
+    stride = 1
+    for size in dims[len(subscripts):]:
+        stride *= size
+
+    offset = AffineExpr()
+    for dim in range(len(subscripts)-1, -1, -1):
+        offset = offset.Add(subscripts[ dim ].Scale(stride))
+        stride *= dims[ dim ]
+
+    return offset
+
+
+def ParseAffine( text ):
+    """
+    Parse Affine Expression in AffineExpr Format ("32*%i + %j + -1", "2*i - 1")
+
+    Returns
+        AffineExpr, None for "None" (non-affine)
+    """
+    text = text.strip()
+    if text == "None":
+        return None
+
+    expr = AffineExpr()
+    for sign, term in re.findall(r'([+-]?)\s*([^+-]+)', text.replace(' ', '')):
+        factor = -1 if sign == '-' else 1
+        coeff, _, var = term.rpartition('*')
+        if INT_PATTERN.match(term):
+            expr = expr.Add(AffineExpr(factor * int(term)))
+        else:
+            expr = expr.Add(AffineExpr.Var(var).Scale(factor * (int(coeff) if coeff else 1)))
+
+    return expr
+
+
+def TripCount( start, bound, step, predicate ):
+    """
+    Trip Count of Counted Loop: for ( iv = start; iv <predicate> bound; iv += step )
+
+    Arguments
+        start, bound:   AffineExpr
+        step:           int, increment of induction variable per iteration
+        predicate:      icmp predicate of "iv <predicate> bound" (slt, ult, sle, ne, ...)
+
+    Returns
+        int when start and bound are constant,
+        str (symbolic, e.g. "ceil((%n + -1) / 2)") when they are not,
+        None when the loop is not counted by the predicate and step
+    """
+    if start is None or bound is None or not step:
+        return None
+
+    # signed and unsigned predicates count alike on non-negative ranges
+    cond = predicate[1:] if predicate[:1] in ( "s", "u" ) else predicate
+    if cond in ( "lt", "le", "ne" ) and step > 0:
+        span = bound.Sub(start)
+    elif cond in ( "gt", "ge", "ne" ) and step < 0:
+        span = start.Sub(bound)
+    else:
+        return None
+
+    if cond in ( "le", "ge" ):
+        span = span.Add(AffineExpr(1))
+
+    stride = abs(step)
+    if span.IsConst():
+        if cond == "ne" and span.const % stride:
+            # induction variable steps over the bound
+            return None
+        return max(0, -(-span.const // stride))
+
+    if stride == 1:
+        return f"max(0, {span})"
+    return f"ceil(({span}) / {stride})"
@@ -0,0 +1,243 @@
+##################################################################
+##
+##	ElectronNest_CP
+##	Copyright (C) 2024  Shigeyuki TAKANO
+##
+##  GNU AFFERO GENERAL PUBLIC LICENSE
+##	version 3.0
+##
+##################################################################
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+
+# Default Capacity per Region in Bytes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Format Version of Persistent Result Cache File
+RESULT_CACHE_VERSION = 3
+
+
+def SizeOf( obj ):
+    """
+    Estimated Size of Object in Bytes
+
+    Arguments
+        obj:    cached object (containers are walked, shared objects counted once)
+    """
+    size = 0
+    seen = set()
+    stack = [ obj ]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+        if isinstance(getattr(type(item), '__slots__', None), tuple):
+            for slot in type(item).__slots__:
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+
+    return size
+
+
+class CacheRegion:
+    """
+    LRU Region of Analysis Cache
+
+    Arguments
+        name:       region name
+        max_bytes:  capacity, least recently used entries are evicted beyond it
+    """
+    def __init__( self, name, max_bytes=DEFAULT_MAX_BYTES ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()    # key: (value, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicts = 0
+
+    def Get( self, key ):
+        """
+        Lookup, returns (hit, value)
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.entries[key][0]
+
+        self.misses += 1
+        return False, None
+
+    def Put( self, key, value ):
+        """
+        Register value, evicts LRU entries to keep capacity
+        """
+        self.Remove(key)
+
+        size = SizeOf(value)
+        self.entries[key] = (value, size)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            old_key = next(iter(self.entries))
+            self.Remove(old_key)
+            self.evicts += 1
+
+        return value
+
+    def Remove( self, key ):
+        if key not in self.entries:
+            return False
+
+        _, size = self.entries.pop(key)
+        self.bytes -= size
+        return True
+
+    def Clear( self ):
+        self.entries.clear()
+        self.bytes = 0
+
+    def Stats( self ):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicts": self.evicts,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0
+        }
+
+
+class AnalysisCache:
+    """
+    Analysis Cache with Named Regions
+
+    Arguments
+        limits:     {region_name: max_bytes}, regions not listed take DEFAULT_MAX_BYTES
+
+    Usage
+        cache.GetOrCompute( 'am', block_id, lambda: Preprocess(...) )
+        cache.DumpStats( "cache_stats.json" )
+    """
+    def __init__( self, limits=None ):
+        self.limits = dict(limits) if limits else {}
+        self.regions = {}
+
+    def Region( self, name ):
+        if name not in self.regions:
+            self.regions[name] = CacheRegion(name, self.limits.get(name, DEFAULT_MAX_BYTES))
+        return self.regions[name]
+
+    def Get( self, name, key ):
+        return self.Region(name).Get(key)
+
+    def Put( self, name, key, value ):
+        return self.Region(name).Put(key, value)
+
+    def GetOrCompute( self, name, key, compute ):
+        """
+        Lookup, compute and register value at miss
+        """
+        hit, value = self.Region(name).Get(key)
+        if hit:
+            return value
+        return self.Region(name).Put(key, compute())
+
+    def Clear( self ):
+        for region in self.regions.values():
+            region.Clear()
+
+    def Stats( self ):
+        return { name: region.Stats() for name, region in self.regions.items() }
+
+    def DumpStats( self, w_file_path ):
+        """
+        Write Statistics as JSON
+        """
+        with open(w_file_path, "w") as stats_file:
+            json.dump(self.Stats(), stats_file, indent=2)
+
+
+def FileDigest( file_paths ):
+    """
+    SHA-256 Digest of Files (name and contents, order independent)
+
+    Arguments
+        file_paths: list of consumed files
+    """
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        digest.update(os.path.basename(file_path).encode())
+        digest.update(b"\0")
+        with open(file_path, "rb") as r_file:
+            for chunk in iter(lambda: r_file.read(1 << 16), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent (On-Disk) Cache of Analysis Result
+
+    Arguments
+        w_file_path:    cache file
+        digest:         key of the result, FileDigest of every consumed file
+
+    The cache is valid only when both its format version and its digest match.
+    """
+    def __init__( self, w_file_path, digest ):
+        self.w_file_path = w_file_path
+        self.digest = digest
+
+    def Load( self ):
+        """
+        Load Result, returns (hit, value)
+        """
+        if not os.path.exists(self.w_file_path):
+            return False, None
+
+        try:
+            with open(self.w_file_path, "rb") as r_file:
+                entry = pickle.load(r_file)
+        except Exception as e:
+            print(f"Discard analysis result cache {self.w_file_path}: {e}")
+            return False, None
+
+        if not isinstance(entry, dict) or entry.get("version") != RESULT_CACHE_VERSION or entry.get("digest") != self.digest:
+            return False, None
+
+        return True, entry["result"]
+
+    def Store( self, value ):
+        """
+        Store Result (written to temporary file then replaced)
+        """
+        entry = {
+            "version": RESULT_CACHE_VERSION,
+            "digest": self.digest,
+            "result": value
+        }
+        tmp_file_path = self.w_file_path + ".tmp"
+        with open(tmp_file_path, "wb") as w_file:
+            pickle.dump(entry, w_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_path, self.w_file_path)
+
+        return value
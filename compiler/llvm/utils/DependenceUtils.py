@@ -0,0 +1,249 @@
+##################################################################
+##
+##	ElectronNest_CP
+##	Copyright (C) 2024  Shigeyuki TAKANO
+##
+##  GNU AFFERO GENERAL PUBLIC LICENSE
+##	version 3.0
+##
+##################################################################
+from itertools import product
+from math import gcd
+
+
+# Direction of Dependence per Loop
+#   "<": source iteration is earlier than sink iteration (carried by the loop)
+#   "=": same iteration
+#   ">": source iteration is later than sink iteration
+DIRECTIONS = ( "<", "=", ">" )
+
+
+def BanerjeeRange( a, b, direction, upper ):
+    """
+    Range of a*i - b*j under Direction Constraint (Banerjee Bounds)
+
+    Arguments
+        a, b:       coefficients of source (i) and sink (j) iteration
+        direction:  "<" (i < j), "=" (i == j) or ">" (i > j)
+        upper:      upper bound of iterations (0 <= i, j <= upper), None when unknown
+
+    Returns
+        (low, high) with None as unbounded,
+        None when no iteration pair satisfies the direction
+    """
+    if upper is None:
+        if direction == "=" and a == b:
+            return ( 0, 0 )
+        return ( None, None )
+
+    # extreme values of a linear function lie on vertices of the iteration polytope
+    if direction == "=":
+        vertices = [ ( 0, 0 ), ( upper, upper ) ]
+    elif upper < 1:
+        return None
+    elif direction == "<":
+        vertices = [ ( 0, 1 ), ( 0, upper ), ( upper-1, upper ) ]
+    else:
+        vertices = [ ( 1, 0 ), ( upper, 0 ), ( upper, upper-1 ) ]
+
+    values = [ a*i - b*j for i, j in vertices ]
+    return ( min(values), max(values) )
+
+
+def SymbolicTerms( src, dst, loop_vars ):
+    """
+    Check Non-Loop Variables (loop invariants) Cancel between Subscripts
+    """
+    for var in set(src.coeffs) | set(dst.coeffs):
+        if var not in loop_vars and src.Coeff(var) != dst.Coeff(var):
+            return False
+    return True
+
+
+def GCDTest( src, dst, loop_vars ):
+    """
+    GCD Test of Subscript Pair
+
+    Returns
+        False when sum(a_k*i_k) - sum(b_k*j_k) = c_dst - c_src has no integer solution
+    """
+    divisor = 0
+    for var in loop_vars:
+        divisor = gcd(divisor, gcd(src.Coeff(var), dst.Coeff(var)))
+
+    diff = dst.const - src.const
+    if divisor == 0:
+        return diff == 0
+    return diff % divisor == 0
+
+
+def BanerjeeTest( src, dst, loop_vars, bounds, directions ):
+    """
+    Banerjee Test of Subscript Pair for a Direction Vector
+
+    Returns
+        False when the dependence is impossible under the directions
+    """
+    low = high = 0
+    for var, direction in zip(loop_vars, directions):
+        term = BanerjeeRange(src.Coeff(var), dst.Coeff(var), direction, bounds.get(var))
+        if term is None:
+            return False
+
+        low = None if low is None or term[0] is None else low + term[0]
+        high = None if high is None or term[1] is None else high + term[1]
+
+    diff = dst.const - src.const
+    return ( low is None or low <= diff ) and ( high is None or diff <= high )
+
+
+def StrongSIV( src, dst, loop_vars ):
+    """
+    Strong SIV Subscript: a*i + c_src vs. a*j + c_dst
+
+    Returns
+        (loop variable, distance j - i), distance is None when not integral,
+        None when the subscript pair is not strong SIV
+    """
+    used = [ var for var in loop_vars if src.Coeff(var) or dst.Coeff(var) ]
+    if len(used) != 1:
+        return None
+
+    var = used[0]
+    coeff = src.Coeff(var)
+    if coeff == 0 or coeff != dst.Coeff(var):
+        return None
+
+    diff = src.const - dst.const
+    if diff % coeff:
+        return ( var, None )
+    return ( var, diff // coeff )
+
+
+def TestDependence( src_subscripts, dst_subscripts, loop_vars=None, bounds=None ):
+    """
+    Dependence Test between Two Affine Array Accesses
+
+    Subscripts are tested pairwise by dimension (ZIV, strong SIV, GCD),
+    then direction vectors are refined by the Banerjee test.
+
+    Arguments
+        src_subscripts: [AffineExpr, ...] of source access (e.g. store)
+        dst_subscripts: [AffineExpr, ...] of sink access (e.g. load), same array
+        loop_vars:      common induction variables from outermost loop,
+                        default: every variable in the subscripts
+        bounds:         {var: upper bound of iterations}, unknown loops are unbounded
+
+    Returns
+        None when the accesses are independent, otherwise
+        {
+            'loops':     [var, ...],
+            'direction': ["<" | "=" | ">" | "<=" | ">=" | "<>" | "*", ...] per loop,
+            'distance':  [int or None, ...] per loop,
+            'vectors':   [(direction, ...), ...] feasible direction vectors
+        }
+        a dependence is also assumed when a subscript is not affine (None)
+    """
+    bounds = bounds or {}
+    if loop_vars is None:
+        loop_vars = sorted({ var for subscript in list(src_subscripts) + list(dst_subscripts)
+                             if subscript is not None for var in subscript.Vars() })
+    loop_vars = list(loop_vars)
+
+    if len(src_subscripts) != len(dst_subscripts):
+        # different access shapes of the same array
+        return AnyDependence(loop_vars)
+
+    distances = {}
+    tested = []
+    for src, dst in zip(src_subscripts, dst_subscripts):
+        if src is None or dst is None or not SymbolicTerms(src, dst, loop_vars):
+            continue
+
+        # ZIV and GCD
+        if not GCDTest(src, dst, loop_vars):
+            return None
+
+        siv = StrongSIV(src, dst, loop_vars)
+        if siv is not None:
+            var, distance = siv
+            upper = bounds.get(var)
+            if distance is None or ( upper is not None and abs(distance) > upper ):
+                return None
+            if distances.get(var, distance) != distance:
+                # two subscripts require different distances on one loop
+                return None
+            distances[ var ] = distance
+
+        tested.append(( src, dst ))
+
+    vectors = []
+    for directions in product(DIRECTIONS, repeat=len(loop_vars)):
+        feasible = True
+        for var, direction in zip(loop_vars, directions):
+            if var in distances and direction != Direction(distances[ var ]):
+                feasible = False
+                break
+
+        if feasible and all( BanerjeeTest(src, dst, loop_vars, bounds, directions) for src, dst in tested ):
+            vectors.append(directions)
+
+    if not vectors:
+        return None
+
+    direction = []
+    distance = []
+    for level, var in enumerate(loop_vars):
+        used = { vector[ level ] for vector in vectors }
+        direction.append(MergeDirections(used))
+        if var in distances:
+            distance.append(distances[ var ])
+        elif used == { "=" }:
+            distance.append(0)
+        else:
+            distance.append(None)
+
+    return {
+        'loops': loop_vars,
+        'direction': direction,
+        'distance': distance,
+        'vectors': vectors
+    }
+
+
+def AnyDependence( loop_vars ):
+    """
+    Conservative Dependence (every direction)
+    """
+    return {
+        'loops': list(loop_vars),
+        'direction': [ "*" ] * len(loop_vars),
+        'distance': [ None ] * len(loop_vars),
+        'vectors': list(product(DIRECTIONS, repeat=len(loop_vars)))
+    }
+
+
+def Direction( distance ):
+    if distance > 0:
+        return "<"
+    elif distance < 0:
+        return ">"
+    return "="
+
+
+def MergeDirections( directions ):
+    """
+    Summarize Feasible Directions of a Loop ({"<", "="} -> "<=")
+    """
+    if len(directions) == len(DIRECTIONS):
+        return "*"
+    return "".join( direction for direction in DIRECTIONS if direction in directions )
+
+
+def IsLoopCarried( dependence ):
+    """
+    Check Dependence Carried by a Loop (a loop allows other than "=")
+    """
+    if dependence is None:
+        return False
+    return any( direction != "=" for direction in dependence['direction'] )
@@ -9,6 +9,13 @@
 ##################################################################
 import utils.ProgConstructor as progconst
 import utils.GraphUtils as graphutils
+import json
+import os
+
+
+# Path Types stored in Path Database
+#   same names as post-fix of legacy "_bpath_*.txt" files
+PATH_TYPES = [ 'st_root', 'st_leaf', 'st_ld', 'ld_ld', 'ld_leaf' ]
 
 
 def ReadFile( file_path=".", file_name="" ):
@@ -146,13 +153,141 @@ def ReadAM( file_path=".", file_name="" ):
     return f
 
 
+class PathDBWriter:
+    """
+    Path Database Writer
+
+    One JSON Lines file per kernel replaces five "_bpath_*.txt" files per basic block,
+    every line holds paths of one (basic block, path type):
+        {"block": "22", "type": "ld_ld", "paths": [[2,3,4,5],[2,3,6,7,8]]}
+
+    Arguments
+        w_file_path:    path (directory) for database file
+        w_file_name:    prefix of basic block files (e.g. "noundef_bblock")
+    """
+    def __init__( self, w_file_path=".", w_file_name="" ):
+        self.file = open( PathDBFileName( w_file_path, w_file_name ), "w" )
+
+    def Write( self, block_id, paths ):
+        """
+        Register paths of a basic block
+            paths:  {path_type: [[node_id, ...], ...]}
+        """
+        for path_type in PATH_TYPES:
+            if path_type not in paths:
+                continue
+
+            record = {
+                "block": str(block_id),
+                "type": path_type,
+                "paths": [ [ int(node_id) for node_id in path ] for path in paths[ path_type ] ]
+            }
+            self.file.write( json.dumps( record, separators=(',', ':') )+"\n" )
+
+    def Close( self ):
+        self.file.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.Close()
+
+
+class PathDB:
+    """
+    Path Database Reader
+
+    Indexed by (basic block, path type), the file is parsed once at opening
+
+    Arguments
+        r_file_path:    path (directory) for database file
+        r_file_name:    prefix of basic block files (e.g. "noundef_bblock")
+    """
+    def __init__( self, r_file_path=".", r_file_name="" ):
+        self.index = {}
+        with open( PathDBFileName( r_file_path, r_file_name ), "r" ) as db_file:
+            for line in db_file:
+                if not line.strip():
+                    continue
+                record = json.loads( line )
+                self.index[ ( record["block"], record["type"] ) ] = record["paths"]
+
+    def Read( self, block_id, path_type ):
+        """
+        Read paths, list of node-ID lists (empty when not registered)
+        """
+        return self.index.get( ( str(block_id), path_type ), [] )
+
+    def Blocks( self ):
+        blocks = []
+        for block_id, _ in self.index:
+            if block_id not in blocks:
+                blocks.append( block_id )
+        return blocks
+
+
+def PathDBFileName( file_path=".", file_name="" ):
+    return file_path +"/"+ file_name +"_bpath.jsonl"
+
+
+def ReadPathDB( r_file_path=".", r_file_name="" ):
+    """
+    Open Path Database, None when there is no database (legacy text files)
+    """
+    if not os.path.exists( PathDBFileName( r_file_path, r_file_name ) ):
+        return None
+
+    return PathDB( r_file_path, r_file_name )
+
+
+def GraphFileName( r_file_name="" ):
+    """
+    Prefix of Graph Files of Source Program
+    (_cfg_loop.txt, _bblock_*_node_list.txt, _bblock_*_am_inv.txt, path files)
+
+    Arguments
+        r_file_name:    source file name
+
+    Returns
+        file name prefix shared by every reader of the graph files
+    """
+    #REMOVE
+    #return r_file_name
+    return "noundef"
+
+
+def IRFileName( r_file_path=".", r_file_name="", ir_file_name=None ):
+    """
+    LLVM IR File of Source Program
+
+    Arguments
+        ir_file_name:   IR file name, default: r_file_name+".ll"
+
+    Returns
+        path of the IR file,
+        None with a warning when it does not exist
+        (loop bounds, trip counts and array sizes are read from the IR)
+    """
+    ir_file = os.path.join( r_file_path, ir_file_name if ir_file_name else r_file_name+".ll" )
+    if not os.path.exists( ir_file ):
+        print(f"Warning: LLVM IR file {ir_file} not found, loop bounds, trip counts and array sizes are not available")
+        return None
+
+    return ir_file
+
+
 def ReadDFG( r_file_path="./", r_file_name="mvm", dfg_node_id="1"):
     """
     Read Data-Flow Graph and its Node List
     """
-    r_path_file_name = r_file_name+"_"+dfg_node_id+"_bpath_st_ld.txt"
-    dfg_paths = ReadFile(file_path=r_file_path, file_name=r_path_file_name )
-    DFG_Paths = graphutils.NodeParser( dfg_paths, 'dfg' )
+    path_db = ReadPathDB( r_file_path, r_file_name )
+    if path_db is not None:
+        DFG_Paths = [ [ str(node_id) for node_id in path ] for path in path_db.Read( dfg_node_id, 'st_ld' ) ]
+    else:
+        r_path_file_name = r_file_name+"_"+dfg_node_id+"_bpath_st_ld.txt"
+        dfg_paths = ReadFile(file_path=r_file_path, file_name=r_path_file_name )
+        DFG_Paths = graphutils.NodeParser( dfg_paths, 'dfg' )
     #print("    DFG Paths:{}".format(DFG_Paths))
 
     r_node_list_file_name = r_file_name+"_"+dfg_node_id+"_node_list.txt"
@@ -42,6 +42,11 @@ class Node:
 
         self.DestIDs = dest_ids
 
+        # Destination Nodes as Bitset (bit[n] is set for Node-n)
+        self.DestMask = 0
+        for dest_id in dest_ids:
+            self.DestMask |= 1 << dest_id
+
         self.Term = False
 
     def Set_MyNodeID(self, id):
@@ -50,6 +55,10 @@ class Node:
     def Set_DestNodeID(self, row_am):
         for index, elm in row_am:
             self.DestIDs.append(index)
+            self.DestMask |= 1 << index
+
+    def Check_DestID(self, id):
+        return (self.DestMask >> id) & 1 == 1
 
     def Read_DestIDs(self):
         dest_ids = []
@@ -121,47 +130,42 @@ def RemoveList(lst):
 
 
 class EdgeTab:
+    """
+    Edge Table
+
+    Role:
+        Edges (paths) propagated to destination nodes,
+        two tables (read_no/write_no = 0, 1) hold only nodes having edges,
+        so that memory is linear in edges rather than am_size
+    """
     def __init__(self, am_size):
         self.am_size = am_size
-
-        brank1 = []
-        for _ in range(am_size):
-            brank1.append([])
-        brank2 = []
-        for _ in range(am_size):
-            brank2.append([])
-
-        edges = []
-        edges.append(brank1)
-        edges.append(brank2)
-        self.Edges = edges
+        self.Edges = [ {}, {} ]
 
     def Read(self, read_no, my_id):
-        edges = self.Edges[read_no][my_id]
-        self.Edges[read_no][my_id] = []
-        return edges
+        return self.Edges[read_no].pop(my_id, [])
 
     def Write(self, write_no, my_id, dest_ids, edges):
         #print("  >Write ID-{} in {}".format(my_id, edges))
         shape = GetShape(edges)
         if len(shape) == 1 and len(edges) == 0:
             for dest_id in dest_ids:
-                self.Edges[write_no][dest_id].append([my_id])
+                self.Edges[write_no].setdefault(dest_id, []).append([my_id])
                 #print("  Dest Node-{}: {}".format(dest_id, self.Edges[write_no][dest_id]))
         elif len(shape) == 1 and len(edges) > 0:
             edges.append(my_id)
             for dest_id in dest_ids:
-                self.Edges[write_no][dest_id].append(edges)
+                self.Edges[write_no].setdefault(dest_id, []).append(edges)
                 #print("  Dest Node-{}: {}".format(dest_id, self.Edges[write_no][dest_id]))
         else:
             edges_, _ = AppendLowestList(my_id, edges)
             for dest_id in dest_ids:
                 #print("  Dest Node-{}: {}".format(dest_id, edges_))
-                self.Edges[write_no][dest_id].append(edges_)
+                self.Edges[write_no].setdefault(dest_id, []).append(edges_)
 
     def Dump(self, my_id):
         for index, edges in enumerate(self.Edges):
-            print("no-{} {}".format(index, edges))
+            print("no-{} {}".format(index, [ edges.get(node_id, []) for node_id in range(self.am_size) ]))
 
 
 def CheckEcho(node_id, edges):
@@ -299,17 +303,35 @@ def NodeParser( Paths_, mode ):
     return Paths
 
 
+def BitIndices( bits ):
+    """
+    Indices of Set Bits in Bitset (Python int)
+    """
+    indices = []
+    while bits:
+        low = bits & -bits
+        indices.append(low.bit_length() - 1)
+        bits ^= low
+    return indices
+
+
 class Create_CFGNode:
     """
     Node Class
 
     Role:
         Node having Data Structure for Control-Flow Graph.
+        Flags are held as bitsets (Python int), bit[n] is for n-th neighbor/path:
+            NeighborValid:  Valid Flags of Neighbor Nodes
+            PathExplored:   Explored Flags of Store-Load Paths
     """
     def __init__( self ):
         self.ID = ""
         self.StLdPaths = []
         self.NeighborNodes = []
+        self.NeighborMask = {}
+        self.NeighborValid = 0
+        self.PathExplored = 0
         self.Explored = False
         self.num_paths = 0
         self.num_nodes = 0
@@ -321,7 +343,7 @@ class Create_CFGNode:
         """
         Read Neighbor's Explored Flag
         """
-        return self.NeighborNodes[1][1]
+        return (self.NeighborValid >> 1) & 1 == 1
 
 
     def ReadPathNo( self, Src, Dst, index ):
@@ -335,33 +357,33 @@ class Create_CFGNode:
             return index, Src, Dst, False
 
         for no, StLdPath in enumerate(self.StLdPaths):
-            if not StLdPath[1]:
-                for st_no in StLdPath[2][Dst]:
+            if not self.ReadStLdPathExplored(no):
+                for st_no in StLdPath[1][Dst]:
                     for id in st_no:
                         if id == index:
-                            self.StLdPaths[no][1] = True
+                            self.PathExplored |= 1 << no
                             self.read_cnt += 1
                             return index, Src, Dst, no
 
         for no, StLdPath in enumerate(self.StLdPaths):
-            if not StLdPath[1]:
-                for st_no in StLdPath[2][Src]:
+            if not self.ReadStLdPathExplored(no):
+                for st_no in StLdPath[1][Src]:
                     for id in st_no:
                         if id == index:
-                            self.StLdPaths[no][1] = True
+                            self.PathExplored |= 1 << no
                             self.read_cnt += 1
                             return index, Src, Dst, no
 
-        temp_ptr = self.read_ptr
-        for no, StLdPath in enumerate(self.StLdPaths):
-            if not StLdPath[1]:
-                self.StLdPaths[no][1] = True
-                if self.read_ptr < self.num_paths:
-                    self.read_ptr += 1
-                if Src == Dst:
-                    return self.StLdPaths[no][2][Src][0][0], Src, Dst^1, no
-                else:
-                    return self.StLdPaths[no][2][Src][0][0], Src, Dst, no
+        unexplored = ~self.PathExplored & ((1 << self.num_paths) - 1)
+        if unexplored:
+            no = (unexplored & -unexplored).bit_length() - 1
+            self.PathExplored |= 1 << no
+            if self.read_ptr < self.num_paths:
+                self.read_ptr += 1
+            if Src == Dst:
+                return self.StLdPaths[no][1][Src][0][0], Src, Dst^1, no
+            else:
+                return self.StLdPaths[no][1][Src][0][0], Src, Dst, no
 
         return -1, Src, Dst, False
 
@@ -370,8 +392,7 @@ class Create_CFGNode:
         """
         Clear Explore Flag
         """
-        for StLdPath in self.StLdPaths:
-            StLdPath[1] = False
+        self.PathExplored = 0
 
     def ReadNumPaths( self ):
         """
@@ -421,7 +442,8 @@ class Create_CFGNode:
         Set Neighbor Node's ID,
         Initialize Flag-Explored
         """
-        self.NeighborNodes.append([node_id, False])
+        self.NeighborNodes.append(node_id)
+        self.NeighborMask[node_id] = self.NeighborMask.get(node_id, 0) | (1 << self.num_nodes)
         self.num_nodes += 1
 
     def SetNeigboorNode( self, node_id ):
@@ -429,26 +451,23 @@ class Create_CFGNode:
         Set Neighbor's Node-ID
         Set Valid Flag
         """
-        for neighbor_node in self.NeighborNodes:
-            if neighbor_node[0] == node_id:
-                neighbor_node[1] = True
+        self.NeighborValid |= self.NeighborMask.get(node_id, 0)
 
     def ClrNeigboorNode( self, node_id ):
         """
         Clear Neighbor's Valid Flag
         """
-        for neighbor_node in self.NeighborNodes:
-            if neighbor_node[0] == node_id:
-                neighbor_node[1] = False
+        self.NeighborValid &= ~self.NeighborMask.get(node_id, 0)
 
     def SetStLdPaths( self, path ):
         """
         Register Path inside of This Node
         path:   DFG-Path
-        False:  Init Flag for Path-Explored
         []:     Init Set of Store and Load Indeces
+        Flag for Path-Explored is cleared in PathExplored
         """
-        self.StLdPaths.append([copy.deepcopy(path), False, [[], []]])
+        self.StLdPaths.append([copy.deepcopy(path), [[], []]])
+        self.PathExplored &= ~(1 << self.num_paths)
         self.num_paths += 1
 
     def ReadStLdPaths( self ):
@@ -467,19 +486,18 @@ class Create_CFGNode:
         """
         Check Availability of Source Register Index in Store-Load Path
         """
-        Chk_Src = False
         for StLdPath in self.StLdPaths:
-            for src_indices in StLdPath[2][src]:
+            for src_indices in StLdPath[1][src]:
                 for src_index in src_indices:
                     if src_index > 0:
-                        Chk_Src = True
-        return Chk_Src
+                        return True
+        return False
 
     def ReadStLdPathExplored( self, path_no ):
         """
         Read Explored-Flag of This Node's Path
         """
-        return self.StLdPaths[path_no][1]
+        return (self.PathExplored >> path_no) & 1 == 1
 
 
     def SetStLdIndex( self, path_no, st, index ):
@@ -488,7 +506,7 @@ class Create_CFGNode:
             st = 0:     Store
             ld = 1:     Load
         """
-        self.StLdPaths[path_no][2][st].append(index)
+        self.StLdPaths[path_no][1][st].append(index)
 
     def ReadStLdIndex( self, path_no, st ):
         """
@@ -496,15 +514,15 @@ class Create_CFGNode:
             st = 0:     Store
             ld = 1:     Load
         """
-        return self.StLdPaths[path_no][2][st]
+        return self.StLdPaths[path_no][1][st]
 
     def CheckExplored( self, node_id ):
         """
         Check Explored Flag and Valid Flags
         """
-        for neigbor_node in self.NeighborNodes:
-            if neigbor_node[0] == node_id:
-                return True, neigbor_node[1]
+        mask = self.NeighborMask.get(node_id, 0)
+        if mask:
+            return True, self.NeighborValid & (mask & -mask) != 0
 
         return False, False
 
@@ -512,9 +530,8 @@ class Create_CFGNode:
         """
         Check Explored Flag and Valid Flags
         """
-        for neigbor_node in self.NeighborNodes:
-            if neigbor_node[1]:
-                return True, True
+        if self.NeighborValid:
+            return True, True
 
         return False, False
 
@@ -522,8 +539,7 @@ class Create_CFGNode:
         """
         Clear Neibor Node;s Explored Flag
         """
-        for neigbor_node in self.NeighborNodes:
-            neigbor_node[1] = False
+        self.NeighborValid = 0
 
 
 class Create_CFGNodes:
@@ -532,12 +548,15 @@ class Create_CFGNodes:
 
     Role:
         Structure of Graph
+        Nodes are indexed by Node-ID, explored flags are held as bitset (Python int)
     """
     def __init__(self):
         self.path_ptr = 0
         self.node_ptr = 0
         self.nums = 0
         self.nodes = []
+        self.index = {}
+        self.explored = 0
 
     def ReadInitNode(self):
         self.node_ptr += 1
@@ -551,6 +570,9 @@ class Create_CFGNodes:
         Register Node
         """
         self.nodes.append(copy.deepcopy(node))
+        self.index.setdefault(node.ReadNodeID(), []).append(self.nums)
+        if node.ReadExplored():
+            self.explored |= 1 << self.nums
         self.nums += 1
 
     def ReadNode(self, node_no):
@@ -566,17 +588,16 @@ class Create_CFGNodes:
         """
         Set Explored Flag to Node
         """
-        for index, node in enumerate(self.nodes):
-            if node.ReadNodeID() == node_id:
-                self.nodes[index].SetExpored()
+        for index in self.index.get(node_id, []):
+            self.nodes[index].SetExplored()
+            self.explored |= 1 << index
 
     def ReadExplored(self, node_id):
         """
         Check node_id is already explored
         """
-        for node in self.nodes:
-            if node.ReadNodeID() == node_id:
-                return node.ReadExplored()
+        for index in self.index.get(node_id, [])[:1]:
+            return (self.explored >> index) & 1 == 1
 
         return False
 
@@ -584,8 +605,9 @@ class Create_CFGNodes:
         """
         Clear Explored Flag for All
         """
-        for node in self.nodes:
-            node.ClrExplored()
+        for index in BitIndices(self.explored):
+            self.nodes[index].ClrExplored()
+        self.explored = 0
 
     def ReadNum(self):
         """
@@ -597,10 +619,9 @@ class Create_CFGNodes:
         """
         Set Path to Node[node_id]
         """
-        for node in self.nodes:
-            if node.ReadNodeID() == node_id:
-                node.SetStLdPaths(path)
-                self.path_ptr += 1
+        for index in self.index.get(node_id, []):
+            self.nodes[index].SetStLdPaths(path)
+            self.path_ptr += 1
 
     def SetStLdIndex(self, node_id, st, index):
         """
@@ -608,9 +629,9 @@ class Create_CFGNodes:
             st = 0:     Store
             st = 1:     Load
         """
-        for node in self.nodes:
-            if node.ReadNodeID() == node_id:
-                node.SetStLdIndex(node.num_paths-1, st, index)
+        for node_index in self.index.get(node_id, []):
+            node = self.nodes[node_index]
+            node.SetStLdIndex(node.num_paths-1, st, index)
 
     def ReadCFGNode(self, cycle_no):
         """
@@ -620,14 +641,19 @@ class Create_CFGNodes:
 
 
     def Reorder(self):
-        nodes = []
-        for index in range(self.nums-1, -1, -1):
-            nodes.append(self.nodes[index])
+        explored = BitIndices(self.explored)
+        self.nodes.reverse()
 
-        self.nodes = nodes
+        self.index = {}
+        for index, node in enumerate(self.nodes):
+            self.index.setdefault(node.ReadNodeID(), []).append(index)
+
+        self.explored = 0
+        for index in explored:
+            self.explored |= 1 << (self.nums - 1 - index)
 
     def ReadNumNodes(self):
         """
         Read Number of (CFG) Nodes
         """
-        return self.nums
\ No newline at end of file
+        return self.nums